@@ -0,0 +1,33 @@
+"""
+Helper untuk memuat modul halaman Pier secara headless (tanpa menjalankan main()).
+"""
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+PIER_PAGE_PATH = ROOT_DIR / "pages" / "1_Monitoring_Pier.py"
+PIER_MODULE_NAME = "monitoring_pier_page"
+
+# Paket inti shms berada di root repo, sedangkan sys.path[0] adalah folder benchmarks/
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+def load_pier_page():
+    """
+    Mengimpor pages/1_Monitoring_Pier.py sebagai modul biasa.
+    Working directory dipindah ke root repo agar path 'data/...' tetap valid.
+    """
+    if PIER_MODULE_NAME in sys.modules:
+        return sys.modules[PIER_MODULE_NAME]
+
+    os.chdir(ROOT_DIR)
+    # Peringatan 'No runtime found' / 'missing ScriptRunContext' tidak relevan tanpa server
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+    spec = importlib.util.spec_from_file_location(PIER_MODULE_NAME, PIER_PAGE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PIER_MODULE_NAME] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,86 @@
+"""
+Benchmark waktu muat data saat cold start halaman Pier:
+CSV + inferensi tanggal (cara lama) vs cache kolumnar Parquet (build pertama & warm start).
+
+Jalankan dari root repo:
+    python benchmarks/bench_startup.py [--scale 10]
+
+--scale N menggandakan data_gaya_aktual.csv N kali (tanggal digeser) untuk mensimulasikan
+riwayat logger yang lebih panjang. Semua file kerja dibuat di folder sementara.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from _page import ROOT_DIR, load_pier_page
+
+def write_scaled_actual_csv(src_path, dst_path, scale):
+    """
+    Menulis salinan data aktual yang digandakan `scale` kali dengan tanggal digeser per salinan.
+    """
+    df = pd.read_csv(src_path, encoding='utf-8-sig')
+    if scale <= 1:
+        shutil.copy(src_path, dst_path)
+        return len(df)
+
+    dates = pd.to_datetime(df['DATE'], format="%m/%d/%Y %H:%M")
+    span = dates.max() - dates.min() + pd.Timedelta(minutes=5)
+    copies = []
+    for k in range(scale):
+        part = df.copy()
+        part['DATE'] = (dates + span * k).dt.strftime("%m/%d/%Y %H:%M")
+        copies.append(part)
+    scaled = pd.concat(copies, ignore_index=True)
+    scaled.to_csv(dst_path, index=False, encoding='utf-8-sig')
+    return len(scaled)
+
+def timed(func):
+    t0 = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - t0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    page = load_pier_page()
+    work_dir = Path(tempfile.mkdtemp(prefix="shms_bench_"))
+    try:
+        gaya_path = work_dir / "data_gaya.csv"
+        aktual_path = work_dir / "data_gaya_aktual.csv"
+        shutil.copy(ROOT_DIR / "data" / "data_gaya.csv", gaya_path)
+        n_rows = write_scaled_actual_csv(ROOT_DIR / "data" / "data_gaya_aktual.csv", aktual_path, args.scale)
+
+        def legacy():
+            df_gaya = pd.read_csv(gaya_path)
+            df = pd.read_csv(aktual_path)
+            df['DATE'] = pd.to_datetime(df['DATE'], dayfirst=False, errors='coerce')
+            return df_gaya, df
+
+        def columnar():
+            store = page.LoadCaseStore.from_dataframe(page.load_load_case_frame(str(gaya_path)))
+            reader = page.IncrementalCsvReader(
+                str(aktual_path), snapshot_path=page.get_columnar_cache_path(str(aktual_path))
+            )
+            reader.refresh()
+            return store, reader.frame()
+
+        _, t_legacy = timed(legacy)
+        _, t_build = timed(columnar)
+        _, t_warm = timed(columnar)
+
+        print(f"Baris data aktual      : {n_rows}")
+        print(f"CSV + inferensi (lama) : {t_legacy * 1e3:10.1f} ms")
+        print(f"Build cache Parquet    : {t_build * 1e3:10.1f} ms (sekali per perubahan CSV)")
+        print(f"Warm start Parquet     : {t_warm * 1e3:10.1f} ms")
+        print(f"Speedup warm vs lama   : {t_legacy / t_warm:10.1f}×")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark & validasi engine tegangan tervektorisasi (calculate_stress_history)
+terhadap perhitungan FEA per titik (Section.get_stress_at_points).
+
+Jalankan dari root repo:
+    python benchmarks/bench_stress_engine.py [--mesh-scale 50] [--fc 40]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from _page import ROOT_DIR
+
+from shms.history import calculate_stress_history
+from shms.loads import LoadCaseStore
+from shms.registry import get_sensor_registry
+from shms.section import get_section_geometry
+
+def reference_stress_history(df_gaya, list_stage, sections_data, modulus_elastisitas):
+    """
+    Implementasi lama: loop stage × pier dengan get_stress_at_points per pasangan.
+    """
+    history_rows = []
+    for stage in list_stage:
+        for pier_name, data in sections_data.items():
+            gaya_pier = df_gaya[(df_gaya['Part'] == data['part']) & (df_gaya['Stage'] == stage)]
+            if len(gaya_pier) == 0:
+                continue
+            N = gaya_pier["Axial (kN)"].values[0]
+            My = gaya_pier["Moment-y (kN·m)"].values[0]
+            Mz = gaya_pier["Moment-z (kN·m)"].values[0]
+            load_case = {"n": N * 1000, "mxx": Mz * 1e6, "myy": My * 1e6}
+            results = data['section'].get_stress_at_points(pts=list(data['sgs'].values()), **load_case)
+            for i, sg_name in enumerate(data['sgs']):
+                sig_zz = results[i][0]
+                history_rows.append({
+                    "Stage": stage, "Pier": pier_name, "SG": sg_name,
+                    "Stress (MPa)": sig_zz,
+                    "Strain (με)": (sig_zz / modulus_elastisitas) * 1e6
+                })
+    return pd.DataFrame(history_rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mesh-scale", type=float, default=50)
+    parser.add_argument("--fc", type=float, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    df_gaya = pd.read_csv("data/data_gaya.csv")
+    list_stage = df_gaya['Stage'].unique().tolist()
+    load_store = LoadCaseStore.from_dataframe(df_gaya)
+    modulus_elastisitas = 4700 * np.sqrt(args.fc)
+
+    sections_data = {}
+    for pier_name, cfg in get_sensor_registry().elements_of_type("pier").items():
+        sections_data[pier_name] = {
+            "section": get_section_geometry(cfg["length"], cfg["width"], args.mesh_scale),
+            "part": cfg["part_id"],
+            "sgs": cfg["sgs"],
+        }
+
+    # Fungsi inti shms tidak memiliki wrapper cache, sehingga waktu yang terukur adalah perhitungan murni
+    engine = calculate_stress_history
+
+    t0 = time.perf_counter()
+    df_ref = reference_stress_history(df_gaya, list_stage, sections_data, modulus_elastisitas)
+    t_ref = time.perf_counter() - t0
+
+    t_new = []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        df_new = engine(load_store, sections_data, modulus_elastisitas)
+        t_new.append(time.perf_counter() - t0)
+    t_new = min(t_new)
+
+    # Validasi: urutan baris, label, dan nilai harus identik dalam toleransi ketat
+    assert df_ref[["Stage", "Pier", "SG"]].equals(df_new[["Stage", "Pier", "SG"]]), "Urutan/label baris berbeda"
+    for col in ["Stress (MPa)", "Strain (με)"]:
+        np.testing.assert_allclose(df_new[col].to_numpy(), df_ref[col].to_numpy(), rtol=1e-9, atol=1e-9)
+    max_err = np.abs(df_new["Stress (MPa)"].to_numpy() - df_ref["Stress (MPa)"].to_numpy()).max()
+
+    print(f"Baris riwayat          : {len(df_new)} ({len(list_stage)} stage × {len(sections_data)} pier)")
+    print(f"Selisih maks σzz       : {max_err:.3e} MPa")
+    print(f"get_stress_at_points   : {t_ref * 1e3:10.1f} ms")
+    print(f"Engine tervektorisasi  : {t_new * 1e3:10.1f} ms")
+    print(f"Speedup                : {t_ref / t_new:10.1f}×")
+
+if __name__ == "__main__":
+    main()
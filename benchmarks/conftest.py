@@ -0,0 +1,74 @@
+"""
+Fixture bersama suite benchmark: modul halaman Pier (headless) dan data aktual yang diskalakan.
+
+Skala data aktual dipilih dengan --bench-scales (default 1,10,100); file skala dibuat sekali
+per sesi pytest di folder sementara.
+"""
+import shutil
+
+import pytest
+
+from _page import ROOT_DIR, load_pier_page
+from bench_startup import write_scaled_actual_csv
+
+from shms.actual import ActualStrainIndex
+from shms.store import ActualReadingStore
+
+DEFAULT_SCALES = "1,10,100"
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-scales", default=DEFAULT_SCALES,
+        help="Faktor skala data_gaya_aktual.csv, dipisah koma (default: %(default)s)"
+    )
+
+def pytest_generate_tests(metafunc):
+    if "actual_scale" in metafunc.fixturenames:
+        scales = [int(s) for s in metafunc.config.getoption("--bench-scales").split(",") if s.strip()]
+        metafunc.parametrize("actual_scale", scales, ids=[f"{s}x" for s in scales], scope="session")
+
+@pytest.fixture(scope="session")
+def page():
+    return load_pier_page()
+
+@pytest.fixture(scope="session")
+def scaled_actual_csv(page, actual_scale, tmp_path_factory):
+    """
+    Path salinan data_gaya_aktual.csv yang digandakan actual_scale kali (tanggal digeser).
+    """
+    work_dir = tmp_path_factory.mktemp(f"actual_{actual_scale}x")
+    csv_path = work_dir / "data_gaya_aktual.csv"
+    write_scaled_actual_csv(ROOT_DIR / "data" / "data_gaya_aktual.csv", csv_path, actual_scale)
+    yield str(csv_path)
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+@pytest.fixture(scope="session")
+def scaled_actual_index(page, scaled_actual_csv):
+    reader = page.IncrementalCsvReader(scaled_actual_csv)
+    reader.refresh()
+    return ActualStrainIndex.from_frame(reader.frame())
+
+@pytest.fixture(scope="session")
+def scaled_actual_store(page, scaled_actual_csv):
+    """
+    Store SQLite berisi data aktual yang diskalakan (di samping file CSV-nya).
+    """
+    store = ActualReadingStore(scaled_actual_csv.replace(".csv", ".sqlite"))
+    store.ingest_csv(scaled_actual_csv)
+    yield store
+    store.close()
+
+@pytest.fixture(scope="session")
+def load_store(page):
+    return page.load_load_case_store("data/data_gaya.csv")
+
+@pytest.fixture(scope="session")
+def sections_data(page):
+    return {
+        pier_name: {
+            "section": page.get_cached_section_geometry(cfg["length"], cfg["width"], 50),
+            "part": cfg["part_id"],
+            "sgs": cfg["sgs"],
+        }
+        for pier_name, cfg in page.PIER_CONFIG.items()
+    }
@@ -0,0 +1,304 @@
+"""
+Suite benchmark hot path non-UI halaman Pier (pytest-benchmark), terhadap data bawaan data/
+dan versi yang diskalakan.
+
+Jalankan dari root repo:
+    pytest benchmarks/ [--bench-scales 1,10,100] [--benchmark-autosave]
+
+Bandingkan antar commit:
+    pytest benchmarks/ --benchmark-autosave                      # simpan hasil (.benchmarks/)
+    pytest benchmarks/ --benchmark-compare --benchmark-compare-fail=median:15%
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shms.actual import IncrementalCsvReader, get_actual_values_by_date
+from shms.history import calculate_stress_history
+from shms.quality import (
+    FLAG_GAP, FLAG_INTERPOLATED, append_pier_readings, clean_pier_readings, clean_strain_index, quality_gaps,
+    quality_summary
+)
+from shms.section import get_section_geometry
+
+MESH_SCALES = [10, 25, 50, 100]
+STAGE_SCALES = [1, 10, 100]
+LOOKUPS_PER_ROUND = 100
+
+# ------------------------------------------
+# Geometri & mesh penampang
+# ------------------------------------------
+
+@pytest.mark.parametrize("mesh_scale", MESH_SCALES)
+def test_section_mesh_cold(benchmark, page, tmp_path, mesh_scale):
+    """Meshing + analisis geometrik tanpa cache (memori & disk kosong)."""
+    benchmark.group = "section: cold"
+    cfg = page.PIER_CONFIG["Pier 3A"]
+
+    def setup():
+        for path in tmp_path.iterdir():
+            path.unlink()
+
+    benchmark.pedantic(get_section_geometry, args=(cfg["length"], cfg["width"], mesh_scale),
+                       kwargs={"cache_dir": str(tmp_path)}, setup=setup, rounds=3)
+
+@pytest.mark.parametrize("mesh_scale", MESH_SCALES)
+def test_section_disk_cache(benchmark, page, tmp_path, mesh_scale):
+    """Memuat Section dari cache disk (restart server)."""
+    benchmark.group = "section: cache disk"
+    cfg = page.PIER_CONFIG["Pier 3A"]
+    get_section_geometry(cfg["length"], cfg["width"], mesh_scale, cache_dir=str(tmp_path))
+
+    benchmark.pedantic(get_section_geometry, args=(cfg["length"], cfg["width"], mesh_scale),
+                       kwargs={"cache_dir": str(tmp_path)}, rounds=5)
+
+# ------------------------------------------
+# Riwayat tegangan teoritis
+# ------------------------------------------
+
+@pytest.mark.parametrize("stage_scale", STAGE_SCALES, ids=[f"{s}x" for s in STAGE_SCALES])
+def test_stress_history(benchmark, page, load_store, sections_data, stage_scale):
+    """calculate_stress_history (tanpa cache) untuk seluruh stage, stage digandakan stage_scale kali."""
+    benchmark.group = "stress history"
+    store = load_store
+    if stage_scale > 1:
+        stages = [f"{stage}#{k}" for k in range(stage_scale) for stage in load_store.stages]
+        store = page.LoadCaseStore(stages, load_store.parts, load_store.columns,
+                                   np.tile(load_store.values, (stage_scale, 1, 1)))
+    engine = calculate_stress_history
+    modulus_elastisitas = 4700 * np.sqrt(40)
+
+    df = benchmark(engine, store, sections_data, modulus_elastisitas)
+    assert len(df) == len(store.stages) * sum(len(d["sgs"]) for d in sections_data.values())
+
+# ------------------------------------------
+# Data aktual
+# ------------------------------------------
+
+def test_load_actual_cold(benchmark, page, scaled_actual_csv):
+    """load_actual_strain_data tanpa snapshot Parquet (parse CSV penuh)."""
+    benchmark.group = "actual: load cold"
+    snapshot_path = page.get_columnar_cache_path(scaled_actual_csv)
+
+    def setup():
+        page.get_actual_strain_reader.clear()
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+
+    df = benchmark.pedantic(page.load_actual_strain_data, args=(scaled_actual_csv,), setup=setup, rounds=3)
+    assert not df.empty
+
+def test_load_actual_warm(benchmark, page, scaled_actual_csv):
+    """load_actual_strain_data dari snapshot Parquet (restart server, CSV tidak berubah)."""
+    benchmark.group = "actual: load warm"
+    page.get_actual_strain_reader.clear()
+    page.load_actual_strain_data(scaled_actual_csv)
+
+    df = benchmark.pedantic(page.load_actual_strain_data, args=(scaled_actual_csv,),
+                            setup=page.get_actual_strain_reader.clear, rounds=5)
+    assert not df.empty
+
+def test_load_actual_unchanged(benchmark, page, scaled_actual_csv):
+    """load_actual_strain_data pada rerun tanpa perubahan file (hanya os.stat)."""
+    benchmark.group = "actual: rerun"
+    page.get_actual_strain_reader.clear()
+    page.load_actual_strain_data(scaled_actual_csv)
+    benchmark(page.load_actual_strain_data, scaled_actual_csv)
+
+def test_store_ingest_unchanged(benchmark, scaled_actual_csv, scaled_actual_store):
+    """ingest_csv store SQLite pada rerun / tick mode live tanpa perubahan file."""
+    benchmark.group = "actual: rerun"
+    rows = benchmark(scaled_actual_store.ingest_csv, scaled_actual_csv)
+    assert rows == 0
+
+def test_actual_values_by_date(benchmark, page, scaled_actual_index):
+    """get_actual_values_by_date untuk LOOKUPS_PER_ROUND tanggal acak × 4 pier."""
+    benchmark.group = "actual: lookup"
+    rng = np.random.default_rng(0)
+    dates = rng.choice(np.asarray(scaled_actual_index.timestamps_desc), LOOKUPS_PER_ROUND)
+    piers = list(scaled_actual_index.piers)
+
+    def lookups():
+        return [get_actual_values_by_date(scaled_actual_index, pier, date) for date in dates for pier in piers]
+
+    results = benchmark(lookups)
+    assert any(r is not None for r in results)
+
+def test_store_values_at(benchmark, scaled_actual_index, scaled_actual_store):
+    """ActualReadingStore.values_at (SQL as-of) untuk tanggal yang sama dengan test_actual_values_by_date."""
+    benchmark.group = "actual: lookup"
+    rng = np.random.default_rng(0)
+    dates = rng.choice(np.asarray(scaled_actual_index.timestamps_desc), LOOKUPS_PER_ROUND)
+    piers = list(scaled_actual_index.piers)
+
+    def lookups():
+        return [scaled_actual_store.values_at(pier, date) for date in dates for pier in piers]
+
+    results = benchmark(lookups)
+    assert any(r is not None for r in results)
+
+def test_quality_pipeline(benchmark, scaled_actual_index):
+    """clean_strain_index: deduplikasi, lonjakan, kanal macet, dan regularisasi grid per pier (per versi data, seluruh riwayat)."""
+    benchmark.group = "actual: kualitas"
+    clean = benchmark(clean_strain_index, scaled_actual_index)
+
+    # Slot terukur memakai nilai pembacaan valid terakhir yang di-snap ke slot tersebut
+    raw, data = scaled_actual_index.piers["P3A"], clean.piers["P3A"]
+    last = np.r_[raw["timestamps"][1:] != raw["timestamps"][:-1], True]
+    values = raw["raw"][last]
+    step = data["interval"]
+    pos = (data["reading_timestamps"] - data["timestamps"][0] + step // 2) // step
+    tail = np.r_[pos[1:] != pos[:-1], True]
+    ok = tail[:, None] & (data["reading_flags"] == 0) & ~np.isnan(values)
+    assert ok.mean() > 0.75
+    assert ((data["flags"][pos][ok] & (FLAG_INTERPOLATED | FLAG_GAP)) == 0).all()
+    np.testing.assert_array_equal(data["raw"][pos][ok], values[ok])
+
+def test_quality_incremental_append(benchmark, scaled_actual_index):
+    """append_pier_readings: satu pembacaan baru per pier (refresh live); hanya jendela lookback yang dibersihkan ulang."""
+    benchmark.group = "actual: kualitas"
+    clean = clean_strain_index(scaled_actual_index)
+    # 5000 pembacaan terakhir + satu pembacaan baru: jauh melebihi jendela lookback (~1 hari)
+    windows = {}
+    for short_name, data in scaled_actual_index.piers.items():
+        step = clean.piers[short_name]["interval"]
+        windows[short_name] = (np.r_[data["timestamps"][-5000:], data["timestamps"][-1] + step],
+                               np.vstack([data["raw"][-5000:], data["raw"][-1:]]))
+
+    def append():
+        return {p: append_pier_readings(clean.piers[p], ts, raw) for p, (ts, raw) in windows.items()}
+
+    result = benchmark(append)
+    data, (ts, raw) = scaled_actual_index.piers["P3A"], windows["P3A"]
+    full = clean_pier_readings(np.r_[data["timestamps"], ts[-1]], np.vstack([data["raw"], raw[-1:]]),
+                               clean.piers["P3A"]["interval"])
+    np.testing.assert_array_equal(result["P3A"]["flags"], full["flags"])
+    np.testing.assert_array_equal(result["P3A"]["raw"], full["raw"])
+
+def test_quality_report(benchmark, scaled_actual_index):
+    """Ringkasan cakupan per sensor + daftar gap dari indeks bersih."""
+    benchmark.group = "actual: kualitas"
+    clean = clean_strain_index(scaled_actual_index)
+    summary, gaps = benchmark(lambda: (quality_summary(clean), quality_gaps(clean)))
+    assert len(summary) == sum(len(d["sensors"]) for d in clean.piers.values())
+    assert (gaps["Durasi (jam)"] >= 1).all()
+
+def test_store_timestamps_page(benchmark, scaled_actual_store):
+    """Jumlah timestamp unik + satu halaman pemilih tanggal dari SQL (tanpa cache)."""
+    benchmark.group = "actual: daftar tanggal"
+
+    def first_page():
+        return scaled_actual_store.count_timestamps(), scaled_actual_store.timestamps_page(0)
+
+    count, dates = benchmark(first_page)
+    assert count > 0 and len(dates) > 0
+
+def test_resample_sensor_stats(benchmark, scaled_actual_csv):
+    """Statistik harian per sensor lewat pandas resample atas seluruh data (pembanding, tanpa agregat)."""
+    benchmark.group = "actual: statistik harian"
+    reader = IncrementalCsvReader(scaled_actual_csv)
+    reader.refresh()
+    df = reader.frame()
+    channels = [c for c in df.columns if c not in ("PIER", "DATE")]
+
+    def resample():
+        return df.set_index("DATE").groupby("PIER")[channels].resample("1D").agg(["count", "mean", "std", "min", "max"])
+
+    benchmark(resample)
+
+def test_store_sensor_stats(benchmark, scaled_actual_store):
+    """ActualReadingStore.sensor_stats harian seluruh pier & rentang dari agregat tersimpan."""
+    benchmark.group = "actual: statistik harian"
+    table = benchmark(scaled_actual_store.sensor_stats, pd.Timedelta(days=1))
+    assert len(table) > 0
+
+def test_store_trend_full_range(benchmark, scaled_actual_store):
+    """ActualReadingStore.trend seluruh rentang satu pier (1000 titik per sensor, tanpa cache halaman)."""
+    benchmark.group = "actual: tren"
+    start, end = scaled_actual_store.time_range("P3A")
+    series = benchmark(scaled_actual_store.trend, "P3A", start, end, 1000)
+    assert 0 < len(series["time"]) <= 1000
+
+# ------------------------------------------
+# Visualisasi
+# ------------------------------------------
+
+@pytest.fixture(scope="module")
+def contour_inputs(page, sections_data, load_store):
+    cfg = page.PIER_CONFIG["Pier 3A"]
+    section = sections_data["Pier 3A"]["section"]
+    mesh_interp = page.get_cached_mesh_interpolator(cfg["length"], cfg["width"], 50)
+    unit_field = page.get_cached_unit_load_field(cfg["length"], cfg["width"], 50)
+    load_data = load_store.get(load_store.stages[58], cfg["part_id"])
+    load_vec = page.build_load_matrix(
+        load_data["Axial (kN)"], load_data["Moment-y (kN·m)"], load_data["Moment-z (kN·m)"])[0]
+    return {
+        "section": section,
+        "mesh_interp": mesh_interp,
+        "unit_field": unit_field,
+        "load_vec": load_vec,
+        "grid_z": unit_field.grid_stress(load_vec),
+        "sgs": cfg["sgs"]
+    }
+
+def test_stage_stress_fea(benchmark, contour_inputs):
+    """Grid σzz satu stage lewat stress recovery FEA + interpolasi (cara lama, pembanding)."""
+    benchmark.group = "plot: grid tegangan per stage"
+    section, mesh_interp = contour_inputs["section"], contour_inputs["mesh_interp"]
+    n, mxx, myy = contour_inputs["load_vec"]
+
+    def fea_grid():
+        sig_zz = section.calculate_stress(n=n, mxx=mxx, myy=myy).material_groups[0].stress_result.sig_zz
+        return mesh_interp.interpolate(sig_zz)
+
+    grid_z = benchmark(fea_grid)
+    np.testing.assert_allclose(grid_z, contour_inputs["grid_z"], rtol=1e-9, atol=1e-9)
+
+def test_stage_stress_unit_load(benchmark, contour_inputs):
+    """Grid σzz satu stage lewat superposisi medan beban satuan (grid × 3 @ beban)."""
+    benchmark.group = "plot: grid tegangan per stage"
+    benchmark(contour_inputs["unit_field"].grid_stress, contour_inputs["load_vec"])
+
+def test_stage_playback_figure(benchmark, page, contour_inputs, load_store):
+    """Figure playback seluruh stage (grid batch + kuantisasi + frames) untuk satu pier."""
+    benchmark.group = "plot: playback stage"
+    cfg = page.PIER_CONFIG["Pier 3A"]
+    unit_field, mesh_interp = contour_inputs["unit_field"], contour_inputs["mesh_interp"]
+    load_matrix = load_store.load_matrix(cfg["part_id"])
+    sg_values = load_matrix @ page.build_sensor_stress_coefficients(
+        contour_inputs["section"], list(cfg["sgs"].values())).T
+
+    def build():
+        grids = unit_field.grid_stress_stages(load_matrix, page.PLAYBACK_GRID_STRIDE)
+        return page.create_stage_playback_plot(
+            mesh_interp, load_store.stages, grids, cfg["sgs"], sg_values, "σzz", "MPa", "Playback",
+            stride=page.PLAYBACK_GRID_STRIDE, levels=page.PLAYBACK_LEVELS
+        )
+
+    fig = benchmark(build)
+    assert len(fig.frames) == len(load_store.stages)
+    benchmark.extra_info["payload_bytes"] = len(fig.to_json())
+
+def test_mesh_interpolate(benchmark, contour_inputs, page, sections_data):
+    """Interpolasi nilai nodal ke grid kontur (pengganti griddata)."""
+    benchmark.group = "plot"
+    mesh_interp = contour_inputs["mesh_interp"]
+    values = np.random.default_rng(0).random(mesh_interp.weights.shape[1])
+    benchmark(mesh_interp.interpolate, values)
+
+def test_create_mesh_plot(benchmark, page, contour_inputs):
+    """create_mesh_plot (kontur + wireframe + sensor) untuk mesh scale 50."""
+    benchmark.group = "plot"
+    mesh_interp, grid_z, sgs = contour_inputs["mesh_interp"], contour_inputs["grid_z"], contour_inputs["sgs"]
+    sg_values = {sg: float(i) for i, sg in enumerate(sgs)}
+    benchmark(page.create_mesh_plot, mesh_interp, grid_z, "σzz", "MPa", "Kontur", sgs, sg_values)
+
+def test_mesh_plot_serialize(benchmark, page, contour_inputs):
+    """Serialisasi JSON figure kontur (proksi biaya kirim ke browser)."""
+    benchmark.group = "plot"
+    mesh_interp, grid_z, sgs = contour_inputs["mesh_interp"], contour_inputs["grid_z"], contour_inputs["sgs"]
+    fig = page.create_mesh_plot(mesh_interp, grid_z, "σzz", "MPa", "Kontur", sgs, {sg: 0.0 for sg in sgs})
+    payload = benchmark(fig.to_json)
+    benchmark.extra_info["payload_bytes"] = len(payload)
@@ -1,253 +1,348 @@
+import time
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from sectionproperties.analysis import Section
-from sectionproperties.pre.library import rectangular_section
-from scipy.interpolate import griddata
+
+from shms.actual import (
+    IncrementalCsvReader, ActualTrendPyramid, format_duration
+)
+from shms.alerts import SensorAlertEngine
+from shms.config import (
+    ALERT_Z_LIMIT, ALERT_RATE_LIMIT, ALERT_DEVIATION_LIMIT,
+    STAGE_SCHEDULE_PATH, STAGE_SCHEDULE_COLUMNS, PERF_LOG_PATH, ACTUAL_STORE_PATH, ACTUAL_STORE_PAGE_SIZE,
+    ACTUAL_LIVE_REFRESH_SECONDS, SENSOR_STAT_LEVELS, PLAYBACK_GRID_STRIDE, PLAYBACK_LEVELS, PLAYBACK_FRAME_MS,
+    QUALITY_MAX_INTERP_GAP, QUALITY_SPIKE_MIN_DEV, QUALITY_STUCK_DURATION
+)
+from shms.export import get_export_artifact, get_export_file_name, iter_frame_chunks, iter_strain_index_chunks
+from shms.history import build_theoretical_strain_table, calculate_stress_history
+from shms.loads import LoadCaseStore, build_load_matrix, load_load_case_frame
+from shms.perf import (
+    get_perf_recorder, perf_cache_miss, perf_run, perf_span, perf_timer, record_perf_event, summarize_perf_events
+)
+from shms.plots import create_mesh_plot, create_stage_playback_plot
+from shms.quality import (
+    FLAG_GAP, IncrementalCleanIndex, flag_labels, get_clean_values_at, get_quality_config_key,
+    measured_strain_index, quality_gaps, quality_summary
+)
+from shms.registry import get_sensor_registry
+from shms.residuals import compute_residual_index, get_schedule_key, load_stage_schedule, save_stage_schedule
+from shms.section import (
+    MeshGridInterpolator, build_sensor_stress_coefficients, get_section_cache_key, load_or_build_section,
+    UnitLoadStressField, rectangular_geometry_spec
+)
+from shms.storage import get_columnar_cache_path, get_file_signature, hash_file
+from shms.store import ActualReadingStore, ActualStoreTrend
 
 # ==========================================
 # 1. KONFIGURASI DAN KONSTANTA (CONSTANTS)
 # ==========================================
 
-# Konfigurasi Geometri dan Sensor Pier
-PIER_CONFIG = {
-    "Pier 3A": {
-        "length": 5000, "width": 2000, "part_id": "I[3111]",
-        "sgs": {"SG-1": (0, 2500), "SG-2": (1000, 5000), "SG-3": (2000, 2500), "SG-4": (1000, 0)}
-    },
-    "Pier 3B": {
-        "length": 5000, "width": 2000, "part_id": "I[3211]",
-        "sgs": {"SG-5": (0, 2500), "SG-6": (1000, 5000), "SG-7": (2000, 2500), "SG-8": (1000, 0)}
-    },
-    "Pier 4A": {
-        "length": 5000, "width": 2000, "part_id": "I[4110]",
-        "sgs": {"SG-25": (0, 2500), "SG-26": (1000, 5000), "SG-27": (2000, 2500), "SG-28": (1000, 0)}
-    },
-    "Pier 4B": {
-        "length": 5000, "width": 2000, "part_id": "I[4210]",
-        "sgs": {"SG-29": (0, 2500), "SG-30": (1000, 5000), "SG-31": (2000, 2500), "SG-32": (1000, 0)}
-    }
-}
-
-# Nilai Baseline Konfigurasi (Nilai awal untuk kalibrasi)
-BASELINE_CONFIG = {
-    "P3A": {"SG-1": 1826.46, "SG-2": 2007.78, "SG-3": 1814.90, "SG-4": 2196.52},
-    "P3B": {"SG-5": 1505.90, "SG-6": 1709.25, "SG-7": 1735.80, "SG-8": 1852.26},
-    "P4A": {"SG-25": 3005.54, "SG-26": 2546.30, "SG-27": 2785.18, "SG-28": 2580.93},
-    "P4B": {"SG-29": 2861.34, "SG-30": 2740.62, "SG-31": 3150.29, "SG-32": 2920.12}
-}
-
-# Mapping Nama Pier
-PIER_MAP_SHORT = {
-    "Pier 3A": "P3A", "Pier 3B": "P3B",
-    "Pier 4A": "P4A", "Pier 4B": "P4B"
-}
+# Konfigurasi parameter data ada di shms/config.py; elemen & sensor di registri (config/sensors.json),
+# dikompilasi ulang hanya saat file registri berubah
+SENSOR_REGISTRY = get_sensor_registry()
+PIER_CONFIG = SENSOR_REGISTRY.elements_of_type("pier")
+BASELINE_CONFIG = SENSOR_REGISTRY.baseline_config
+PIER_MAP_SHORT = SENSOR_REGISTRY.logger_codes
+
+# Key session_state untuk panel debug performa
+PERF_DEBUG_KEY = "perf_debug"
 
 # ==========================================
 # 2. FUNGSI UTILITAS DATA (HELPER FUNCTIONS)
 # ==========================================
 
-@st.cache_data(ttl=15)
+# --- Instrumentasi hot path (waktu, jumlah panggilan, cache hit/miss, ukuran payload chart) ---
+
+def plotly_chart(fig, name, **kwargs):
+    """
+    st.plotly_chart dengan pencatatan waktu; ukuran payload JSON figure diukur hanya saat panel debug aktif
+    (serialisasi tambahan tidak dibayar pada penggunaan normal).
+    """
+    payload_bytes = None
+    if st.session_state.get(PERF_DEBUG_KEY, False):
+        payload_bytes = len(fig.to_json())
+    t0 = time.perf_counter()
+    result = st.plotly_chart(fig, **kwargs)
+    record_perf_event(f"Chart: {name}", time.perf_counter() - t0, payload_bytes=payload_bytes)
+    return result
+
+@perf_timer("Hash SHA-256 file", cached=True)
+@st.cache_resource(max_entries=8, show_spinner=False)
+@perf_cache_miss
+def _hash_file(path, file_signature):
+    return hash_file(path)
+
+def get_file_hash(path):
+    """
+    Hash SHA-256 isi file; dihitung ulang hanya saat tanda tangan file berubah.
+    """
+    return _hash_file(path, get_file_signature(path))
+
+@perf_timer("Muat data gaya (CSV/Parquet)", cached=True)
+@st.cache_resource(max_entries=2, show_spinner=False)
+@perf_cache_miss
+def _load_load_case_store(csv_path, file_signature):
+    return LoadCaseStore.from_dataframe(load_load_case_frame(csv_path))
+
+def load_load_case_store(csv_path):
+    """
+    Memuat data gaya sebagai LoadCaseStore.
+    Parsing hanya terjadi sekali per versi file (cache dikunci oleh mtime & ukuran).
+    """
+    return _load_load_case_store(csv_path, get_file_signature(csv_path))
+
+@st.cache_resource(show_spinner=False)
+def get_actual_strain_reader(csv_path):
+    """
+    Satu pembaca inkremental per file, dibagi ke seluruh sesi pengguna.
+    """
+    return IncrementalCsvReader(csv_path, snapshot_path=get_columnar_cache_path(csv_path))
+
 def load_actual_strain_data(csv_path):
     """
     Memuat data strain gauge aktual dari file CSV.
-    Melakukan pembersihan data dan konversi tipe data.
+    Hanya baris yang baru ditambahkan yang di-parsing; file yang tidak berubah cukup dicek lewat os.stat.
     """
     try:
-        df = pd.read_csv(csv_path)
-        # Konversi kolom DATE, dayfirst=False untuk asumsi format MM/DD/YYYY
-        df['DATE'] = pd.to_datetime(df['DATE'], dayfirst=False, errors='coerce')
-        
-        # Pastikan kolom sensor numerik
-        cols_to_numeric = ['SGA', 'SGB', 'SGC', 'SGD']
-        for c in cols_to_numeric:
-            if c in df.columns:
-                df[c] = pd.to_numeric(df[c], errors='coerce')
-                
-        # Hapus baris dengan tanggal tidak valid
-        return df.dropna(subset=['DATE'])
+        reader = get_actual_strain_reader(csv_path)
+        reader.refresh()
+        return reader.frame()
     except Exception as e:
         st.error(f"Gagal memuat data aktual: {e}")
         return pd.DataFrame()
 
-def get_actual_values_by_date(df, pier_short_name, selected_date, baseline_cfg):
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _get_clean_index_builder(csv_path, registry_key, quality_key):
+    return IncrementalCleanIndex(SENSOR_REGISTRY)
+
+@perf_timer("Update indeks bersih data aktual")
+def load_actual_strain_index(csv_path):
     """
-    Mengambil nilai strain aktual untuk pier dan tanggal tertentu,
-    kemudian mengurangi dengan nilai baseline.
+    Memuat indeks data aktual yang sudah melalui pipeline kualitas (deduplikasi, lonjakan, kanal macet,
+    grid interval per pier). Builder bersama seluruh sesi membersihkan seluruh riwayat sekali, lalu hanya
+    baris baru beserta jendela lookback-nya (IncrementalCleanIndex), sehingga murah dipanggil tiap rerun.
     """
-    if df.empty:
-        return None
-        
-    # Filter berdasarkan Pier dan Tanggal
-    row = df[(df['PIER'] == pier_short_name) & (df['DATE'] == selected_date)]
-    if row.empty:
-        return None
-    
-    vals = row.iloc[0]
-    
-    # Mapping kolom generik CSV (SGA...) ke nama sensor spesifik (SG-1...)
-    sg_map_generic = {
-        "P3A": ["SG-1", "SG-2", "SG-3", "SG-4"],
-        "P3B": ["SG-5", "SG-6", "SG-7", "SG-8"],
-        "P4A": ["SG-25", "SG-26", "SG-27", "SG-28"],
-        "P4B": ["SG-29", "SG-30", "SG-31", "SG-32"]
-    }
-    
-    target_sgs = sg_map_generic.get(pier_short_name)
-    if not target_sgs:
-        return None
+    builder = _get_clean_index_builder(csv_path, SENSOR_REGISTRY.key, get_quality_config_key())
+    if load_actual_strain_data(csv_path).empty:
+        return builder.index
+    return builder.update(get_actual_strain_reader(csv_path))
 
-    csv_cols = ["SGA", "SGB", "SGC", "SGD"]
-    result = {}
-    
-    for i, sg_key in enumerate(target_sgs):
-        if i < len(csv_cols):
-            raw_val = vals[csv_cols[i]]
-            base_val = baseline_cfg.get(sg_key, 0)
-            # Hitung Nilai Aktual = Raw - Baseline
-            result[sg_key] = raw_val - base_val
-        
-    return result
+@perf_timer("Ringkasan kualitas data", cached=True)
+@st.cache_resource(max_entries=2, show_spinner=False)
+@perf_cache_miss
+def _get_quality_report(csv_path, version, registry_key, _actual_index):
+    return quality_summary(_actual_index), quality_gaps(_actual_index)
 
-@st.cache_data
-def calculate_stress_history(df_gaya, list_stage, _sections_data, modulus_elastisitas):
+def get_quality_report(csv_path, actual_index):
     """
-    Menghitung riwayat tegangan dan regangan teoritis untuk semua stage.
+    (ringkasan per sensor, daftar gap) dari indeks bersih; dihitung per versi data atas seluruh riwayat.
     """
-    history_rows = []
-    
-    for stage in list_stage:
-        for pier_name, data in _sections_data.items():
-            sec = data['section']
-            part_id = data['part']
-            sgs = data['sgs']
-            
-            # Filter gaya berdasarkan part dan stage
-            gaya_pier = df_gaya[(df_gaya['Part'] == part_id) & (df_gaya['Stage'] == stage)]
-            if len(gaya_pier) == 0:
-                continue
-                
-            N = gaya_pier["Axial (kN)"].values[0]
-            My = gaya_pier["Moment-y (kN·m)"].values[0]
-            Mz = gaya_pier["Moment-z (kN·m)"].values[0]
-            
-            # Konversi satuan ke N dan Nmm
-            load_case = {"n": N * 1000, "mxx": Mz * 1e6, "myy": My * 1e6}
-            
-            pts = list(sgs.values())
-            try:
-                # Hitung tegangan di titik sensor
-                results = sec.get_stress_at_points(pts=pts, **load_case)
-                
-                for i, (sg_name, _) in enumerate(sgs.items()):
-                    sig_zz = results[i][0]
-                    strain = (sig_zz / modulus_elastisitas) * 1e6
-                    history_rows.append({
-                        "Stage": stage,
-                        "Pier": pier_name,
-                        "SG": sg_name,
-                        "Stress (MPa)": sig_zz,
-                        "Strain (με)": strain
-                    })
-            except Exception:
-                continue
-
-    return pd.DataFrame(history_rows)
+    version = get_actual_strain_reader(csv_path).version if actual_index.piers else -1
+    return _get_quality_report(csv_path, version, SENSOR_REGISTRY.key, actual_index)
+
+@st.cache_resource(show_spinner=False)
+def get_actual_store(db_path):
+    """
+    Satu koneksi store SQLite data aktual per file, dibagi ke seluruh sesi pengguna.
+    """
+    return ActualReadingStore(db_path)
+
+@perf_timer("Sinkronisasi data aktual")
+def refresh_actual_data(csv_path, db_path):
+    """
+    Memuat baris baru CSV aktual ke reader inkremental (alert, indeks, residual) dan ke store SQLite,
+    lalu mengembalikan store. Dipicu perubahan file (mtime, ukuran, inode): tanpa perubahan biayanya
+    hanya os.stat, dan cache turunan tetap valid karena versi reader & revisi store tidak berubah.
+    """
+    store = get_actual_store(db_path)
+    try:
+        get_actual_strain_reader(csv_path).refresh()
+        store.ingest_csv(csv_path)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        st.error(f"Gagal memperbarui data aktual: {e}")
+    return store
+
+@perf_timer("Daftar tanggal aktual (SQL)", cached=True)
+@st.cache_data(max_entries=16, show_spinner=False)
+@perf_cache_miss
+def _get_store_timestamps(db_path, revision, page):
+    store = get_actual_store(db_path)
+    return store.count_timestamps(), store.timestamps_page(page)
+
+def get_store_timestamps(store, page):
+    """
+    (jumlah timestamp unik, satu halaman timestamp terbaru lebih dulu); dihitung ulang hanya saat isi store berubah.
+    """
+    return _get_store_timestamps(store.db_path, store.revision(), page)
+
+@perf_timer("Statistik sensor (SQL)", cached=True)
+@st.cache_data(max_entries=32, show_spinner=False)
+@perf_cache_miss
+def _get_sensor_stats(db_path, revision, registry_key, width, piers, start, end):
+    return get_actual_store(db_path).sensor_stats(width, piers, start, end, registry=SENSOR_REGISTRY)
+
+def get_sensor_stats(store, width, piers=None, start=None, end=None):
+    """
+    Tabel statistik per bucket dari agregat tersimpan; dibaca ulang hanya saat isi store atau filter berubah.
+    """
+    piers = None if piers is None else tuple(sorted(piers))
+    return _get_sensor_stats(store.db_path, store.revision(), SENSOR_REGISTRY.key, pd.Timedelta(width).value,
+                             piers, start, end)
+
+@perf_timer("Tren aktual (SQL)", cached=True)
+@st.cache_data(max_entries=32, show_spinner=False)
+@perf_cache_miss
+def _get_store_trend(db_path, revision, registry_key, short_name, start, end, max_points):
+    return get_actual_store(db_path).trend(short_name, start, end, max_points, registry=SENSOR_REGISTRY)
+
+def get_store_trend(store):
+    """
+    Pengganti store.trend untuk ActualStoreTrend: seri tren dibaca ulang hanya saat isi store atau filter berubah.
+    """
+    def trend(short_name, start, end, max_points=1000, registry=None):
+        return _get_store_trend(store.db_path, store.revision(), SENSOR_REGISTRY.key, short_name,
+                                pd.Timestamp(start), pd.Timestamp(end), int(max_points))
+    return trend
+
+@perf_timer("Riwayat tegangan seluruh stage", cached=True)
+@st.cache_resource(max_entries=4, show_spinner=False)
+@perf_cache_miss
+def _calculate_stress_history(history_key, _load_store, _sections_data, modulus_elastisitas):
+    return calculate_stress_history(_load_store, _sections_data, modulus_elastisitas)
+
+def get_stress_history(history_key, load_store, sections_data, modulus_elastisitas):
+    """
+    Riwayat tegangan seluruh stage (satu perkalian matriks per pier), dibagi antar sesi dan
+    dihitung ulang hanya saat data gaya, registri, f'c, atau mesh scale (history_key) berubah.
+    """
+    return _calculate_stress_history(history_key, load_store, sections_data, modulus_elastisitas)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _get_sensor_alert_engine(csv_path, history_key, schedule_key, _load_store, _sections_data, modulus_elastisitas):
+    theory_table = build_theoretical_strain_table(_load_store, _sections_data, modulus_elastisitas)
+    return SensorAlertEngine(theory_table, _load_store.stage_index, schedule_key, SENSOR_REGISTRY)
+
+@perf_timer("Update alert streaming")
+def update_sensor_alerts(csv_path, history_key, load_store, sections_data, modulus_elastisitas):
+    """
+    Mesin alert bersama seluruh sesi, diperbarui dengan baris baru. Deviasi dihitung terhadap stage
+    terjadwal tiap pembacaan (jadwal tersimpan), sehingga engine hanya bergantung pada data dan parameter
+    (data gaya, registri, f'c, mesh scale, jadwal); engine baru memproses riwayat sekali, lalu hanya baris baru.
+    """
+    schedule_key = get_schedule_key(load_stage_schedule(STAGE_SCHEDULE_PATH, load_store.stages))
+    engine = _get_sensor_alert_engine(csv_path, history_key, schedule_key, load_store, sections_data,
+                                      modulus_elastisitas)
+    engine.update(get_actual_strain_reader(csv_path))
+    return engine
+
+@perf_timer("Residual seluruh riwayat", cached=True)
+@st.cache_resource(max_entries=4, show_spinner=False)
+@perf_cache_miss
+def _compute_residuals(csv_path, version, schedule_key, history_key, _actual_index, _stage_index_by_name, _theory_table):
+    # Slot interpolasi tidak ikut residual
+    residual_index = compute_residual_index(measured_strain_index(_actual_index), _stage_index_by_name, schedule_key,
+                                            _theory_table)
+    return residual_index, ActualTrendPyramid.from_index(residual_index)
+
+def load_residuals(csv_path, actual_index, schedule, history_key, load_store, sections_data, modulus_elastisitas):
+    """
+    Residual seluruh riwayat beserta agregat trennya; dihitung ulang hanya saat data aktual,
+    jadwal stage, atau parameter teoritis (history_key) berubah.
+    """
+    version = get_actual_strain_reader(csv_path).version if actual_index.piers else -1
+    schedule_key = get_schedule_key(schedule)
+    theory_table = build_theoretical_strain_table(load_store, sections_data, modulus_elastisitas)
+    return _compute_residuals(csv_path, version, schedule_key, history_key, actual_index,
+                              load_store.stage_index, theory_table)
 
 # ==========================================
 # 3. FUNGSI VISUALISASI (PLOTTING)
 # ==========================================
 
-@st.cache_resource
-def get_cached_section_geometry(length, width, mesh_scale):
+@perf_timer("Section (memori/disk)", cached=True)
+@st.cache_resource(show_spinner=False)
+@perf_cache_miss
+def _load_or_build_section(cache_key, geometry_spec, mesh_size, with_warping):
+    return load_or_build_section(geometry_spec, mesh_size, with_warping)
+
+def get_cached_section_geometry(length, width, mesh_scale, with_warping=False):
     """
     Membuat objek SectionProperties dengan mesh.
-    Di-cache untuk performa karena proses meshing cukup berat.
+    Di-cache di memori dan di disk (berbasis isi), sehingga restart server tidak perlu meshing ulang
+    dan geometri identik hanya di-mesh sekali.
     """
-    geom = rectangular_section(d=length, b=width)
-    geom.create_mesh(mesh_sizes=[float(length) * mesh_scale]) 
-    sec = Section(geometry=geom)
-    sec.calculate_geometric_properties()
-    sec.calculate_warping_properties()
-    return sec
+    geometry_spec = rectangular_geometry_spec(length, width)
+    mesh_size = float(length) * mesh_scale
+    cache_key = get_section_cache_key(geometry_spec, mesh_size, with_warping)
+    return _load_or_build_section(cache_key, geometry_spec, mesh_size, with_warping)
 
-def create_mesh_plot(x_coords, y_coords, values, nodes, elements, 
-                     symbol, unit, title, strain_gauges=None, strain_gauge_values=None):
+@perf_timer("Interpolator mesh", cached=True)
+@st.cache_resource
+@perf_cache_miss
+def get_cached_mesh_interpolator(length, width, mesh_scale):
     """
-    Membuat plot interaktif Kontur (Isolines) menggunakan Plotly.
+    MeshGridInterpolator untuk mesh pier (dibangun sekali per geometri & mesh scale).
     """
-    fig = go.Figure()
-    
-    # 1. Interpolasi Grid untuk Kontur
-    # Buat grid regular
-    grid_x, grid_y = np.mgrid[min(x_coords):max(x_coords):100j, min(y_coords):max(y_coords):100j]
-    
-    # Interpolasi nilai ke grid (method='linear' menghasilkan garis lurus untuk gradient linear)
-    grid_z = griddata((x_coords, y_coords), values, (grid_x, grid_y), method='linear')
-    
-    # 2. Plot Kontur
-    fig.add_trace(go.Contour(
-        x=np.linspace(min(x_coords), max(x_coords), 100),
-        y=np.linspace(min(y_coords), max(y_coords), 100),
-        z=grid_z.T, # Transpose karena mgrid output shape behavior
-        colorscale='RdYlBu_r',
-        colorbar=dict(title=dict(text=f"{symbol} ({unit})", side="right"), tickformat=".2f"),
-        contours=dict(
-            coloring='heatmap', # Warna fill + garis
-            showlabels=True,    # Tampilkan label nilai pada garis
-            labelfont=dict(size=10, color='black')
-        ),
-        ncontours=15, # Jumlah garis kontur
-        line=dict(smoothing=0), # Smoothing 0 agar akurat secara linear
-        hovertemplate=f"x: %{{x:.1f}}<br>y: %{{y:.1f}}<br>{symbol}: %{{z:.2f}} {unit}<extra></extra>",
-        name="Kontur"
-    ))
-    
-    # Anotasi Sensor
-    if strain_gauges:
-        for name, (sg_x, sg_y) in strain_gauges.items():
-            text_content = name
-            if strain_gauge_values and name in strain_gauge_values:
-                val = strain_gauge_values[name]
-                text_content += f"<br>{val:.2f} {unit}"
-                
-            fig.add_annotation(
-                x=sg_x, y=sg_y, text=text_content,
-                font=dict(color="black", size=10),
-                showarrow=True, arrowhead=2, arrowsize=1, arrowwidth=2, arrowcolor="yellow",
-                ax=0, ay=-30, bgcolor="yellow", bordercolor="black", borderwidth=1, opacity=0.8
-            )
-            # Marker Posisi Sensor
-            fig.add_trace(go.Scatter(
-                x=[sg_x], y=[sg_y], mode='markers',
-                marker=dict(symbol='circle', size=6, color='black'),
-                name=name, hoverinfo='name+x+y'
-            ))
+    sec = get_cached_section_geometry(length, width, mesh_scale)
+    return MeshGridInterpolator.from_section(sec)
 
-    # Garis Mesh (Wireframe) - Opsional, bisa di-comment jika mengganggu visual kontur
-    x_lines, y_lines = [], []
-    for tri in elements:
-        tri_nodes = nodes[tri]
-        # Loop segitiga: 0->1->2->0
-        x_tri = [tri_nodes[0, 0], tri_nodes[1, 0], tri_nodes[2, 0], tri_nodes[0, 0], None]
-        y_tri = [tri_nodes[0, 1], tri_nodes[1, 1], tri_nodes[2, 1], tri_nodes[0, 1], None]
-        x_lines.extend(x_tri)
-        y_lines.extend(y_tri)
-
-    fig.add_trace(go.Scatter(
-        x=x_lines, y=y_lines, mode='lines',
-        line=dict(color='rgba(100,100,100,0.1)', width=0.5), # Opacity dikurangi agar kontur jelas
-        hoverinfo='skip', showlegend=False
-    ))
+@perf_timer("Medan beban satuan", cached=True)
+@st.cache_resource
+@perf_cache_miss
+def get_cached_unit_load_field(length, width, mesh_scale):
+    """
+    Medan σzz nodal & grid untuk beban satuan (N, Mxx, Myy), dibangun sekali per geometri & mesh scale.
+    """
+    sec = get_cached_section_geometry(length, width, mesh_scale)
+    return UnitLoadStressField(sec, get_cached_mesh_interpolator(length, width, mesh_scale))
 
-    fig.update_layout(
-        xaxis_title="x (mm)", yaxis_title="y (mm)",
-        xaxis=dict(scaleanchor="y", scaleratio=1),
-        height=600, hovermode='closest', showlegend=False
+@perf_timer("Figure kontur teoritis", cached=True)
+@st.cache_resource(max_entries=64, show_spinner=False)
+@perf_cache_miss
+def get_theoretical_contour_figures(pier_name, stage, mesh_scale, modulus_elastisitas, load_case_values,
+                                    strain_gauges, _unit_field, _mesh_interp, _sg_stress_vals):
+    """
+    Membuat (dan memoize) pasangan figure kontur tegangan & regangan teoritis.
+    Dikunci oleh (pier, stage, mesh scale, E dari f'c, nilai beban, posisi sensor); grid tegangan
+    adalah superposisi medan beban satuan, grid regangan = grid tegangan dikali 1/E.
+    """
+    grid_stress = _unit_field.grid_stress(load_case_values)
+    grid_strain = (grid_stress / modulus_elastisitas) * 1e6
+    sg_strain_vals = {name: (val / modulus_elastisitas) * 1e6 for name, val in _sg_stress_vals.items()}
+
+    fig_stress = create_mesh_plot(_mesh_interp, grid_stress, "σzz", "MPa", "Tegangan", strain_gauges, _sg_stress_vals)
+    fig_strain = create_mesh_plot(_mesh_interp, grid_strain, "ε", "με", "Regangan", strain_gauges, sg_strain_vals)
+    return fig_stress, fig_strain
+
+@perf_timer("Figure playback stage", cached=True)
+@st.cache_resource(max_entries=8, show_spinner=False)
+@perf_cache_miss
+def get_stage_playback_figure(pier_name, mesh_scale, load_key, modulus_elastisitas, quantity, active_stage,
+                              strain_gauges, _load_store, _section, _unit_field, _mesh_interp):
+    """
+    Figure animasi kontur teoritis seluruh stage satu pier. Grid semua stage dihitung sekaligus
+    (superposisi beban satuan), lalu dijarangkan dan dikuantisasi agar payload tetap kecil.
+    """
+    load_matrix = _load_store.load_matrix(PIER_CONFIG[pier_name]["part_id"])
+    grids = _unit_field.grid_stress_stages(load_matrix, PLAYBACK_GRID_STRIDE)
+    sg_values = load_matrix @ build_sensor_stress_coefficients(_section, list(strain_gauges.values())).T
+    if quantity == "Regangan":
+        grids = (grids / modulus_elastisitas) * 1e6
+        sg_values = (sg_values / modulus_elastisitas) * 1e6
+        symbol, unit = "ε", "με"
+    else:
+        symbol, unit = "σzz", "MPa"
+
+    return create_stage_playback_plot(
+        _mesh_interp, _load_store.stages, grids, strain_gauges, sg_values, symbol, unit,
+        f"{quantity} Teoritis per Stage - {pier_name}", active=_load_store.stage_index[active_stage],
+        stride=PLAYBACK_GRID_STRIDE, levels=PLAYBACK_LEVELS, frame_ms=PLAYBACK_FRAME_MS
     )
-    return fig
 
 def create_actual_pier_plot(config, actual_values_dict, unit, title):
     """
@@ -306,6 +401,45 @@ def create_actual_pier_plot(config, actual_values_dict, unit, title):
     )
     return fig
 
+def create_actual_trend_plot(series, sensors, scale, unit, title):
+    """
+    Membuat grafik tren data aktual per sensor dari hasil ActualTrendPyramid.query.
+    Untuk data teragregasi ditampilkan garis rata-rata beserta pita min–max.
+    """
+    fig = go.Figure()
+    palette = px.colors.qualitative.Plotly
+    x = series["time"]
+
+    for i, sg_name in enumerate(sensors):
+        j = series["sensors"].index(sg_name)
+        color = palette[i % len(palette)]
+        mean = series["mean"][:, j] * scale
+
+        if series["aggregated"]:
+            # Pita min–max (dua trace: batas atas, lalu batas bawah yang di-fill ke atas)
+            fig.add_trace(go.Scatter(
+                x=x, y=series["max"][:, j] * scale, mode='lines',
+                line=dict(width=0, color=color), hoverinfo='skip', showlegend=False, legendgroup=sg_name
+            ))
+            fig.add_trace(go.Scatter(
+                x=x, y=series["min"][:, j] * scale, mode='lines', fill='tonexty',
+                line=dict(width=0, color=color), opacity=0.2, hoverinfo='skip', showlegend=False, legendgroup=sg_name
+            ))
+
+        fig.add_trace(go.Scattergl(
+            x=x, y=mean, mode='lines', name=sg_name, legendgroup=sg_name,
+            line=dict(color=color, width=1.5),
+            hovertemplate=f"{sg_name}<br>%{{x|%d %b %Y %H:%M}}<br>%{{y:.2f}} {unit}<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=14)),
+        xaxis_title="Tanggal", yaxis_title=unit,
+        height=500, hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
 def display_strain_gauge_table(strain_gauges, stress_values, modulus_elastisitas, title, baseline_values=None):
     """
     Menampilkan tabel metrik untuk setiap Strain Gauge (Kartu Kecil).
@@ -341,121 +475,491 @@ def display_strain_gauge_table(strain_gauges, stress_values, modulus_elastisitas
 # 4. KOMPONEN RENDER (RENDER COMPONENT)
 # ==========================================
 
-def render_pier_analysis(pier_name, section, load_data, strain_gauges, modulus_elastisitas, df_actual, selected_actual_date):
+@perf_timer("Render tab pier")
+def render_pier_analysis(pier_name, section, mesh_interp, unit_field, mesh_scale, load_data, strain_gauges,
+                         modulus_elastisitas, selected_actual_date, live=False):
     """
     Merender seluruh analisis untuk satu Pier (Teoritis vs Aktual).
     """
     # [A] Analisis Teoritis (Load Case)
-    N = load_data["Axial (kN)"].values[0]
-    My = load_data["Moment-y (kN·m)"].values[0]
-    Mz = load_data["Moment-z (kN·m)"].values[0]
-    load_case = {"n": N * 1000, "mxx": Mz * 1e6, "myy": My * 1e6}
-
-    # Hitung Stress Mesh
-    case_res = section.calculate_stress(**load_case)
-    sig_zz = case_res.material_groups[0].stress_result.sig_zz
-    strain_zz = (sig_zz / modulus_elastisitas) * 1e6
-    
-    # Mesh Data
-    nodes = section.mesh["vertices"]
-    elements = section.mesh["triangles"]
-    x_coords, y_coords = nodes[:, 0], nodes[:, 1]
+    N = load_data["Axial (kN)"]
+    My = load_data["Moment-y (kN·m)"]
+    Mz = load_data["Moment-z (kN·m)"]
+    load_vec = build_load_matrix(N, My, Mz)[0]
 
     # Hitung Nilai di Titik Sensor (Teoritis)
-    sg_pts = list(strain_gauges.values())
-    sg_res_arr = section.get_stress_at_points(pts=sg_pts, **load_case)
-    sg_stress_vals = {name: sg_res_arr[i][0] for i, name in enumerate(strain_gauges.keys())}
-    sg_strain_vals = {name: (val / modulus_elastisitas) * 1e6 for name, val in sg_stress_vals.items()}
+    sg_coeffs = build_sensor_stress_coefficients(section, list(strain_gauges.values()))
+    sg_stress_vals = dict(zip(strain_gauges.keys(), (sg_coeffs @ load_vec).tolist()))
+
+    # Figure kontur (di-memoize per pier, stage, mesh scale, dan f'c)
+    fig_stress, fig_strain = get_theoretical_contour_figures(
+        pier_name, load_data["Stage"], mesh_scale, modulus_elastisitas, tuple(load_vec.tolist()),
+        strain_gauges, unit_field, mesh_interp, sg_stress_vals
+    )
 
     # --- Tampilan Header & Info ---
     st.subheader("Informasi Beban & Struktur (Teoritis)")
     col1, col2, col3, col4, col5 = st.columns(5)
-    col1.metric("Stage", f"{load_data['Stage'].values[0]}")
-    col2.metric("Part ID", f"{load_data['Part'].values[0]}")
+    col1.metric("Stage", f"{load_data['Stage']}")
+    col2.metric("Part ID", f"{load_data['Part']}")
     col3.metric("Gaya Aksial", f"{N:.2f} kN")
     col4.metric("Momen My", f"{My:.2f} kN·m")
     col5.metric("Momen Mz", f"{Mz:.2f} kN·m")
 
-    # --- VISUALISASI SEJAJAR (ROW-BASED LAYOUT) ---
-    
+    # --- VISUALISASI SEJAJAR (KOLOM TEORITIS | KOLOM AKTUAL) ---
+    # Kolom aktual berdiri sendiri agar mode live dapat merender ulang hanya kolom tersebut
+    st.divider()
+    col_theory, col_actual = st.columns(2, gap="medium")
+
+    with col_theory:
+        st.markdown("### Analisis Teoritis (FEA)")
+        st.caption("Hasil perhitungan simulasi elemen hingga.")
+        st.write("**Diagram Tegangan (σzz)**")
+        plotly_chart(fig_stress, "Kontur tegangan", use_container_width=True)
+        st.write("**Diagram Regangan (ε)**")
+        plotly_chart(fig_strain, "Kontur regangan", use_container_width=True)
+        display_strain_gauge_table(strain_gauges, sg_stress_vals, modulus_elastisitas, "Detail Sensor (Teoritis)")
+
+    with col_actual:
+        if live:
+            # Fragment berkala: hanya kolom ini yang dijalankan ulang, sisi teoritis tidak dihitung ulang
+            live_column = st.fragment(render_actual_column, run_every=ACTUAL_LIVE_REFRESH_SECONDS)
+            live_column(pier_name, strain_gauges, modulus_elastisitas, None, live=True)
+        else:
+            render_actual_column(pier_name, strain_gauges, modulus_elastisitas, selected_actual_date)
+
+def render_actual_column(pier_name, strain_gauges, modulus_elastisitas, selected_actual_date, live=False):
+    """
+    Kolom Analisis Aktual satu pier: nilai bersih slot pembacaan terpilih (as-of) beserta flag kualitasnya,
+    dari indeks bersih yang sama dengan residual dan ekspor. Pembacaan lonjakan/macet tampil sebagai nilai
+    interpolasi bila celahnya pendek; sensor tanpa nilai (gap) tidak ditampilkan. Dalam mode live, data
+    baru dimuat bila file CSV berubah (indeks bersih hanya memproses baris baru) dan kolom menampilkan
+    pembacaan terakhir pier tersebut.
+    """
+    short_name = PIER_MAP_SHORT.get(pier_name)
+    if live:
+        # Store tetap disinkronkan untuk daftar tanggal, tren, dan statistik
+        refresh_actual_data('data/data_gaya_aktual.csv', ACTUAL_STORE_PATH)
+    actual_index = load_actual_strain_index('data/data_gaya_aktual.csv')
+    if live:
+        pier_data = actual_index.piers.get(short_name)
+        has_readings = pier_data is not None and len(pier_data["reading_timestamps"])
+        selected_actual_date = pd.Timestamp(pier_data["reading_timestamps"][-1]) if has_readings else None
+
     # 1. Prepare Actual Data (Pre-calculation)
     actual_data_ready = False
     actual_stress_data = {}
     actual_strain_data = {}
-    
-    if selected_actual_date and not df_actual.empty:
-        short_name = PIER_MAP_SHORT.get(pier_name)
-        baseline_cfg = BASELINE_CONFIG.get(short_name, {})
-        actual_strain_dict = get_actual_values_by_date(df_actual, short_name, selected_actual_date, baseline_cfg)
-        
-        if actual_strain_dict:
-            actual_data_ready = True
-            actual_strain_data = actual_strain_dict
+    actual_timestamp = None
+
+    flags = {}
+
+    if selected_actual_date is not None:
+        actual_result = get_clean_values_at(actual_index, short_name, selected_actual_date)
+
+        if actual_result:
+            actual_timestamp, actual_strain_data, flags = actual_result
+            actual_strain_data = {k: v for k, v in actual_strain_data.items() if v == v}
             actual_stress_data = {k: (v / 1e6) * modulus_elastisitas for k, v in actual_strain_data.items()}
+            actual_data_ready = bool(actual_strain_data)
+
+    # 2. Header
+    st.markdown("### Analisis Aktual (Lapangan)")
+    if actual_data_ready:
+        st.caption(f"Data Tanggal: **{actual_timestamp.strftime('%d %b %Y %H:%M')}**")
+        if live:
+            st.caption(f"🔴 Live: pembacaan terakhir, diperbarui tiap {ACTUAL_LIVE_REFRESH_SECONDS} detik "
+                       f"(dicek {pd.Timestamp.now().strftime('%H:%M:%S')}).")
+        elif actual_timestamp != selected_actual_date:
+            st.caption(f"Tidak ada pembacaan tepat pada {selected_actual_date.strftime('%d %b %Y %H:%M')}; "
+                       "ditampilkan pembacaan terakhir sebelumnya.")
+    elif selected_actual_date is None and not live:
+        st.info("Pilih tanggal di sidebar.")
+    else:
+        st.warning("Data tidak tersedia.")
+    if flags:
+        # Nilai lonjakan/macet dibuang pipeline kualitas: tampil nilai interpolasi, atau tidak ditampilkan (gap)
+        st.caption("Kualitas data: " + "; ".join(
+            f"{sg} ({flag_labels(code)}{', tidak ditampilkan' if code & FLAG_GAP else ''})"
+            for sg, code in flags.items()
+        ))
+    if not actual_data_ready:
+        return
+
+    # 3. Diagram tegangan & regangan
+    st.write("**Diagram Tegangan Aktual (σzz)**")
+    fig_stress_act = create_actual_pier_plot(PIER_CONFIG[pier_name], actual_stress_data, "MPa", "Tegangan Aktual")
+    plotly_chart(fig_stress_act, "Tegangan aktual", use_container_width=True)
+
+    st.write("**Diagram Regangan Aktual (ε)**")
+    fig_strain_act = create_actual_pier_plot(PIER_CONFIG[pier_name], actual_strain_data, "με", "Regangan Aktual")
+    plotly_chart(fig_strain_act, "Regangan aktual", use_container_width=True)
+
+    # 4. Tabel
+    sgs_present = {k: v for k, v in strain_gauges.items() if k in actual_stress_data}
+    baseline_cfg = BASELINE_CONFIG.get(short_name, {})
+    if sgs_present:
+        display_strain_gauge_table(sgs_present, actual_stress_data, modulus_elastisitas, "Detail Sensor (Aktual)", baseline_values=baseline_cfg)
 
-    # 2. ROW 1: HEADERS
+def render_stage_playback(pier_name, runtime, mesh_scale, load_store, load_key, stage, modulus_elastisitas):
+    """
+    Playback kontur teoritis seluruh stage konstruksi. Seluruh frame dikirim sekali;
+    Play dan slider berjalan di browser tanpa rerun server.
+    """
     st.divider()
-    row1_col1, row1_col2 = st.columns(2, gap="medium")
-    
-    with row1_col1:
-        st.markdown("### Analisis Teoritis (FEA)")
-        st.caption("Hasil perhitungan simulasi elemen hingga.")
-    
-    with row1_col2:
-        st.markdown("### Analisis Aktual (Lapangan)")
-        if actual_data_ready:
-            st.caption(f"Data Tanggal: **{selected_actual_date.strftime('%d %b %Y %H:%M')}**")
-        else:
-            if not selected_actual_date:
-                st.info("Pilih tanggal di sidebar.")
-            else:
-                st.warning("Data tidak tersedia.")
+    if not st.toggle("▶️ Playback Seluruh Stage", key=f"playback_{pier_name}"):
+        return
+    quantity = st.radio("Besaran", ["Tegangan", "Regangan"], horizontal=True, key=f"playback_quantity_{pier_name}")
 
-    # 3. ROW 2: STRESS DIAGRAMS
-    row2_col1, row2_col2 = st.columns(2, gap="medium")
-    
-    with row2_col1:
-        st.write("**Diagram Tegangan (σzz)**")
-        fig_stress = create_mesh_plot(x_coords, y_coords, sig_zz, nodes, elements, "σzz", "MPa", "Tegangan", strain_gauges, sg_stress_vals)
-        st.plotly_chart(fig_stress, use_container_width=True)
-        
-    with row2_col2:
-        st.write("**Diagram Tegangan Aktual (σzz)**")
-        if actual_data_ready:
-            fig_stress_act = create_actual_pier_plot(PIER_CONFIG[pier_name], actual_stress_data, "MPa", "Tegangan Aktual")
-            st.plotly_chart(fig_stress_act, use_container_width=True)
+    with st.spinner("Menyiapkan frame animasi..."):
+        fig = get_stage_playback_figure(
+            pier_name, mesh_scale, load_key, modulus_elastisitas, quantity, stage,
+            runtime["sgs"], load_store, runtime["section"], runtime["unit_field"], runtime["mesh_interp"]
+        )
+    if fig is None:
+        st.info("Tidak ada stage dengan data gaya untuk pier ini.")
+        return
+    plotly_chart(fig, "Playback stage", use_container_width=True)
+    skipped = len(load_store.stages) - len(fig.frames)
+    st.caption(f"{len(fig.frames)} stage" + (f" ({skipped} stage tanpa beban dilewati)" if skipped else "") +
+               f", skala warna tetap untuk seluruh stage (grid dikuantisasi {PLAYBACK_LEVELS} level); "
+               "nilai sensor ditampilkan presisi penuh.")
+
+def get_strain_index_date_range(index):
+    """
+    Rentang tanggal (min, max) seluruh pier pada ActualStrainIndex.
+    """
+    ts = [d["timestamps"] for d in index.piers.values() if len(d["timestamps"])]
+    if not ts:
+        return None
+    return (pd.Timestamp(min(t[0] for t in ts)).date(), pd.Timestamp(max(t[-1] for t in ts)).date())
+
+def render_export_panel(title, key_prefix, base_name, source_key, make_chunks, sensor_options, date_range=None,
+                        interpolation_option=False):
+    """
+    Panel ekspor dengan filter pier/sensor/tanggal, pilihan format (CSV/Parquet) dan kompresi.
+    File dibuat saat tombol diklik (callable download_button), ditulis per potongan, dan di-cache
+    di disk berdasarkan kunci sumber data + filter. interpolation_option menampilkan pilihan
+    untuk menyertakan slot hasil interpolasi (default: hanya slot terukur).
+    """
+    with st.expander(f"⬇️ {title}"):
+        col1, col2 = st.columns(2)
+        pier_options = list(sensor_options)
+        piers = col1.multiselect("Pier", pier_options, default=pier_options, key=f"{key_prefix}_piers")
+        available = [sg for p in piers for sg in sensor_options[p]]
+        sensors = col2.multiselect("Sensor", available, default=available, key=f"{key_prefix}_sensors")
+
+        start = end = None
+        col3, col4, col5 = st.columns([2, 1, 1])
+        if date_range is not None:
+            picked = col3.date_input("Rentang Tanggal", value=date_range, min_value=date_range[0],
+                                     max_value=date_range[1], key=f"{key_prefix}_dates")
+            if len(picked) == 2:
+                start = pd.Timestamp(picked[0])
+                end = pd.Timestamp(picked[1]) + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+        fmt = col4.radio("Format", ["CSV", "Parquet"], horizontal=True, key=f"{key_prefix}_format").lower()
+        compress = col5.checkbox("Kompres", value=False, help="CSV: gzip, Parquet: zstd", key=f"{key_prefix}_compress")
+
+        options = {}
+        if interpolation_option:
+            options["include_interpolated"] = st.checkbox(
+                "Sertakan slot interpolasi", value=False, key=f"{key_prefix}_interpolated",
+                help="Default hanya slot terukur; slot interpolasi ditandai di kolom Kualitas."
+            )
+
+        if not sensors:
+            st.info("Pilih minimal satu sensor.")
+            return
+
+        export_key = [source_key, sorted(piers), sorted(sensors), str(start), str(end), sorted(options.items())]
+
+        def build_export():
+            path = get_export_artifact(export_key, lambda: make_chunks(set(piers), set(sensors), start, end, **options),
+                                       fmt, compress)
+            if path is None:
+                return b""
+            with open(path, 'rb') as f:
+                return f.read()
+
+        file_name = get_export_file_name(base_name, fmt, compress)
+        if fmt == "parquet":
+            mime = "application/vnd.apache.parquet"
         else:
-            st.empty() # Placeholder empty
+            mime = "application/gzip" if compress else "text/csv"
+        st.download_button(
+            label=f"Download {file_name}",
+            data=build_export,
+            file_name=file_name,
+            mime=mime,
+            type="secondary",
+            key=f"{key_prefix}_download"
+        )
 
-    # 4. ROW 3: STRAIN DIAGRAMS
-    row3_col1, row3_col2 = st.columns(2, gap="medium")
+def render_stress_history_charts(df_history):
+    """
+    Menampilkan grafik riwayat tegangan & regangan teoritis per stage.
+    """
+    tabs_trend = st.tabs(["Grafik Tegangan", "Grafik Regangan"])
     
-    with row3_col1:
-        st.write("**Diagram Regangan (ε)**")
-        fig_strain = create_mesh_plot(x_coords, y_coords, strain_zz, nodes, elements, "ε", "με", "Regangan", strain_gauges, sg_strain_vals)
-        st.plotly_chart(fig_strain, use_container_width=True)
+    with tabs_trend[0]:
+        fig_stress = px.line(df_history, x="Stage", y="Stress (MPa)", color="SG", 
+                            facet_col="Pier", facet_col_wrap=2, markers=True,
+                            title="Riwayat Tegangan Teoritis per Stage")
+        fig_stress.update_layout(height=800)
+        plotly_chart(fig_stress, "Riwayat tegangan teoritis", use_container_width=True)
         
-    with row3_col2:
-        st.write("**Diagram Regangan Aktual (ε)**")
-        if actual_data_ready:
-            fig_strain_act = create_actual_pier_plot(PIER_CONFIG[pier_name], actual_strain_data, "με", "Regangan Aktual")
-            st.plotly_chart(fig_strain_act, use_container_width=True)
-        else:
-            st.empty()
+    with tabs_trend[1]:
+        fig_strain = px.line(df_history, x="Stage", y="Strain (με)", color="SG", 
+                            facet_col="Pier", facet_col_wrap=2, markers=True,
+                            title="Riwayat Regangan Teoritis per Stage")
+        fig_strain.update_layout(height=800)
+        plotly_chart(fig_strain, "Riwayat regangan teoritis", use_container_width=True)
 
-    # 5. ROW 4: TABLES
-    row4_col1, row4_col2 = st.columns(2, gap="medium")
-    
-    with row4_col1:
-         display_strain_gauge_table(strain_gauges, sg_stress_vals, modulus_elastisitas, "Detail Sensor (Teoritis)")
-         
-    with row4_col2:
-        if actual_data_ready:
-            sgs_present = {k: v for k, v in strain_gauges.items() if k in actual_stress_data}
-            short_name = PIER_MAP_SHORT.get(pier_name)
-            baseline_cfg = BASELINE_CONFIG.get(short_name, {})
-            if sgs_present:
-                display_strain_gauge_table(sgs_present, actual_stress_data, modulus_elastisitas, "Detail Sensor (Aktual)", baseline_values=baseline_cfg)
+def render_stress_history(df_history, history_key):
+    """
+    Merender grafik riwayat tegangan seluruh stage beserta panel ekspornya.
+    """
+    if df_history.empty:
+        st.warning("Data historis kosong.")
+        return
+
+    render_stress_history_charts(df_history)
+
+    # Ekspor dibuat hanya saat tombol diklik (bukan di setiap rerun)
+    render_export_panel(
+        "Ekspor Data Historis Teoritis", "export_history", "analisis_tren_teoritis", ("history",) + history_key,
+        lambda piers, sensors, start, end: iter_frame_chunks(
+            df_history[df_history["Pier"].isin(piers) & df_history["SG"].isin(sensors)]
+        ),
+        sensor_options={p: df_history.loc[df_history["Pier"] == p, "SG"].drop_duplicates().tolist()
+                        for p in df_history["Pier"].drop_duplicates()}
+    )
+
+def render_sensor_alerts(alert_engine):
+    """
+    Merender ringkasan dan tabel alert streaming data aktual.
+    """
+    st.caption(f"Referensi teoritis: stage terjadwal tiap pembacaan (`{STAGE_SCHEDULE_PATH}`). "
+               f"Batas: lonjakan > {ALERT_Z_LIMIT:g}σ (EWMA), laju > {ALERT_RATE_LIMIT:g} με/jam, "
+               f"deviasi > {ALERT_DEVIATION_LIMIT:g} με.")
+    if not alert_engine.scheduled:
+        st.info("Jadwal stage belum disimpan: pemeriksaan deviasi teoritis belum aktif.")
+    counts = alert_engine.alert_counts
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Lonjakan", counts.get("Lonjakan (z-score)", 0))
+    col2.metric("Laju Perubahan", counts.get("Laju perubahan (με/jam)", 0))
+    col3.metric("Deviasi Teoritis", counts.get("Deviasi dari teoritis (με)", 0))
+    active = alert_engine.active_deviations()
+    col4.metric("Sensor Masih Deviasi", len(active), help=", ".join(active) or None)
+
+    df_alerts = alert_engine.alert_table()
+    if df_alerts.empty:
+        st.success("Tidak ada alert.")
+    else:
+        st.dataframe(df_alerts, use_container_width=True, hide_index=True, height=300)
+
+@perf_timer("Render tren aktual")
+def render_actual_trend_analysis(trend_source, modulus_elastisitas, key_prefix="trend_actual", label="Aktual"):
+    """
+    Merender grafik tren data aktual (time series) per pier dan sensor dengan downsampling.
+    trend_source: ActualStoreTrend (agregasi SQL) atau ActualTrendPyramid (residual, di memori).
+    """
+    if not trend_source.piers:
+        st.info("Data aktual belum tersedia.")
+        return
+
+    pier_options = [name for name, short in PIER_MAP_SHORT.items() if short in trend_source.piers]
+    col1, col2, col3 = st.columns([1, 2, 1])
+    pier_name = col1.selectbox("Pier", pier_options, key=f"{key_prefix}_pier")
+    short_name = PIER_MAP_SHORT[pier_name]
+    sensors_available = trend_source.piers[short_name]["sensors"]
+    sensors = col2.multiselect("Sensor", sensors_available, default=sensors_available, key=f"{key_prefix}_sensors")
+    quantity = col3.radio("Besaran", ["Regangan (με)", "Tegangan (MPa)"], key=f"{key_prefix}_quantity")
+
+    t_min, t_max = (t.to_pydatetime() for t in trend_source.time_range(short_name))
+    if t_min == t_max:
+        t_max = t_max + pd.Timedelta(minutes=5)
+
+    col4, col5 = st.columns([3, 1])
+    start, end = col4.slider(
+        "Rentang Waktu", min_value=t_min, max_value=t_max, value=(t_min, t_max),
+        format="DD/MM/YY HH:mm", key=f"{key_prefix}_range_{short_name}"
+    )
+    max_points = col5.number_input(
+        "Titik maks. per sensor", min_value=100, max_value=5000, value=1000, step=100,
+        help="Sesuaikan dengan lebar grafik; data di-downsample (min/max/rata-rata) agar payload tetap kecil.",
+        key=f"{key_prefix}_max_points"
+    )
+
+    if not sensors:
+        st.info("Pilih minimal satu sensor.")
+        return
+
+    series = trend_source.query(short_name, start, end, max_points=int(max_points))
+    if series is None or len(series["time"]) == 0:
+        st.warning("Tidak ada data pada rentang waktu ini.")
+        return
+
+    if quantity.startswith("Tegangan"):
+        scale, unit = modulus_elastisitas / 1e6, "MPa"
+    else:
+        scale, unit = 1.0, "με"
+
+    fig = create_actual_trend_plot(series, sensors, scale, unit, f"Tren {quantity} {label} - {pier_name}")
+    plotly_chart(fig, f"Tren {label}", use_container_width=True)
+    st.caption(f"Resolusi: **{series['level']}** · {len(series['time'])} titik per sensor")
+
+def render_sensor_statistics(actual_store):
+    """
+    Statistik strain terkoreksi baseline per sensor (jumlah, rata-rata, std, min, max) per jam/hari,
+    dibaca dari agregat yang dipelihara store saat ingest, bukan resample seluruh data aktual.
+    """
+    piers_in_store = set(actual_store.piers())
+    pier_options = [name for name, short in PIER_MAP_SHORT.items() if short in piers_in_store]
+    if not pier_options:
+        st.info("Data aktual belum tersedia.")
+        return
+
+    col1, col2, col3 = st.columns([1, 1, 2])
+    level = col1.radio("Periode", list(SENSOR_STAT_LEVELS), horizontal=True, key="stats_level")
+    pier_name = col2.selectbox("Pier", pier_options, key="stats_pier")
+    short_name = PIER_MAP_SHORT[pier_name]
+    width = SENSOR_STAT_LEVELS[level]
+
+    t_min, t_max = (t.date() for t in actual_store.time_range(short_name))
+    picked = col3.date_input("Rentang Tanggal", value=(t_min, t_max), min_value=t_min, max_value=t_max,
+                             key=f"stats_dates_{short_name}")
+    if len(picked) != 2:
+        st.info("Pilih tanggal awal dan akhir.")
+        return
+    start = pd.Timestamp(picked[0])
+    end = pd.Timestamp(picked[1]) + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+
+    table = get_sensor_stats(actual_store, width, [short_name], start, end)
+    if table.empty:
+        st.warning("Tidak ada data pada rentang tanggal ini.")
+        return
+
+    # Grafik: rata-rata per bucket dengan pita min–max (format sama dengan grafik tren)
+    present = set(table["SG"])
+    sensors = [sg for sg in SENSOR_REGISTRY.sensor_ids(short_name) if sg in present]
+    pivot = {
+        key: table.pivot(index="Waktu", columns="SG", values=col).reindex(columns=sensors)
+        for key, col in [("mean", "Rata-rata (με)"), ("min", "Min (με)"), ("max", "Max (με)")]
+    }
+    series = {"sensors": sensors, "time": pivot["mean"].index.to_numpy(), "aggregated": True}
+    series.update({key: frame.to_numpy() for key, frame in pivot.items()})
+    fig = create_actual_trend_plot(series, sensors, 1.0, "με", f"Rata-rata {level} (pita min–max) - {pier_name}")
+    plotly_chart(fig, "Statistik sensor", use_container_width=True)
+
+    st.dataframe(
+        table, hide_index=True, use_container_width=True,
+        column_config={
+            "Waktu": st.column_config.DatetimeColumn(format="DD/MM/YYYY HH:mm"),
+            **{col: st.column_config.NumberColumn(format="%.2f") for col in table.columns if col.endswith("(με)")}
+        }
+    )
+
+    def make_stats_chunks(piers, sensors, start, end):
+        stats = get_sensor_stats(actual_store, width, piers, start, end)
+        return iter_frame_chunks(stats[stats["SG"].isin(sensors)])
+
+    ranges = [actual_store.time_range(short) for short in piers_in_store]
+    render_export_panel(
+        "Ekspor Statistik Sensor", "export_stats", f"statistik_{level.lower().replace(' ', '_')}",
+        ("stats", width.value, actual_store.revision(), SENSOR_REGISTRY.key), make_stats_chunks,
+        sensor_options={short: SENSOR_REGISTRY.sensor_ids(short) for short in sorted(piers_in_store)
+                        if short in SENSOR_REGISTRY.loggers},
+        date_range=(min(r[0] for r in ranges).date(), max(r[1] for r in ranges).date())
+    )
+
+def render_data_quality(csv_path, actual_index):
+    """
+    Ringkasan pipeline kualitas data aktual: cakupan & jumlah flag per sensor serta daftar gap.
+    """
+    summary, gaps = get_quality_report(csv_path, actual_index)
+    st.caption(
+        "Tiap pier di-snap ke grid sesuai interval normalnya (median selisih pembacaan, kolom Interval); "
+        "pembacaan ganda atau yang jatuh di slot yang sama: dipakai yang terakhir. "
+        f"Lonjakan (Hampel, min. {QUALITY_SPIKE_MIN_DEV:.0f} με) dan kanal macet (nilai identik ≥ "
+        f"{format_duration(QUALITY_STUCK_DURATION.value)}) dibuang; celah ≤ {format_duration(QUALITY_MAX_INTERP_GAP.value)} "
+        "diinterpolasi linier, celah lebih panjang dicatat sebagai gap. Cakupan hanya menghitung slot terukur; "
+        "slot interpolasi tidak ikut residual dan (default) ekspor."
+    )
+    st.dataframe(
+        summary, hide_index=True, use_container_width=True,
+        column_config={
+            "Cakupan (%)": st.column_config.ProgressColumn(format="%.1f%%", min_value=0, max_value=100),
+            "Gap Terpanjang (jam)": st.column_config.NumberColumn(format="%.1f")
+        }
+    )
+    with st.expander(f"Daftar Gap ≥ {format_duration(QUALITY_MAX_INTERP_GAP.value)} ({len(gaps)})"):
+        st.dataframe(
+            gaps, hide_index=True, use_container_width=True, height=300,
+            column_config={
+                "Mulai": st.column_config.DatetimeColumn(format="DD/MM/YYYY HH:mm"),
+                "Selesai": st.column_config.DatetimeColumn(format="DD/MM/YYYY HH:mm"),
+                "Durasi (jam)": st.column_config.NumberColumn(format="%.1f")
+            }
+        )
+
+def render_stage_schedule_editor(schedule):
+    """
+    Editor jadwal tanggal mulai stage; mengembalikan jadwal hasil edit (berlaku untuk sesi ini).
+    """
+    with st.expander("Jadwal Stage Konstruksi (Tanggal Mulai)", expanded=schedule[STAGE_SCHEDULE_COLUMNS[1]].isna().all()):
+        st.caption(f"Setiap pembacaan dipetakan ke stage dengan tanggal mulai terakhir sebelum pembacaan tersebut. "
+                   f"Stage tanpa tanggal dilewati. Jadwal tersimpan di `{STAGE_SCHEDULE_PATH}`.")
+        edited = st.data_editor(
+            schedule, hide_index=True, use_container_width=True, height=300, disabled=["Stage"],
+            column_config={
+                STAGE_SCHEDULE_COLUMNS[1]: st.column_config.DatetimeColumn(format="DD/MM/YYYY HH:mm")
+            },
+            key="stage_schedule_editor"
+        )
+        if st.button("💾 Simpan Jadwal"):
+            save_stage_schedule(edited, STAGE_SCHEDULE_PATH)
+            st.toast("Jadwal stage disimpan.")
+    return edited
+
+def render_residual_analysis(residual_index, residual_pyramid, list_stage, modulus_elastisitas, export_key):
+    """
+    Merender tren residual (aktual - teoritis) seluruh riwayat dan tombol unduh tabelnya.
+    """
+    render_actual_trend_analysis(residual_pyramid, modulus_elastisitas,
+                                 key_prefix="trend_residual", label="Residual (Aktual - Teoritis)")
+
+    render_export_panel(
+        "Ekspor Data Residual", "export_residual", "residual_aktual_teoritis", export_key,
+        lambda piers, sensors, start, end: iter_strain_index_chunks(residual_index, piers, sensors, start, end, stages=list_stage),
+        sensor_options={p: d["sensors"] for p, d in residual_index.piers.items()},
+        date_range=get_strain_index_date_range(residual_index)
+    )
+
+def render_perf_panel(run):
+    """
+    Panel debug performa di sidebar: waktu rerun terakhir per operasi dan statistik kumulatif.
+    """
+    st.sidebar.markdown("---")
+    if not st.sidebar.toggle("🐞 Panel Debug Performa", key=PERF_DEBUG_KEY,
+                             help="Menampilkan waktu per operasi, cache hit/miss, dan ukuran payload chart."):
+        return
+
+    st.sidebar.metric("Waktu Rerun Terakhir", f"{run['total'] * 1e3:.0f} ms")
+    events = pd.DataFrame(summarize_perf_events(run["events"]))
+    if not events.empty:
+        events = events.rename(columns={
+            "name": "Operasi", "calls": "Panggilan", "ms": "Total (ms)",
+            "hits": "Hit", "misses": "Miss", "bytes": "Payload (B)"
+        }).sort_values("Total (ms)", ascending=False)
+        st.sidebar.caption("Rerun terakhir")
+        st.sidebar.dataframe(events, hide_index=True, use_container_width=True)
+
+    st.sidebar.caption(f"Kumulatif (proses server) · log: `{PERF_LOG_PATH}`")
+    st.sidebar.dataframe(
+        get_perf_recorder().summary(), hide_index=True, use_container_width=True,
+        column_config={"Hit Rate Cache": st.column_config.NumberColumn(format="percent")}
+    )
 
 # ==========================================
 # 5. FUNGSI UTAMA (MAIN APP)
@@ -467,8 +971,8 @@ def main():
     
     # --- Load Data Master ---
     try:
-        df_gaya_all = pd.read_csv('data/data_gaya.csv')
-        list_stage = df_gaya_all['Stage'].unique().tolist()
+        load_store = load_load_case_store('data/data_gaya.csv')
+        list_stage = load_store.stages
     except FileNotFoundError:
         st.error("File 'data/data_gaya.csv' tidak ditemukan.")
         st.stop()
@@ -486,108 +990,140 @@ def main():
     
     st.sidebar.markdown("---")
     st.sidebar.header("Data Aktual")
-    df_actual = load_actual_strain_data('data/data_gaya_aktual.csv')
-    
+    actual_store = refresh_actual_data('data/data_gaya_aktual.csv', ACTUAL_STORE_PATH)
+    live = st.sidebar.toggle(
+        "🔴 Mode Live", key="actual_live",
+        help=f"Kolom Analisis Aktual menampilkan pembacaan terakhir dan diperbarui tiap {ACTUAL_LIVE_REFRESH_SECONDS} detik "
+             "tanpa memuat ulang halaman atau menghitung ulang sisi teoritis."
+    )
+
+    # Daftar tanggal diambil per halaman dari SQL, bukan seluruh riwayat
     selected_actual_date = None
-    if not df_actual.empty:
-        available_dates = df_actual['DATE'].sort_values(ascending=False).unique()
-        selected_actual_date = st.sidebar.selectbox("Pilih Tanggal Data Aktual", available_dates)
+    date_page = st.session_state.get("actual_date_page", 1)
+    n_timestamps, available_dates = get_store_timestamps(actual_store, date_page - 1)
+    if n_timestamps > 0:
+        n_pages = -(-n_timestamps // ACTUAL_STORE_PAGE_SIZE)
+        if n_pages > 1:
+            st.sidebar.number_input(
+                "Halaman Tanggal", min_value=1, max_value=n_pages, step=1, key="actual_date_page",
+                help=f"{ACTUAL_STORE_PAGE_SIZE} tanggal per halaman, terbaru lebih dulu ({n_timestamps} total)"
+            )
+        if len(available_dates) > 0:
+            selected_actual_date = st.sidebar.selectbox("Pilih Tanggal Data Aktual", available_dates, disabled=live)
 
     # --- Persiapan Model Geometri (Cached) ---
-    with st.spinner("Menyiapkan model geometri dan mesh..."):
+    with st.spinner("Menyiapkan model geometri dan mesh..."), perf_span("Persiapan geometri & mesh"):
         sections_runtime_data = {}
         for pier_name, cfg in PIER_CONFIG.items():
             sec_obj = get_cached_section_geometry(cfg["length"], cfg["width"], mesh_scale)
             sections_runtime_data[pier_name] = {
                 "section": sec_obj,
+                "mesh_interp": get_cached_mesh_interpolator(cfg["length"], cfg["width"], mesh_scale),
+                "unit_field": get_cached_unit_load_field(cfg["length"], cfg["width"], mesh_scale),
                 "part": cfg["part_id"],
                 "sgs": cfg["sgs"]
             }
 
+    # --- Kunci Riwayat Tegangan (data gaya, registri, f'c, mesh scale) ---
+    load_key = get_file_hash('data/data_gaya.csv')
+    history_key = (load_key, SENSOR_REGISTRY.key, float(kuat_tekan_beton), float(mesh_scale))
+
+    # --- Alert Streaming Data Aktual (hanya baris baru yang diproses) ---
+    alert_engine = update_sensor_alerts('data/data_gaya_aktual.csv', history_key, load_store, sections_runtime_data,
+                                        modulus_elastisitas)
+    active_deviations = alert_engine.active_deviations()
+    if active_deviations:
+        st.sidebar.warning(f"⚠️ {len(active_deviations)} sensor melewati batas deviasi teoritis: {', '.join(active_deviations)}")
+
     # --- Render Tabs ---
+    # Render lazy: hanya tab yang sedang dibuka yang dihitung & dirender (tab.open),
+    # hasil pier lain dihitung saat dibuka dan tersimpan di cache
     tab_names = list(PIER_CONFIG.keys()) + ["Analisis Tren"]
-    tabs = st.tabs(tab_names)
+    tabs = st.tabs(tab_names, key="active_tab", on_change="rerun")
     
     # Render Pier Tabs
     for i, (pier_name, cfg) in enumerate(PIER_CONFIG.items()):
+        if tabs[i].open is False:
+            continue
         with tabs[i]:
             st.header(f"Analisis Struktur - {pier_name}", divider="gray")
             
             # Ambil data gaya beban
             part_id = cfg["part_id"]
-            gaya_current = df_gaya_all[(df_gaya_all['Part'] == part_id) & (df_gaya_all['Stage'] == stage)]
+            gaya_current = load_store.get(stage, part_id)
             
-            if not gaya_current.empty:
+            if gaya_current is not None:
                 render_pier_analysis(
                     pier_name=pier_name,
                     section=sections_runtime_data[pier_name]["section"],
+                    mesh_interp=sections_runtime_data[pier_name]["mesh_interp"],
+                    unit_field=sections_runtime_data[pier_name]["unit_field"],
+                    mesh_scale=mesh_scale,
                     load_data=gaya_current,
                     strain_gauges=cfg["sgs"],
                     modulus_elastisitas=modulus_elastisitas,
-                    df_actual=df_actual,
-                    selected_actual_date=selected_actual_date
+                    selected_actual_date=selected_actual_date,
+                    live=live
+                )
+                render_stage_playback(
+                    pier_name, sections_runtime_data[pier_name], mesh_scale, load_store, load_key,
+                    stage, modulus_elastisitas
                 )
             else:
                 st.warning(f"Data beban tidak ditemukan untuk {pier_name} pada stage {stage}")
     
     
+    if tabs[-1].open is False:
+        return
+
     with tabs[-1]:
         st.header("Analisis Tren Historis (Teoritis)", divider="gray")
-        
-        st.info("Analisis tren melibatkan perhitungan berat untuk seluruh stage.")
-        
-        # Inisialisasi Session State untuk data tren
-        if 'trend_data' not in st.session_state:
-            st.session_state['trend_data'] = None
-
-        # Tombol Pemicu Kalkulasi
-        if st.button("Mulai Analisis Tren", type="primary"):
-            with st.spinner("Sedang menghitung data historis seluruh stage (mohon tunggu)..."):
-                try:
-                    df_history = calculate_stress_history(df_gaya_all, list_stage, sections_runtime_data, modulus_elastisitas)
-                    st.session_state['trend_data'] = df_history
-                    st.rerun() # Rerun untuk menampilkan hasil
-                except Exception as e:
-                    st.error(f"Terjadi kesalahan saat perhitungan: {e}")
-
-        # Tampilkan Hasil jika ada di Session State
-        if st.session_state['trend_data'] is not None:
-            df_history = st.session_state['trend_data']
-            
-            if not df_history.empty:
-                # Plotting
-                tabs_trend = st.tabs(["Grafik Tegangan", "Grafik Regangan"])
-                
-                with tabs_trend[0]:
-                    fig_stress = px.line(df_history, x="Stage", y="Stress (MPa)", color="SG", 
-                                        facet_col="Pier", facet_col_wrap=2, markers=True,
-                                        title="Riwayat Tegangan Teoritis per Stage")
-                    fig_stress.update_layout(height=800)
-                    st.plotly_chart(fig_stress, use_container_width=True)
-                    
-                with tabs_trend[1]:
-                    fig_strain = px.line(df_history, x="Stage", y="Strain (με)", color="SG", 
-                                        facet_col="Pier", facet_col_wrap=2, markers=True,
-                                        title="Riwayat Regangan Teoritis per Stage")
-                    fig_strain.update_layout(height=800)
-                    st.plotly_chart(fig_strain, use_container_width=True)
-                    
-                # Download Button
-                csv = df_history.to_csv(index=False).encode('utf-8')
-                st.download_button(
-                    label="Download Data Historis (CSV)",
-                    data=csv,
-                    file_name="analisis_tren_teoritis.csv",
-                    mime="text/csv",
-                    type="secondary"
-                )
-                
-                # Tombol Reset
-                if st.button("🔄 Reset Analisis"):
-                    st.session_state['trend_data'] = None
-                    st.rerun()
-            else:
-                st.warning("Data historis kosong.")
+        render_stress_history(
+            get_stress_history(history_key, load_store, sections_runtime_data, modulus_elastisitas), history_key
+        )
+
+        st.header("Analisis Tren Aktual (Lapangan)", divider="gray")
+        render_actual_trend_analysis(ActualStoreTrend(actual_store, SENSOR_REGISTRY, get_store_trend(actual_store)),
+                                     modulus_elastisitas)
+
+        # Ekspor, kualitas data & residual memakai indeks bersih di memori (seluruh riwayat)
+        actual_index = load_actual_strain_index('data/data_gaya_aktual.csv')
+        if actual_index.piers:
+            render_export_panel(
+                "Ekspor Data Aktual", "export_actual", "data_aktual",
+                ("actual", get_file_signature('data/data_gaya_aktual.csv'), SENSOR_REGISTRY.key,
+                 get_quality_config_key()),
+                lambda piers, sensors, start, end, **options: iter_strain_index_chunks(
+                    actual_index, piers, sensors, start, end, **options),
+                sensor_options={p: d["sensors"] for p, d in actual_index.piers.items()},
+                date_range=get_strain_index_date_range(actual_index),
+                interpolation_option=True
+            )
+
+            st.subheader("Kualitas Data Aktual")
+            render_data_quality('data/data_gaya_aktual.csv', actual_index)
+
+        st.subheader("Statistik Sensor Per Jam / Harian")
+        render_sensor_statistics(actual_store)
+
+        st.header("Residual Aktual vs Teoritis", divider="gray")
+        schedule = render_stage_schedule_editor(load_stage_schedule(STAGE_SCHEDULE_PATH, list_stage))
+        if schedule[STAGE_SCHEDULE_COLUMNS[1]].isna().all():
+            st.info("Isi tanggal mulai minimal satu stage untuk menghitung residual.")
+        elif actual_index.piers:
+            residual_index, residual_pyramid = load_residuals(
+                'data/data_gaya_aktual.csv', actual_index, schedule, history_key,
+                load_store, sections_runtime_data, modulus_elastisitas
+            )
+            residual_export_key = ("residual", get_file_signature('data/data_gaya_aktual.csv'), SENSOR_REGISTRY.key,
+                                   get_quality_config_key(), get_schedule_key(schedule)) + history_key
+            render_residual_analysis(residual_index, residual_pyramid, list_stage, modulus_elastisitas, residual_export_key)
+
+        st.header("Peringatan Otomatis Sensor (Alert)", divider="gray")
+        render_sensor_alerts(alert_engine)
 
 if __name__ == "__main__":
-    main()
+    # Log JSON-lines hanya saat panel debug aktif (nilai toggle dari rerun sebelumnya) atau SHMS_PERF_LOG=1
+    with perf_run("Monitoring Pier", log=st.session_state.get(PERF_DEBUG_KEY, False)) as perf_run_info:
+        main()
+    render_perf_panel(perf_run_info)
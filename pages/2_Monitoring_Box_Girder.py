@@ -1,13 +1,267 @@
 import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
 
-st.set_page_config(page_title="Monitoring Box Girder", layout="wide")
+from shms.config import GIRDER_LOAD_PATH
+from shms.history import calculate_stress_history
+from shms.loads import LoadCaseStore, build_load_matrix, load_load_case_frame
+from shms.perf import perf_run
+from shms.plots import create_mesh_plot
+from shms.registry import get_sensor_registry
+from shms.section import (
+    MeshGridInterpolator, box_girder_geometry_spec, build_sensor_stress_coefficients, get_section_cache_key,
+    UnitLoadStressField, load_or_build_section
+)
+from shms.storage import get_file_signature
 
-st.header("Monitoring Box Girder", divider=True)
-st.info("Fitur ini sedang dalam pengembangan.")
+# ==========================================
+# 1. KONFIGURASI DAN KONSTANTA (CONSTANTS)
+# ==========================================
 
-st.markdown("""
-### Rencana Fitur:
-- Visualisasi geometri Box Girder.
-- Monitoring Strain Gauge pada Box Girder.
-- Analisis data aktual vs teoritis.
-""")
+# Path data girder ada di shms/config.py; geometri segmen & sensor di registri (config/sensors.json)
+SENSOR_REGISTRY = get_sensor_registry()
+BOX_GIRDER_CONFIG = SENSOR_REGISTRY.elements_of_type("box_girder")
+
+# Ukuran mesh girder = tinggi box × mesh scale (mm²); flens tipis membatasi ukuran elemen
+GIRDER_DEFAULT_MESH_SCALE = 10
+
+# Label tab & peringatan untuk elemen contoh ("example": true di registri)
+EXAMPLE_TAB_SUFFIX = " (contoh)"
+EXAMPLE_NOTICE = ("**Data contoh.** Part ID, geometri, dan koordinat sensor segmen ini adalah placeholder "
+                  "di `config/sensors.json`, bukan desain/as-built, dan sensornya belum terhubung ke logger. "
+                  "Hasil analisis hanya ilustrasi sampai geometri dan sensor nyata dimasukkan ke registri.")
+
+# Kelompok posisi sensor berdasarkan koordinat y (untuk grafik & pemilihan sensor)
+SENSOR_GROUP_LABELS = {"top": "Pelat Atas", "bottom": "Pelat Bawah", "web": "Web"}
+
+# ==========================================
+# 2. FUNGSI UTILITAS DATA (HELPER FUNCTIONS)
+# ==========================================
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_girder_load_store(csv_path, file_signature):
+    return LoadCaseStore.from_dataframe(load_load_case_frame(csv_path))
+
+def load_girder_load_store(csv_path):
+    """
+    Memuat data gaya girder sebagai LoadCaseStore (None jika file belum tersedia).
+    """
+    try:
+        signature = get_file_signature(csv_path)
+    except FileNotFoundError:
+        return None
+    return _load_girder_load_store(csv_path, signature)
+
+@st.cache_resource(show_spinner=False)
+def _load_or_build_section(cache_key, geometry_spec, mesh_size):
+    return load_or_build_section(geometry_spec, mesh_size)
+
+@st.cache_resource(show_spinner=False)
+def get_cached_girder_model(segment_name, mesh_scale, registry_key):
+    """
+    Model penampang satu segmen girder: Section (cache memori & disk), interpolator grid,
+    medan σzz beban satuan, dan matriks koefisien σzz sensor. Dibangun sekali per segmen & mesh scale, lalu dipakai
+    bersama oleh kontur, tabel sensor, dan riwayat stage.
+    """
+    cfg = BOX_GIRDER_CONFIG[segment_name]
+    geometry_spec = box_girder_geometry_spec(**cfg["geometry"])
+    mesh_size = float(cfg["geometry"]["depth"]) * mesh_scale
+    cache_key = get_section_cache_key(geometry_spec, mesh_size, False)
+    section = _load_or_build_section(cache_key, geometry_spec, mesh_size)
+    mesh_interp = MeshGridInterpolator.from_section(section)
+    return {
+        "section": section,
+        "mesh_interp": mesh_interp,
+        "unit_field": UnitLoadStressField(section, mesh_interp),
+        "coeffs": build_sensor_stress_coefficients(section, list(cfg["sgs"].values())),
+        "part": cfg["part_id"],
+        "sgs": cfg["sgs"]
+    }
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _calculate_girder_history(history_key, _load_store, _sections_data, modulus_elastisitas):
+    return calculate_stress_history(_load_store, _sections_data, modulus_elastisitas)
+
+def get_sensor_group(cfg, sg_name):
+    """
+    Kelompok posisi sensor: serat atas, serat bawah, atau web.
+    """
+    y = cfg["sgs"][sg_name][1]
+    if y >= cfg["geometry"]["depth"]:
+        return "top"
+    if y <= 0:
+        return "bottom"
+    return "web"
+
+# ==========================================
+# 3. FUNGSI VISUALISASI (PLOTTING)
+# ==========================================
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_girder_contour_figures(segment_name, mesh_scale, registry_key, modulus_elastisitas, load_case_values,
+                               _model, _sg_stress_vals):
+    """
+    Membuat (dan memoize) pasangan figure kontur tegangan & regangan teoritis satu segmen girder.
+    """
+    mesh_interp = _model["mesh_interp"]
+    grid_stress = _model["unit_field"].grid_stress(load_case_values)
+    grid_strain = (grid_stress / modulus_elastisitas) * 1e6
+    sg_strain_vals = {name: (val / modulus_elastisitas) * 1e6 for name, val in _sg_stress_vals.items()}
+
+    fig_stress = create_mesh_plot(mesh_interp, grid_stress, "σzz", "MPa", "Tegangan", _model["sgs"], _sg_stress_vals)
+    fig_strain = create_mesh_plot(mesh_interp, grid_strain, "ε", "με", "Regangan", _model["sgs"], sg_strain_vals)
+    for fig in (fig_stress, fig_strain):
+        fig.update_layout(height=450)
+    return fig_stress, fig_strain
+
+def create_girder_history_plot(df_segment, sensors, title):
+    """
+    Grafik regangan teoritis sensor girder terhadap stage konstruksi.
+    """
+    df_plot = df_segment[df_segment["SG"].isin(sensors)]
+    fig = px.line(df_plot, x="Stage", y="Strain (με)", color="SG", markers=True, title=title)
+    fig.update_layout(height=450, hovermode='x unified', xaxis=dict(showticklabels=False))
+    return fig
+
+# ==========================================
+# 4. KOMPONEN RENDER (RENDER COMPONENT)
+# ==========================================
+
+def render_section_properties(model):
+    """
+    Ringkasan properti penampang dan mesh.
+    """
+    section = model["section"]
+    cx, cy = section.get_c()
+    ixx, iyy, _ = section.get_ic()
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Luas (A)", f"{section.get_area() / 1e6:.3f} m²")
+    col2.metric("Titik Berat (x, y)", f"{cx:.0f}, {cy:.0f} mm")
+    col3.metric("Ixx", f"{ixx / 1e12:.3f} m⁴")
+    col4.metric("Iyy", f"{iyy / 1e12:.3f} m⁴")
+    col5.metric("Elemen Mesh", f"{len(section.mesh['triangles'])}")
+
+def render_girder_analysis(segment_name, model, mesh_scale, load_label, load_vec, modulus_elastisitas):
+    """
+    Merender kontur teoritis dan tabel sensor satu segmen girder untuk satu load case.
+    """
+    cfg = BOX_GIRDER_CONFIG[segment_name]
+    sg_stress = model["coeffs"] @ load_vec
+    sg_stress_vals = dict(zip(model["sgs"].keys(), sg_stress.tolist()))
+
+    st.subheader("Properti Penampang")
+    render_section_properties(model)
+
+    st.subheader(f"Analisis Teoritis - {load_label}")
+    fig_stress, fig_strain = get_girder_contour_figures(
+        segment_name, mesh_scale, SENSOR_REGISTRY.key, modulus_elastisitas, tuple(load_vec.tolist()),
+        model, sg_stress_vals
+    )
+    st.write("**Diagram Tegangan (σzz)**")
+    st.plotly_chart(fig_stress, use_container_width=True)
+    st.write("**Diagram Regangan (ε)**")
+    st.plotly_chart(fig_strain, use_container_width=True)
+
+    st.subheader("Detail Sensor (Teoritis)")
+    df_sensor = pd.DataFrame({
+        "SG": list(model["sgs"].keys()),
+        "Posisi": [SENSOR_GROUP_LABELS[get_sensor_group(cfg, sg)] for sg in model["sgs"]],
+        "x (mm)": [x for x, _ in model["sgs"].values()],
+        "y (mm)": [y for _, y in model["sgs"].values()],
+        "σzz (MPa)": sg_stress,
+        "ε (με)": sg_stress / modulus_elastisitas * 1e6
+    })
+    st.dataframe(df_sensor, hide_index=True, use_container_width=True)
+
+def render_girder_history(df_history, segment_name):
+    """
+    Riwayat regangan teoritis seluruh stage untuk satu segmen, dipilih per kelompok sensor.
+    """
+    cfg = BOX_GIRDER_CONFIG[segment_name]
+    df_segment = df_history[df_history["Pier"] == segment_name]
+    if df_segment.empty:
+        st.info(f"Part {cfg['part_id']} tidak ditemukan di {GIRDER_LOAD_PATH}.")
+        return
+
+    group = st.radio(
+        "Kelompok Sensor", list(SENSOR_GROUP_LABELS), format_func=SENSOR_GROUP_LABELS.get,
+        horizontal=True, key=f"girder_history_group_{segment_name}"
+    )
+    sensors = [sg for sg in cfg["sgs"] if get_sensor_group(cfg, sg) == group]
+    fig = create_girder_history_plot(df_segment, sensors, f"Regangan Teoritis {SENSOR_GROUP_LABELS[group]} - {segment_name}")
+    st.plotly_chart(fig, use_container_width=True)
+
+# ==========================================
+# 5. FUNGSI UTAMA (MAIN APP)
+# ==========================================
+
+def main():
+    st.set_page_config(page_title="Monitoring Box Girder - Jembatan Sedyatmo - Kartaraja Ramp 1", layout="wide")
+    st.title("Monitoring Box Girder - Jembatan Sedyatmo - Kartaraja Ramp 1")
+
+    load_store = load_girder_load_store(GIRDER_LOAD_PATH)
+
+    # --- Sidebar Configuration ---
+    st.sidebar.header("Parameter Input")
+    kuat_tekan_beton = st.sidebar.number_input("Kuat Tekan Beton (MPa)", value=50)
+    mesh_scale = st.sidebar.number_input("Mesh Scale (Resolusi)", value=GIRDER_DEFAULT_MESH_SCALE,
+                                         help="Semakin kecil semakin detail tapi lambat")
+    modulus_elastisitas = 4700 * np.sqrt(kuat_tekan_beton)
+
+    stage = None
+    if load_store is not None:
+        stage = st.sidebar.selectbox("Pilih Stage Konstruksi", load_store.stages)
+    else:
+        st.info(f"File '{GIRDER_LOAD_PATH}' belum tersedia (format sama dengan data_gaya.csv). "
+                "Analisis memakai beban manual dari sidebar.")
+
+    st.sidebar.markdown("---")
+    st.sidebar.header("Beban Manual")
+    st.sidebar.caption("Dipakai jika data gaya segmen untuk stage terpilih tidak tersedia.")
+    manual_n = st.sidebar.number_input("Gaya Aksial (kN)", value=-20000.0)
+    manual_my = st.sidebar.number_input("Momen My (kN·m)", value=0.0)
+    manual_mz = st.sidebar.number_input("Momen Mz (kN·m)", value=-30000.0)
+
+    history_key = None
+    if load_store is not None:
+        history_key = (get_file_signature(GIRDER_LOAD_PATH), SENSOR_REGISTRY.key, float(mesh_scale))
+
+    # --- Render Tabs (lazy, seperti halaman pier) ---
+    # Model penampang (mesh + solve) dan riwayat stage dibangun per segmen hanya saat tabnya dibuka;
+    # segmen lain menyusul saat dibuka dan tersimpan di cache
+    tab_labels = [name + (EXAMPLE_TAB_SUFFIX if cfg.get("example") else "") for name, cfg in BOX_GIRDER_CONFIG.items()]
+    tabs = st.tabs(tab_labels, key="active_girder_tab", on_change="rerun")
+    for i, (segment_name, cfg) in enumerate(BOX_GIRDER_CONFIG.items()):
+        if tabs[i].open is False:
+            continue
+        with tabs[i]:
+            st.header(f"Analisis Struktur - {segment_name}", divider="gray")
+            if cfg.get("example"):
+                st.warning(EXAMPLE_NOTICE, icon="🧪")
+
+            load_data = load_store.get(stage, cfg["part_id"]) if load_store is not None else None
+            if load_data is not None:
+                load_vec = build_load_matrix(load_data["Axial (kN)"], load_data["Moment-y (kN·m)"],
+                                             load_data["Moment-z (kN·m)"])[0]
+                load_label = f"Stage {stage}"
+            else:
+                if load_store is not None:
+                    st.warning(f"Data beban tidak ditemukan untuk {segment_name} ({cfg['part_id']}) pada stage {stage}; "
+                               "memakai beban manual.")
+                load_vec = build_load_matrix(manual_n, manual_my, manual_mz)[0]
+                load_label = "Beban Manual"
+
+            with st.spinner("Menyiapkan model penampang dan mesh..."):
+                model = get_cached_girder_model(segment_name, mesh_scale, SENSOR_REGISTRY.key)
+            render_girder_analysis(segment_name, model, mesh_scale, load_label, load_vec, modulus_elastisitas)
+
+            if history_key is not None:
+                st.header("Analisis Tren Historis (Teoritis)", divider="gray")
+                df_history = _calculate_girder_history(history_key + (segment_name,), load_store,
+                                                       {segment_name: model}, modulus_elastisitas)
+                render_girder_history(df_history, segment_name)
+
+if __name__ == "__main__":
+    with perf_run("Monitoring Box Girder"):
+        main()
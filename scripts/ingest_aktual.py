@@ -0,0 +1,52 @@
+"""
+Impor data sensor aktual (CSV) ke store SQLite tanpa UI Streamlit.
+
+Dashboard juga menyinkronkan store secara inkremental saat halaman dibuka; skrip ini berguna
+untuk impor awal file besar atau dijadwalkan (cron) setelah logger menambah data.
+
+Jalankan dari root repo:
+    python scripts/ingest_aktual.py [--csv data/data_gaya_aktual.csv] [--db data/aktual.sqlite] [--rebuild]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from shms.config import ACTUAL_STORE_PATH
+from shms.store import ActualReadingStore
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default="data/data_gaya_aktual.csv", help="CSV data aktual")
+    parser.add_argument("--db", default=ACTUAL_STORE_PATH, help="File database SQLite")
+    parser.add_argument("--rebuild", action="store_true", help="Kosongkan store lalu impor ulang seluruh CSV")
+    args = parser.parse_args()
+
+    # Path relatif terhadap direktori pemanggil, bukan root repo
+    csv_path = Path(args.csv).resolve()
+    db_path = Path(args.db).resolve()
+    os.chdir(ROOT_DIR)
+    if not csv_path.exists():
+        parser.error(f"File tidak ditemukan: {csv_path}")
+
+    store = ActualReadingStore(str(db_path))
+    try:
+        t0 = time.perf_counter()
+        rows = store.ingest_csv(str(csv_path), rebuild=args.rebuild)
+        elapsed = time.perf_counter() - t0
+
+        print(f"Baris CSV diimpor      : {rows}")
+        print(f"Timestamp unik         : {store.count_timestamps()}")
+        print(f"Pier                   : {', '.join(store.piers())}")
+        print(f"Waktu                  : {elapsed:.2f} s")
+        print(f"Database               : {db_path}")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
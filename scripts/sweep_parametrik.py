@@ -0,0 +1,160 @@
+"""
+Sweep parametrik riwayat tegangan teoritis (f'c × mesh scale × pier × stage) tanpa UI Streamlit.
+
+Meshing penampang (bagian termahal) dibagi ke pool proses: satu task per kombinasi
+(geometri, mesh scale), sehingga pier dengan geometri identik hanya di-mesh sekali.
+Setiap task mengembalikan matriks koefisien sensor; seluruh stage lalu dihitung di proses
+utama dengan satu perkalian matriks per pier, dan variasi f'c hanya mengubah E (regangan).
+
+Jalankan dari root repo:
+    python scripts/sweep_parametrik.py --fc 30 35 40 45 50 55 60 --mesh-scale 25 50 100 \\
+        --output hasil_sweep.parquet [--jobs 16]
+
+Output .csv atau .parquet (ditentukan dari ekstensi) berisi satu tabel gabungan.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from shms.config import STRESS_HISTORY_COLUMNS
+from shms.history import assemble_stress_history, compute_stress_history_block, get_sensor_coefficients
+from shms.loads import LoadCaseStore, load_load_case_frame
+from shms.registry import get_sensor_registry
+from shms.section import get_section_geometry
+
+DEFAULT_FC = [30, 35, 40, 45, 50, 55, 60]
+DEFAULT_MESH_SCALE = [50]
+
+SWEEP_COLUMNS = ["f'c (MPa)", "E (MPa)", "Mesh Scale"]
+
+def init_worker():
+    """
+    Initializer proses worker: path 'data/...' relatif terhadap root repo.
+    """
+    os.chdir(ROOT_DIR)
+
+def get_pier_config():
+    """
+    Konfigurasi pier dari registri sensor (config/sensors.json).
+    """
+    return get_sensor_registry().elements_of_type("pier")
+
+def build_sweep_tasks(pier_config, mesh_scales, piers=None):
+    """
+    Mengelompokkan pier per (panjang, lebar, mesh scale) menjadi task meshing independen.
+    """
+    tasks = {}
+    for mesh_scale in mesh_scales:
+        for pier_name, cfg in pier_config.items():
+            if piers and pier_name not in piers:
+                continue
+            key = (float(cfg["length"]), float(cfg["width"]), float(mesh_scale))
+            tasks.setdefault(key, []).append(pier_name)
+    return tasks
+
+def run_sweep_task(length, width, mesh_scale, pier_names):
+    """
+    Task worker: mesh penampang (atau ambil dari cache disk) lalu susun koefisien sensor per pier.
+    """
+    t0 = time.perf_counter()
+    pier_config = get_pier_config()
+    section = get_section_geometry(length, width, mesh_scale)
+    coeffs = {
+        pier_name: get_sensor_coefficients({"section": section, "sgs": pier_config[pier_name]["sgs"]})
+        for pier_name in pier_names
+    }
+    return mesh_scale, coeffs, time.perf_counter() - t0
+
+def run_sweep(load_store, fc_values, mesh_scales, piers=None, jobs=None):
+    """
+    Menjalankan sweep dan mengembalikan (DataFrame gabungan, waktu meshing per task).
+    """
+    pier_config = get_pier_config()
+    tasks = build_sweep_tasks(pier_config, mesh_scales, piers)
+    coeffs_by_scale = {float(m): {} for m in mesh_scales}
+    task_times = []
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker) as pool:
+        futures = [
+            pool.submit(run_sweep_task, length, width, mesh_scale, pier_names)
+            for (length, width, mesh_scale), pier_names in tasks.items()
+        ]
+        for future in as_completed(futures):
+            mesh_scale, coeffs, elapsed = future.result()
+            coeffs_by_scale[mesh_scale].update(coeffs)
+            task_times.append(elapsed)
+
+    frames = []
+    for mesh_scale in coeffs_by_scale:
+        # Engine riwayat yang sama dengan dashboard; urutan pier mengikuti registri sensor
+        blocks = []
+        for pier_name, cfg in pier_config.items():
+            coeffs = coeffs_by_scale[mesh_scale].get(pier_name)
+            if coeffs is None:
+                continue
+            block = compute_stress_history_block(
+                load_store, pier_name, {"part": cfg["part_id"], "sgs": cfg["sgs"], "coeffs": coeffs}
+            )
+            if block is not None:
+                blocks.append(block)
+
+        for fc in fc_values:
+            modulus_elastisitas = 4700 * np.sqrt(fc)
+            df = assemble_stress_history(load_store.stages, blocks, modulus_elastisitas)
+            df.insert(0, "Mesh Scale", mesh_scale)
+            df.insert(0, "E (MPa)", modulus_elastisitas)
+            df.insert(0, "f'c (MPa)", float(fc))
+            frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=SWEEP_COLUMNS + STRESS_HISTORY_COLUMNS), task_times
+    return pd.concat(frames, ignore_index=True), task_times
+
+def write_sweep_result(df, output_path):
+    output_path = Path(output_path)
+    if output_path.suffix.lower() == ".parquet":
+        df.to_parquet(output_path, index=False)
+    else:
+        df.to_csv(output_path, index=False)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fc", type=float, nargs="+", default=DEFAULT_FC, help="Kuat tekan beton (MPa)")
+    parser.add_argument("--mesh-scale", type=float, nargs="+", default=DEFAULT_MESH_SCALE)
+    parser.add_argument("--pier", nargs="+", default=None, help="Batasi ke pier tertentu, mis. 'Pier 3A'")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Jumlah proses worker")
+    parser.add_argument("--output", default="hasil_sweep.csv", help="File output (.csv atau .parquet)")
+    args = parser.parse_args()
+
+    # Path output relatif terhadap direktori pemanggil, bukan root repo
+    output_path = Path(args.output).resolve()
+
+    init_worker()
+    unknown = set(args.pier or []) - set(get_pier_config())
+    if unknown:
+        parser.error(f"Pier tidak dikenal: {', '.join(sorted(unknown))}")
+
+    t0 = time.perf_counter()
+    load_store = LoadCaseStore.from_dataframe(load_load_case_frame("data/data_gaya.csv"))
+    df, task_times = run_sweep(load_store, args.fc, args.mesh_scale, args.pier, args.jobs)
+    write_sweep_result(df, output_path)
+    elapsed = time.perf_counter() - t0
+
+    print(f"Kombinasi              : {len(args.fc)} f'c × {len(args.mesh_scale)} mesh scale × {len(load_store.stages)} stage")
+    print(f"Task meshing           : {len(task_times)} (total {sum(task_times):.1f} s, {args.jobs} worker)")
+    print(f"Baris hasil            : {len(df)}")
+    print(f"Waktu total            : {elapsed:.1f} s")
+    print(f"Output                 : {output_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Core komputasi SHMS Jembatan Sedyatmo (tanpa dependensi UI/Streamlit).
+
+Modul:
+- config    : konstanta path, cache, dan ambang batas
+- registry  : registri sensor (elemen, kanal logger, koordinat, baseline) dari config/sensors.json
+- storage   : tanda tangan/hash file dan cache kolumnar Parquet
+- loads     : data gaya per stage & part (LoadCaseStore)
+- actual    : pembacaan inkremental data aktual, indeks per pier, agregat tren
+- quality   : pipeline kualitas data aktual (duplikat, lonjakan, kanal macet, grid waktu tetap, gap/cakupan)
+- store     : database SQLite pembacaan aktual (ingest inkremental, query per tanggal & tren)
+- section   : geometri persegi/box girder, meshing penampang (cache disk), koefisien tegangan sensor, medan beban satuan, interpolasi mesh
+- history   : riwayat tegangan teoritis seluruh stage
+- alerts    : mesin alert streaming data aktual
+- residuals : jadwal stage & residual aktual vs teoritis
+- export    : ekspor data per potongan (CSV/Parquet)
+- perf      : instrumentasi waktu & cache hit/miss
+- plots     : figure Plotly bersama (kontur mesh)
+
+Dependensi berat (sectionproperties, scipy) baru diimpor saat fungsi yang membutuhkannya dipanggil.
+"""
@@ -0,0 +1,471 @@
+"""
+Data strain gauge aktual: pembacaan inkremental CSV, indeks per pier, dan agregat tren.
+"""
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .config import ACTUAL_ASOF_TOLERANCE, ACTUAL_DATE_FORMAT, ACTUAL_SENSOR_DTYPE, TREND_LEVELS
+from .perf import perf_timer
+from .registry import get_sensor_registry
+from .storage import get_stat_signature, read_columnar_cache_metadata, write_columnar_cache
+
+def parse_actual_strain_chunk(data, columns, dtype=ACTUAL_SENSOR_DTYPE):
+    """
+    Mem-parsing potongan CSV data aktual (bytes tanpa header) menjadi DataFrame bertipe.
+    Melakukan pembersihan data dan konversi tipe data (kanal sensor ke dtype).
+    """
+    df = pd.read_csv(io.BytesIO(data), header=None, names=columns)
+
+    # Konversi kolom DATE dengan format eksplisit MM/DD/YYYY HH:MM (jauh lebih cepat dari inferensi)
+    raw_dates = df['DATE']
+    df['DATE'] = pd.to_datetime(raw_dates, format=ACTUAL_DATE_FORMAT, errors='coerce')
+    unparsed = df['DATE'].isna() & raw_dates.notna()
+    if unparsed.any():
+        # Fallback ke inferensi (dayfirst=False) hanya untuk baris yang formatnya menyimpang
+        df.loc[unparsed, 'DATE'] = pd.to_datetime(raw_dates[unparsed], format='mixed', dayfirst=False, errors='coerce')
+    df['DATE'] = df['DATE'].astype('datetime64[ns]')
+
+    # Pastikan kolom kanal sensor numerik (float, agar nilai rata-rata pecahan tidak terpotong)
+    for c in df.columns:
+        if c not in ('PIER', 'DATE'):
+            df[c] = pd.to_numeric(df[c], errors='coerce').astype(dtype)
+
+    # Hapus baris dengan tanggal tidak valid
+    return df.dropna(subset=['DATE'])
+
+def actual_strain_to_columnar(df):
+    """
+    Konversi DataFrame aktual ke skema kolumnar: PIER kategori, DATE int64 (ns epoch), sensor float32.
+    """
+    out = df.copy()
+    out['PIER'] = out['PIER'].astype('category')
+    out['DATE'] = out['DATE'].to_numpy(dtype='datetime64[ns]').view('int64')
+    return out
+
+def actual_strain_from_columnar(df):
+    """
+    Kebalikan actual_strain_to_columnar: DATE int64 dikembalikan menjadi datetime64[ns].
+    """
+    df['DATE'] = df['DATE'].to_numpy(dtype='int64').view('datetime64[ns]')
+    df['PIER'] = df['PIER'].astype(object)
+    return df
+
+class ColumnarBuffer:
+    """
+    Buffer kolom (array NumPy) yang tumbuh dengan kapasitas berlipat,
+    sehingga penambahan baris baru bersifat amortized O(1) per baris.
+    """
+
+    def __init__(self):
+        self.columns = []
+        self.size = 0
+        self._arrays = {}
+
+    def append(self, df):
+        if df.empty:
+            return
+        if not self._arrays:
+            self.columns = list(df.columns)
+            self._arrays = {c: np.empty(max(1024, len(df)), dtype=df[c].to_numpy().dtype) for c in self.columns}
+
+        needed = self.size + len(df)
+        capacity = len(next(iter(self._arrays.values())))
+        if needed > capacity:
+            new_capacity = max(needed, capacity * 2)
+            for c, arr in self._arrays.items():
+                grown = np.empty(new_capacity, dtype=arr.dtype)
+                grown[:self.size] = arr[:self.size]
+                self._arrays[c] = grown
+
+        for c in self.columns:
+            self._arrays[c][self.size:needed] = df[c].to_numpy()
+        self.size = needed
+
+    def to_frame(self):
+        if not self._arrays:
+            return pd.DataFrame()
+        return pd.DataFrame({c: self._arrays[c][:self.size] for c in self.columns}, copy=False)
+
+class IncrementalCsvReader:
+    """
+    Pembaca inkremental untuk file log CSV yang terus bertambah (append-only).
+
+    Menyimpan offset byte dan timestamp terakhir; setiap refresh hanya mem-parsing
+    baris lengkap yang baru ditambahkan. Reload penuh hanya dilakukan jika file
+    terpotong (ukuran mengecil) atau ditulis ulang (header/isi sebelumnya berubah).
+
+    Jika snapshot_path diberikan, pembacaan awal memakai snapshot Parquet yang
+    mencatat offset CSV yang sudah tercakup, lalu melanjutkan dari offset tersebut.
+    """
+
+    FINGERPRINT_BYTES = 64
+    SNAPSHOT_MIN_NEW_ROWS = 5000
+
+    def __init__(self, csv_path, parse_chunk=parse_actual_strain_chunk, snapshot_path=None):
+        self.csv_path = csv_path
+        self.parse_chunk = parse_chunk
+        self.snapshot_path = snapshot_path
+        self._lock = threading.Lock()
+        # Penghitung monoton (tidak diulang oleh _reset): versi data dan jumlah reload penuh
+        self.version = 0
+        self.full_reloads = 0
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.columns = None
+        self.last_timestamp = None
+        self._header = None
+        self._inode = None
+        self._signature = None
+        self._fingerprint = b""
+        self._buffer = ColumnarBuffer()
+        self._frame = None
+        self._rows_since_snapshot = 0
+        self._needs_snapshot = True
+
+    def _is_rewritten(self, f, stat):
+        """
+        Mendeteksi file yang terpotong atau ditulis ulang sejak pembacaan terakhir.
+        """
+        if stat.st_size < self.offset or stat.st_ino != self._inode:
+            return True
+        return not self._matches_prefix(f, self._header, self.offset, self._fingerprint)
+
+    @staticmethod
+    def _matches_prefix(f, header, offset, fingerprint):
+        """
+        Memastikan header dan byte tepat sebelum offset di file masih sama dengan yang tercatat.
+        """
+        f.seek(0)
+        if f.read(len(header)) != header:
+            return False
+        f.seek(offset - len(fingerprint))
+        return f.read(len(fingerprint)) == fingerprint
+
+    def _load_snapshot(self, f, stat):
+        """
+        Memuat snapshot Parquet jika masih konsisten dengan prefix CSV saat ini.
+        """
+        if self.snapshot_path is None:
+            return False
+        meta = read_columnar_cache_metadata(self.snapshot_path)
+        if meta is None or meta.get("source_path") != os.path.basename(self.csv_path):
+            return False
+
+        header = bytes.fromhex(meta["header"])
+        fingerprint = bytes.fromhex(meta["fingerprint"])
+        offset = meta["source_offset"]
+        if stat.st_size < offset or not self._matches_prefix(f, header, offset, fingerprint):
+            return False
+
+        self._buffer.append(actual_strain_from_columnar(pd.read_parquet(self.snapshot_path)))
+        self._header = header
+        self._inode = stat.st_ino
+        self.columns = header.decode('utf-8-sig').strip().split(',')
+        self.offset = offset
+        self._fingerprint = fingerprint
+        if meta.get("last_timestamp") is not None:
+            self.last_timestamp = pd.Timestamp(meta["last_timestamp"])
+        self._needs_snapshot = False
+        return True
+
+    def _write_snapshot(self):
+        """
+        Menyimpan isi buffer sebagai snapshot Parquet beserta offset CSV yang tercakup.
+        """
+        write_columnar_cache(actual_strain_to_columnar(self._buffer.to_frame()), self.snapshot_path, {
+            "source_path": os.path.basename(self.csv_path),
+            "source_offset": self.offset,
+            "header": self._header.hex(),
+            "fingerprint": self._fingerprint.hex(),
+            "last_timestamp": None if self.last_timestamp is None else self.last_timestamp.isoformat()
+        })
+        self._rows_since_snapshot = 0
+        self._needs_snapshot = False
+
+    @perf_timer("Refresh inkremental CSV aktual")
+    def refresh(self):
+        """
+        Membaca baris baru sejak offset terakhir. Mengembalikan True jika ada data baru.
+        File yang tidak berubah (mtime, ukuran, inode sama) hanya dibayar satu os.stat.
+        """
+        with self._lock:
+            stat = os.stat(self.csv_path)
+            signature = get_stat_signature(stat)
+            if self._header is not None and signature == self._signature:
+                return False
+            changed = self._read_new_rows(stat)
+            self._signature = signature
+            return changed
+
+    def _read_new_rows(self, stat):
+        """
+        Membaca bagian file yang belum tercakup sesuai hasil stat (dipanggil dengan lock).
+        """
+        with open(self.csv_path, 'rb') as f:
+            if self._header is not None and self._is_rewritten(f, stat):
+                self._reset()
+                self.version += 1
+                self.full_reloads += 1
+
+            from_snapshot = False
+            if self._header is None:
+                from_snapshot = self._load_snapshot(f, stat)
+                if from_snapshot:
+                    self.version += 1
+                    self._frame = None
+
+            if self._header is None:
+                f.seek(0)
+                header = f.readline()
+                if not header.endswith(b"\n"):
+                    return False
+                self._header = header
+                self._inode = stat.st_ino
+                self.columns = header.decode('utf-8-sig').strip().split(',')
+                self.offset = len(header)
+                self._fingerprint = header[-self.FINGERPRINT_BYTES:]
+
+            if stat.st_size <= self.offset:
+                return from_snapshot
+
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+
+        # Hanya proses sampai baris lengkap terakhir; sisa baris parsial dibaca pada refresh berikutnya
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return from_snapshot
+        data = data[:end]
+
+        chunk = self.parse_chunk(data, self.columns)
+        self._buffer.append(chunk)
+        self.offset += end
+        self._fingerprint = (self._fingerprint + data)[-self.FINGERPRINT_BYTES:]
+        if not chunk.empty:
+            chunk_max = chunk['DATE'].max()
+            if self.last_timestamp is None or chunk_max > self.last_timestamp:
+                self.last_timestamp = chunk_max
+        self.version += 1
+        self._frame = None
+
+        # Perbarui snapshot saat belum ada atau cukup banyak baris baru yang belum tercakup
+        self._rows_since_snapshot += len(chunk)
+        if self.snapshot_path is not None and (
+            self._needs_snapshot or self._rows_since_snapshot >= self.SNAPSHOT_MIN_NEW_ROWS
+        ):
+            self._write_snapshot()
+        return True
+
+    def frame(self):
+        """
+        DataFrame seluruh data yang sudah dibaca (di-cache per versi buffer).
+        """
+        with self._lock:
+            if self._frame is None:
+                self._frame = self._buffer.to_frame()
+            return self._frame
+
+class ActualStrainIndex:
+    """
+    Indeks data aktual per pier untuk lookup berbasis waktu.
+
+    Setiap pier menyimpan timestamp terurut (int64, ns) dan matriks strain yang sudah
+    dikurangi baseline (baris = pembacaan, kolom = sensor), sehingga lookup cukup
+    dengan binary search.
+    """
+
+    def __init__(self, piers, timestamps_desc):
+        self.piers = piers
+        self.timestamps_desc = timestamps_desc
+
+    @classmethod
+    def from_frame(cls, df, registry=None):
+        registry = get_sensor_registry() if registry is None else registry
+        piers = {}
+        if df.empty:
+            return cls(piers, pd.DatetimeIndex([]))
+
+        pier_codes, pier_names = pd.factorize(df['PIER'])
+        dates = df['DATE'].to_numpy(dtype='datetime64[ns]').view('int64')
+        # Urutkan sekali berdasarkan (pier, waktu); stable agar duplikat mempertahankan urutan file
+        order = np.lexsort((dates, pier_codes))
+        bounds = np.searchsorted(pier_codes[order], np.arange(len(pier_names) + 1))
+
+        for code, short_name in enumerate(pier_names):
+            found = registry.logger_columns(short_name, df.columns)
+            if found is None or not found[1]:
+                continue
+            sensor_index, cols = found
+            rows = order[bounds[code]:bounds[code + 1]]
+            raw = df[cols].to_numpy(dtype='float64')[rows]
+            piers[short_name] = {
+                "timestamps": dates[rows],
+                "sensors": registry.ids[sensor_index].tolist(),
+                "baseline": registry.baseline[sensor_index],
+                "raw": raw,
+                # Nilai Aktual = Raw - Baseline
+                "strain": raw - registry.baseline[sensor_index]
+            }
+
+        timestamps_desc = pd.DatetimeIndex(np.unique(dates)[::-1].view('datetime64[ns]'))
+        return cls(piers, timestamps_desc)
+
+    def lookup(self, pier_short_name, selected_date, tolerance=None):
+        """
+        Mencari pembacaan untuk waktu terpilih dengan semantik as-of: jika tidak ada
+        pembacaan tepat pada waktu tersebut, dipakai pembacaan terakhir sebelumnya
+        (selama selisihnya <= tolerance). Mengembalikan (timestamp, indeks baris) atau None.
+        """
+        pier = self.piers.get(pier_short_name)
+        if pier is None or len(pier["timestamps"]) == 0:
+            return None
+
+        ts = pier["timestamps"]
+        target = pd.Timestamp(selected_date).as_unit('ns').value
+        i = np.searchsorted(ts, target, side='left')
+        if i < len(ts) and ts[i] == target:
+            return pd.Timestamp(ts[i]), i
+
+        i -= 1
+        if i < 0:
+            return None
+        if tolerance is not None and target - ts[i] > pd.Timedelta(tolerance).value:
+            return None
+        return pd.Timestamp(ts[i]), i
+
+def get_actual_values_by_date(actual_index, pier_short_name, selected_date, tolerance=ACTUAL_ASOF_TOLERANCE):
+    """
+    Mengambil nilai strain aktual (sudah dikurangi baseline) untuk pier dan tanggal tertentu.
+    Mengembalikan (timestamp pembacaan yang dipakai, dict sensor -> strain) atau None.
+    Sensor tanpa nilai (NaN, mis. gap atau pembacaan yang dibuang pipeline kualitas) tidak disertakan.
+    """
+    found = actual_index.lookup(pier_short_name, selected_date, tolerance)
+    if found is None:
+        return None
+
+    timestamp, i = found
+    pier = actual_index.piers[pier_short_name]
+    values = {sg: v for sg, v in zip(pier["sensors"], pier["strain"][i].tolist()) if v == v}
+    return (timestamp, values) if values else None
+
+def format_duration(duration_ns):
+    """
+    Format singkat durasi (ns) untuk label: menit / jam / hari.
+    """
+    minutes = duration_ns / 60e9
+    if minutes >= 1440:
+        return f"{minutes / 1440:.1f} hari"
+    if minutes >= 60:
+        return f"{minutes / 60:.1f} jam"
+    return f"{minutes:.0f} menit"
+
+def aggregate_sorted_buckets(bucket_ids, count, total, vmin, vmax):
+    """
+    Menggabungkan statistik (count, sum, min, max) per bucket untuk data yang sudah terurut
+    (bucket_ids tidak menurun). Array statistik berbentuk (baris, sensor); NaN diabaikan.
+    """
+    if len(bucket_ids) == 0:
+        return bucket_ids, count, total, vmin, vmax
+    starts = np.flatnonzero(np.r_[True, bucket_ids[1:] != bucket_ids[:-1]])
+    return (
+        bucket_ids[starts],
+        np.add.reduceat(count, starts, axis=0),
+        np.add.reduceat(total, starts, axis=0),
+        np.fmin.reduceat(vmin, starts, axis=0),
+        np.fmax.reduceat(vmax, starts, axis=0)
+    )
+
+class ActualTrendPyramid:
+    """
+    Agregat bertingkat (5 menit / 1 jam / 1 hari) dari strain aktual per pier.
+
+    Setiap level menyimpan (waktu awal bucket, count, sum, min, max) per sensor sehingga
+    query rentang waktu apa pun cukup membaca level yang resolusinya sesuai lebar grafik,
+    lalu di-bucket ulang. Ukuran payload dibatasi max_points, berapa pun panjang riwayatnya.
+    """
+
+    def __init__(self, piers):
+        self.piers = piers
+
+    @classmethod
+    def from_index(cls, actual_index, levels=TREND_LEVELS):
+        piers = {}
+        for short_name, data in actual_index.piers.items():
+            ts = data["timestamps"]
+            strain = data["strain"]
+            valid = ~np.isnan(strain)
+            current = (ts, valid.astype(np.int64), np.where(valid, strain, 0.0), strain, strain)
+
+            pier_levels = [("Data mentah", 0, current)]
+            for label, width in levels.items():
+                width_ns = width.value
+                bucket_ids, count, total, vmin, vmax = aggregate_sorted_buckets(current[0] // width_ns, *current[1:])
+                current = (bucket_ids * width_ns, count, total, vmin, vmax)
+                pier_levels.append((label, width_ns, current))
+
+            piers[short_name] = {"sensors": data["sensors"], "levels": pier_levels}
+        return cls(piers)
+
+    def time_range(self, pier_short_name):
+        """
+        (timestamp pertama, timestamp terakhir) untuk satu pier, atau None jika kosong.
+        """
+        pier = self.piers.get(pier_short_name)
+        ts = None if pier is None else pier["levels"][0][2][0]
+        if ts is None or len(ts) == 0:
+            return None
+        return pd.Timestamp(ts[0]), pd.Timestamp(ts[-1])
+
+    def query(self, pier_short_name, start, end, max_points=1000):
+        """
+        Mengambil seri tren untuk rentang [start, end] dengan paling banyak max_points titik per sensor.
+        Mengembalikan dict: level, time, mean, min, max, aggregated (False jika data mentah).
+        """
+        pier = self.piers.get(pier_short_name)
+        if pier is None:
+            return None
+
+        t0 = pd.Timestamp(start).as_unit('ns').value
+        t1 = pd.Timestamp(end).as_unit('ns').value
+        # floor(rentang / max_points) + 1: (t - t0) // target_width < max_points untuk t <= t1
+        target_width = (t1 - t0) // max(max_points, 1) + 1
+
+        # Data mentah dipakai jika muat; jika tidak, pakai level terkasar yang lebar bucket-nya
+        # masih <= lebar target agar bentuk sinyal (min/max) tetap terjaga
+        label, width_ns, stats = pier["levels"][0]
+        lo = np.searchsorted(stats[0], t0, side='left')
+        hi = np.searchsorted(stats[0], t1, side='right')
+        if hi - lo > max_points:
+            for level in pier["levels"][1:]:
+                if level[1] > target_width:
+                    break
+                label, width_ns, stats = level
+            lo = np.searchsorted(stats[0], t0, side='left')
+            hi = np.searchsorted(stats[0], t1, side='right')
+
+        ts, count, total, vmin, vmax = (a[lo:hi] for a in stats)
+        aggregated = width_ns > 0
+        if len(ts) > max_points:
+            # Bucket ulang (min/max/mean) ke lebar target agar jumlah titik <= max_points
+            bucket_ids, count, total, vmin, vmax = aggregate_sorted_buckets((ts - t0) // target_width, count, total, vmin, vmax)
+            ts = t0 + bucket_ids * target_width
+            label = f"{label} → ±{format_duration(target_width)}"
+            aggregated = True
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+        return {
+            "level": label,
+            "sensors": pier["sensors"],
+            "time": ts.view('datetime64[ns]'),
+            "mean": mean,
+            "min": vmin,
+            "max": vmax,
+            "aggregated": aggregated
+        }
@@ -0,0 +1,178 @@
+"""
+Mesin alert streaming untuk pembacaan sensor aktual.
+"""
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .config import (
+    ALERT_DEVIATION_LIMIT, ALERT_EWMA_ALPHA, ALERT_LOG_SIZE, ALERT_MIN_STD, ALERT_RATE_LIMIT,
+    ALERT_WARMUP_READINGS, ALERT_Z_LIMIT
+)
+from .registry import get_sensor_registry
+from .residuals import build_theory_columns, get_schedule_starts, map_scheduled_stage
+
+class SensorAlertEngine:
+    """
+    Mesin alert streaming untuk data aktual.
+
+    Hanya baris yang baru ditambahkan ke reader yang diproses. Statistik per sensor
+    (EWMA rata-rata/varians, nilai & waktu terakhir, status deviasi) berukuran tetap,
+    sehingga biaya per baris baru konstan berapa pun panjang riwayatnya. Satu batch
+    baris baru diproses tervektorisasi per sensor (rekursi EWMA via lfilter).
+
+    Jenis alert:
+    - Lonjakan: |x - EWMA| melebihi ALERT_Z_LIMIT × simpangan baku EWMA.
+    - Laju perubahan: |Δx / Δt| melebihi ALERT_RATE_LIMIT (με/jam).
+    - Deviasi teoritis: |x - regangan teoritis stage terjadwal| mulai melebihi ALERT_DEVIATION_LIMIT
+      (dipicu saat masuk kondisi melewati batas, bukan di setiap pembacaan).
+
+    Referensi teoritis tiap pembacaan adalah stage yang berlaku pada waktunya menurut jadwal stage
+    (sama dengan residual), bukan pilihan di UI, sehingga log alert hanya bergantung pada data dan
+    parameter. Pembacaan sebelum jadwal pertama tidak diperiksa deviasinya.
+    """
+
+    ALERT_COLUMNS = ["Waktu", "Pier", "SG", "Jenis", "Strain (με)", "Nilai", "Batas"]
+
+    def __init__(self, theory_table, stage_index_by_name, schedule_key, registry=None):
+        self.registry = get_sensor_registry() if registry is None else registry
+        # Statistik hanya untuk sensor yang terhubung ke logger, urut per logger lalu kanal
+        wired = [logger["sensor_index"] for logger in self.registry.loggers.values()]
+        wired = np.concatenate(wired) if wired else np.array([], dtype=int)
+        self.sensors = self.registry.ids[wired].tolist()
+        self.slot = np.full(len(self.registry.ids), -1)
+        self.slot[wired] = np.arange(len(wired))
+        self.baseline = self.registry.baseline[wired]
+        # theory[indeks stage, slot sensor]; baris terakhir NaN untuk pembacaan sebelum jadwal pertama
+        self.theory = build_theory_columns(theory_table, self.sensors, len(stage_index_by_name))
+        self.stage_starts, self.stage_ids = get_schedule_starts(schedule_key, stage_index_by_name)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self, source=None):
+        n = len(self.sensors)
+        self.count = np.zeros(n, dtype=np.int64)
+        self.mean = np.zeros(n)
+        self.var = np.zeros(n)
+        self.last_value = np.full(n, np.nan)
+        self.last_time = np.zeros(n, dtype=np.int64)
+        self.deviating = np.zeros(n, dtype=bool)
+        self.alerts = deque(maxlen=ALERT_LOG_SIZE)
+        self.alert_counts = {}
+        self.processed = 0
+        # Generasi sumber: (reader, jumlah reload penuh); berubah saat reader diganti atau file ditulis ulang
+        self._source = source
+
+    def update(self, reader):
+        """
+        Memproses baris baru dari reader sejak pemanggilan terakhir. Mengembalikan jumlah alert baru.
+        """
+        with self._lock:
+            df = reader.frame()
+            reloaded = self._source is None or self._source[0] is not reader \
+                or self._source[1] != reader.full_reloads
+            if reloaded or len(df) < self.processed:
+                # Reader baru atau file ditulis ulang: statistik dihitung ulang dari awal
+                self._reset((reader, reader.full_reloads))
+            if len(df) == self.processed:
+                return 0
+
+            chunk = df.iloc[self.processed:]
+            self.processed = len(df)
+            before = sum(self.alert_counts.values())
+
+            pier_codes, pier_names = pd.factorize(chunk['PIER'])
+            dates = chunk['DATE'].to_numpy(dtype='datetime64[ns]').view('int64')
+            stage_idx = map_scheduled_stage(self.stage_starts, self.stage_ids, dates)
+            for code, short_name in enumerate(pier_names):
+                found = self.registry.logger_columns(short_name, chunk.columns)
+                if found is None or not found[1]:
+                    continue
+                ids = self.slot[found[0]]
+                cols = found[1]
+                rows = np.flatnonzero(pier_codes == code)
+                values = chunk[cols].to_numpy(dtype='float64')[rows] - self.baseline[ids]
+                for j, sensor_id in enumerate(ids):
+                    valid = ~np.isnan(values[:, j])
+                    if valid.any():
+                        self._process_sensor(short_name, sensor_id, dates[rows][valid], values[valid, j],
+                                             self.theory[stage_idx[rows][valid], sensor_id])
+            return sum(self.alert_counts.values()) - before
+
+    def _process_sensor(self, short_name, i, ts, x, theory):
+        """
+        Memperbarui statistik satu sensor dengan k pembacaan baru (urutan file) dan mencatat alert.
+        theory: regangan teoritis stage terjadwal untuk tiap pembacaan (NaN jika belum terjadwal).
+        """
+        from scipy.signal import lfilter
+
+        alpha = ALERT_EWMA_ALPHA
+        n0 = self.count[i]
+        m0 = self.mean[i] if n0 else x[0]
+        v0 = self.var[i] if n0 else 0.0
+
+        # EWMA rata-rata: m_t = α x_t + (1-α) m_{t-1}
+        mean = lfilter([alpha], [1, alpha - 1], x, zi=[(1 - alpha) * m0])[0]
+        mean_prev = np.r_[m0, mean[:-1]]
+        diff = x - mean_prev
+        # EWMA varians: v_t = (1-α) (v_{t-1} + α diff²)
+        var = lfilter([1 - alpha], [1, alpha - 1], alpha * diff ** 2, zi=[(1 - alpha) * v0])[0]
+        var_prev = np.r_[v0, var[:-1]]
+
+        z = np.abs(diff) / np.sqrt(np.maximum(var_prev, ALERT_MIN_STD ** 2))
+        spike = (n0 + np.arange(len(x)) >= ALERT_WARMUP_READINGS) & (z > ALERT_Z_LIMIT)
+
+        x_prev = np.r_[self.last_value[i], x[:-1]]
+        dt_hours = (ts - np.r_[self.last_time[i], ts[:-1]]) / 3.6e12
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rate = np.abs(x - x_prev) / dt_hours
+        rate_alert = (dt_hours > 0) & (rate > ALERT_RATE_LIMIT)
+
+        deviation = x - theory
+        exceeded = np.abs(deviation) > ALERT_DEVIATION_LIMIT
+        entered = exceeded & ~np.r_[self.deviating[i], exceeded[:-1]]
+
+        sensor = self.sensors[i]
+        self._record(short_name, sensor, "Lonjakan (z-score)", ts, x, spike, z, ALERT_Z_LIMIT)
+        self._record(short_name, sensor, "Laju perubahan (με/jam)", ts, x, rate_alert, rate, ALERT_RATE_LIMIT)
+        self._record(short_name, sensor, "Deviasi dari teoritis (με)", ts, x, entered, deviation, ALERT_DEVIATION_LIMIT)
+
+        self.count[i] = n0 + len(x)
+        self.mean[i] = mean[-1]
+        self.var[i] = var[-1]
+        self.last_value[i] = x[-1]
+        self.last_time[i] = ts[-1]
+        self.deviating[i] = exceeded[-1]
+
+    def _record(self, short_name, sensor, kind, ts, x, mask, metric, limit):
+        hits = np.flatnonzero(mask)
+        if len(hits) == 0:
+            return
+        self.alert_counts[kind] = self.alert_counts.get(kind, 0) + len(hits)
+        for k in hits[-ALERT_LOG_SIZE:]:
+            self.alerts.append((pd.Timestamp(ts[k]), short_name, sensor, kind, x[k], metric[k], limit))
+
+    @property
+    def scheduled(self):
+        """
+        True jika jadwal stage berisi minimal satu stage yang dikenal (pemeriksaan deviasi aktif).
+        """
+        return len(self.stage_starts) > 0
+
+    def active_deviations(self):
+        """
+        Daftar sensor yang pembacaan terakhirnya masih melewati batas deviasi teoritis.
+        """
+        with self._lock:
+            return [sg for sg, flag in zip(self.sensors, self.deviating) if flag]
+
+    def alert_table(self):
+        """
+        DataFrame alert terakhir (terbaru di atas).
+        """
+        with self._lock:
+            rows = list(self.alerts)
+        df = pd.DataFrame(rows, columns=self.ALERT_COLUMNS)
+        return df.sort_values("Waktu", ascending=False, kind="stable").reset_index(drop=True)
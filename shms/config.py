@@ -0,0 +1,99 @@
+"""
+Konfigurasi struktur, sensor, dan konstanta data SHMS.
+Path relatif (data/...) dihitung dari root repo (working directory aplikasi).
+"""
+import os
+from importlib.metadata import version as package_version
+
+import pandas as pd
+
+# Registri sensor (elemen struktur, kanal logger, koordinat, baseline); lihat shms/registry.py
+SENSOR_REGISTRY_PATH = os.path.join("config", "sensors.json")
+
+# Data gaya elemen girder per stage (opsional; tanpa file ini halaman girder memakai beban manual)
+GIRDER_LOAD_PATH = os.path.join("data", "data_gaya_girder.csv")
+
+# Kolom hasil riwayat tegangan teoritis
+STRESS_HISTORY_COLUMNS = ["Stage", "Pier", "SG", "Stress (MPa)", "Strain (με)"]
+
+# Kolom gaya dalam data_gaya.csv
+LOAD_CASE_COLUMNS = [
+    "Axial (kN)", "Shear-y (kN)", "Shear-z (kN)",
+    "Torsion (kN·m)", "Moment-y (kN·m)", "Moment-z (kN·m)"
+]
+
+# Format tanggal dan tipe kanal sensor dalam data_gaya_aktual.csv
+ACTUAL_DATE_FORMAT = "%m/%d/%Y %H:%M"
+ACTUAL_SENSOR_DTYPE = 'float32'
+
+# Database embedded (SQLite) pembacaan aktual, diisi dari data_gaya_aktual.csv (scripts/ingest_aktual.py)
+ACTUAL_STORE_PATH = os.path.join("data", "aktual.sqlite")
+ACTUAL_STORE_PAGE_SIZE = 500     # Jumlah timestamp per halaman pemilih tanggal
+
+# Statistik per sensor (n, rata-rata, std, min, max) yang dipelihara inkremental di store SQLite
+SENSOR_STAT_LEVELS = {
+    "Per Jam": pd.Timedelta(hours=1),
+    "Harian": pd.Timedelta(days=1)
+}
+
+# Mode live halaman Pier: interval fragment kolom aktual (detik); data dimuat ulang hanya bila file berubah
+ACTUAL_LIVE_REFRESH_SECONDS = 10
+
+# Batas selisih waktu untuk lookup as-of (pembacaan terakhir sebelum waktu terpilih)
+ACTUAL_ASOF_TOLERANCE = pd.Timedelta(hours=1)
+
+# Pipeline kualitas data aktual (shms/quality.py): grid interval per pier, batas interpolasi, lonjakan, kanal macet
+QUALITY_GRID_UNIT = pd.Timedelta(minutes=5)         # Interval grid tiap pier = median selisih pembacaan, dibulatkan ke kelipatan ini
+QUALITY_MAX_INTERP_GAP = pd.Timedelta(hours=1)      # Celah antar pembacaan valid yang masih diinterpolasi linier
+QUALITY_SPIKE_WINDOW = 9         # Jendela median bergulir (jumlah pembacaan) untuk deteksi lonjakan (Hampel)
+QUALITY_SPIKE_SIGMA = 6.0        # Batas |x - median| dalam satuan MAD terskala (≈ simpangan baku)
+QUALITY_SPIKE_MIN_DEV = 50.0     # Batas deviasi minimum (με); MAD kanal yang tenang sering 0 karena nilai bulat
+QUALITY_STUCK_DURATION = pd.Timedelta(hours=24)     # Nilai identik selama ini (tanpa gap) dianggap kanal macet
+
+# Resolusi agregat bertingkat untuk grafik tren data aktual (dari halus ke kasar)
+TREND_LEVELS = {
+    "5 menit": pd.Timedelta(minutes=5),
+    "1 jam": pd.Timedelta(hours=1),
+    "1 hari": pd.Timedelta(days=1)
+}
+
+# Playback stage (animasi kontur seluruh stage di klien): grid dijarangkan lalu dikuantisasi ke uint8
+PLAYBACK_GRID_STRIDE = 2         # Ambil tiap titik ke-n grid kontur (100 -> 50 titik per sumbu)
+PLAYBACK_LEVELS = 255            # Jumlah level warna (kode 0..254); kode 255 = di luar penampang
+PLAYBACK_FRAME_MS = 150          # Durasi tiap frame saat tombol Play
+
+# Cache kolumnar (Parquet) untuk file CSV di folder data/
+COLUMNAR_CACHE_DIRNAME = ".cache"
+COLUMNAR_CACHE_META_KEY = b"shms"
+COLUMNAR_CACHE_SCHEMA_VERSION = 1
+
+# Cache disk untuk objek Section yang sudah di-mesh (berbasis isi)
+SECTION_CACHE_DIR = os.path.join("data", COLUMNAR_CACHE_DIRNAME, "sections")
+SECTION_CACHE_VERSION = 1
+SECTIONPROPERTIES_VERSION = package_version("sectionproperties")
+
+# Jadwal tanggal mulai tiap stage konstruksi (untuk residual aktual vs teoritis)
+STAGE_SCHEDULE_PATH = os.path.join("data", "jadwal_stage.csv")
+STAGE_SCHEDULE_COLUMNS = ["Stage", "Tanggal Mulai"]
+
+# Ekspor data (dibuat saat tombol diklik, ditulis per potongan, di-cache di disk)
+EXPORT_CACHE_DIR = os.path.join("data", COLUMNAR_CACHE_DIRNAME, "exports")
+EXPORT_CHUNK_ROWS = 100_000
+EXPORT_CACHE_MAX_FILES = 16
+EXPORT_SCHEMA_VERSION = 2       # Naikkan bila kolom/isi file ekspor berubah; ikut kunci cache artefak
+
+# Instrumentasi performa (log terstruktur per rerun)
+PERF_HISTORY_SIZE = 200
+PERF_LOG_PATH = os.path.join("data", COLUMNAR_CACHE_DIRNAME, "perf_log.jsonl")
+PERF_LOG_MAX_BYTES = 5 * 1024 * 1024
+# Log JSON-lines hanya ditulis saat panel debug aktif, atau untuk semua rerun bila env var ini bernilai 1
+PERF_LOG_ENV = "SHMS_PERF_LOG"
+
+# Parameter alert streaming data aktual (strain dalam με, sudah dikurangi baseline)
+ALERT_EWMA_ALPHA = 0.05          # Bobot EWMA (≈ rata-rata 20 pembacaan terakhir)
+ALERT_WARMUP_READINGS = 12       # Jumlah pembacaan sebelum alert z-score aktif
+ALERT_Z_LIMIT = 6.0              # Batas |x - EWMA| / simpangan baku EWMA
+ALERT_MIN_STD = 1.0              # Simpangan baku minimum (με) agar kanal yang sangat stabil tidak memicu alert
+ALERT_RATE_LIMIT = 150.0         # Batas laju perubahan (με/jam)
+ALERT_DEVIATION_LIMIT = 150.0    # Batas selisih aktual vs teoritis stage aktif (με)
+ALERT_LOG_SIZE = 500             # Jumlah alert terakhir yang disimpan
@@ -0,0 +1,144 @@
+"""
+Ekspor data per potongan (CSV/gzip/Parquet) dengan cache artefak di disk.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .config import EXPORT_CACHE_DIR, EXPORT_CACHE_MAX_FILES, EXPORT_CHUNK_ROWS, EXPORT_SCHEMA_VERSION
+from .quality import FLAG_INTERPOLATED, flag_labels
+
+def strain_index_rows(index, short_name, lo, hi, sensor_ids, stages=None, include_interpolated=False):
+    """
+    Tabel panjang untuk baris [lo, hi) satu pier dari ActualStrainIndex (aktual atau residual).
+    Kolom: Waktu, Pier, (Stage), SG, lalu nilai strain sesuai jenis indeks (dan flag kualitas bila ada).
+    Slot hasil interpolasi pada indeks bersih dibuang kecuali include_interpolated.
+    """
+    data = index.piers[short_name]
+    n, k = hi - lo, len(sensor_ids)
+    df = pd.DataFrame({
+        "Waktu": np.repeat(data["timestamps"][lo:hi].view('datetime64[ns]'), k),
+        "Pier": short_name
+    })
+    if "theory" in data:
+        stage_labels = np.asarray(list(stages) + [None], dtype=object)
+        df["Stage"] = np.repeat(stage_labels[data["stage"][lo:hi]], k)
+    df["SG"] = np.tile(np.asarray(data["sensors"], dtype=object)[sensor_ids], n)
+
+    strain = data["strain"][lo:hi][:, sensor_ids]
+    if "theory" in data:
+        theory = data["theory"][lo:hi][:, sensor_ids]
+        df["Aktual (με)"] = (strain + theory).ravel()
+        df["Teoritis (με)"] = theory.ravel()
+        df["Residual (με)"] = strain.ravel()
+        return df.dropna(subset=["Residual (με)"])
+
+    df["Raw"] = data["raw"][lo:hi][:, sensor_ids].ravel()
+    df["Strain (με)"] = strain.ravel()
+    if "flags" in data:
+        # Indeks bersih (grid per pier): sertakan flag kualitas, lewati slot gap
+        flags = data["flags"][lo:hi][:, sensor_ids].ravel()
+        df["Kualitas"] = flag_labels(flags)
+        if not include_interpolated:
+            df = df[(flags & FLAG_INTERPOLATED) == 0]
+        return df.dropna(subset=["Strain (με)"])
+    return df
+
+def iter_strain_index_chunks(index, piers=None, sensors=None, start=None, end=None, stages=None,
+                             chunk_rows=EXPORT_CHUNK_ROWS, include_interpolated=False):
+    """
+    Generator potongan tabel panjang dari ActualStrainIndex dengan filter pier, sensor, dan rentang waktu.
+    Rentang waktu dicari dengan searchsorted; setiap potongan berisi paling banyak ±chunk_rows baris.
+    """
+    t0 = None if start is None else pd.Timestamp(start).as_unit('ns').value
+    t1 = None if end is None else pd.Timestamp(end).as_unit('ns').value
+    for short_name, data in index.piers.items():
+        if piers is not None and short_name not in piers:
+            continue
+        sensor_ids = [j for j, sg in enumerate(data["sensors"]) if sensors is None or sg in sensors]
+        if not sensor_ids:
+            continue
+        ts = data["timestamps"]
+        lo = 0 if t0 is None else np.searchsorted(ts, t0, side='left')
+        hi = len(ts) if t1 is None else np.searchsorted(ts, t1, side='right')
+        step = max(chunk_rows // len(sensor_ids), 1)
+        for r0 in range(lo, hi, step):
+            yield strain_index_rows(index, short_name, r0, min(r0 + step, hi), sensor_ids, stages,
+                                  include_interpolated)
+
+def iter_frame_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Generator potongan baris DataFrame (view, tanpa salinan penuh).
+    """
+    for r0 in range(0, len(df), chunk_rows):
+        yield df.iloc[r0:r0 + chunk_rows]
+
+def write_export_file(chunks, path, fmt, compress):
+    """
+    Menulis potongan DataFrame ke file CSV (opsional gzip) atau Parquet secara streaming,
+    sehingga memori puncak sebanding ukuran satu potongan, bukan seluruh ekspor.
+    """
+    if fmt == "parquet":
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False,
+                                             schema=None if writer is None else writer.schema)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression="zstd" if compress else "snappy")
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return writer is not None
+
+    opener = gzip.open if compress else open
+    header = True
+    with opener(path, 'wt', encoding='utf-8', newline='') as f:
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=header)
+            header = False
+    return not header
+
+def get_export_file_name(base_name, fmt, compress):
+    if fmt == "parquet":
+        return f"{base_name}.parquet"
+    return f"{base_name}.csv.gz" if compress else f"{base_name}.csv"
+
+def get_export_artifact(export_key, make_chunks, fmt, compress):
+    """
+    Path file ekspor untuk kunci input tertentu (+ EXPORT_SCHEMA_VERSION); dibuat (streaming) hanya jika
+    belum ada di cache disk. Mengembalikan None jika hasil filter kosong.
+    """
+    digest = hashlib.sha256(json.dumps([EXPORT_SCHEMA_VERSION, export_key, fmt, bool(compress)], default=str).encode()).hexdigest()
+    path = os.path.join(EXPORT_CACHE_DIR, get_export_file_name(digest, fmt, compress))
+    if os.path.exists(path):
+        os.utime(path)
+        return path
+
+    os.makedirs(EXPORT_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if not write_export_file(make_chunks(), tmp_path, fmt, compress):
+            return None
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    # Simpan hanya artefak terbaru
+    files = sorted((os.path.join(EXPORT_CACHE_DIR, name) for name in os.listdir(EXPORT_CACHE_DIR)
+                    if not name.endswith(".tmp")), key=os.path.getmtime, reverse=True)
+    for old_path in files[EXPORT_CACHE_MAX_FILES:]:
+        try:
+            os.remove(old_path)
+        except OSError:
+            pass
+    return path
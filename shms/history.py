@@ -0,0 +1,82 @@
+"""
+Riwayat tegangan & regangan teoritis seluruh stage (tervektorisasi).
+"""
+import numpy as np
+import pandas as pd
+
+from .config import STRESS_HISTORY_COLUMNS
+from .section import build_sensor_stress_coefficients
+
+def get_sensor_coefficients(data):
+    """
+    Matriks koefisien σzz sensor dari dict data section (pakai data['coeffs'] bila tersedia).
+    """
+    coeffs = data.get('coeffs')
+    if coeffs is None:
+        coeffs = build_sensor_stress_coefficients(data['section'], list(data['sgs'].values()))
+    return coeffs
+
+def compute_stress_history_block(load_store, pier_name, data):
+    """
+    Riwayat tegangan satu pier: matriks (stage, sensor) dari satu perkalian matriks.
+    Mengembalikan dict blok atau None jika part pier tidak ada di data gaya.
+    Koefisien sensor yang sudah dihitung sebelumnya dapat diberikan lewat data['coeffs'].
+    """
+    sgs = data['sgs']
+    if data['part'] not in load_store.part_index:
+        return None
+
+    coeffs = get_sensor_coefficients(data)
+    return {
+        "stress": load_store.load_matrix(data['part']) @ coeffs.T,
+        "piers": [pier_name] * len(sgs),
+        "sgs": list(sgs.keys())
+    }
+
+def assemble_stress_history(list_stage, blocks, modulus_elastisitas):
+    """
+    Menggabungkan blok per pier menjadi DataFrame riwayat dengan urutan Stage -> Pier -> SG.
+    """
+    if not blocks:
+        return pd.DataFrame(columns=STRESS_HISTORY_COLUMNS)
+
+    stress = np.hstack([b["stress"] for b in blocks])
+    pier_labels = [p for b in blocks for p in b["piers"]]
+    sg_labels = [sg for b in blocks for sg in b["sgs"]]
+
+    n_stage, n_sensor = stress.shape
+    df_history = pd.DataFrame({
+        "Stage": np.repeat(np.asarray(list_stage, dtype=object), n_sensor),
+        "Pier": np.tile(np.asarray(pier_labels, dtype=object), n_stage),
+        "SG": np.tile(np.asarray(sg_labels, dtype=object), n_stage),
+        "Stress (MPa)": stress.ravel(),
+    })
+    df_history["Strain (με)"] = (df_history["Stress (MPa)"] / modulus_elastisitas) * 1e6
+
+    # Stage tanpa data beban untuk pier tertentu dilewati
+    return df_history.dropna(subset=["Stress (MPa)"]).reset_index(drop=True)
+
+def calculate_stress_history(load_store, sections_data, modulus_elastisitas):
+    """
+    Menghitung riwayat tegangan dan regangan teoritis untuk semua stage.
+    Seluruh stage × sensor dihitung sekaligus dengan satu perkalian matriks per pier.
+    """
+    blocks = []
+    for pier_name, data in sections_data.items():
+        block = compute_stress_history_block(load_store, pier_name, data)
+        if block is not None:
+            blocks.append(block)
+    return assemble_stress_history(load_store.stages, blocks, modulus_elastisitas)
+
+def build_theoretical_strain_table(load_store, sections_data, modulus_elastisitas):
+    """
+    Regangan teoritis seluruh stage × sensor: dict nama sensor -> array (jumlah stage,) dalam με.
+    """
+    table = {}
+    for pier_name, data in sections_data.items():
+        block = compute_stress_history_block(load_store, pier_name, data)
+        if block is None:
+            continue
+        strain = block["stress"] / modulus_elastisitas * 1e6
+        table.update(zip(block["sgs"], strain.T))
+    return table
@@ -0,0 +1,104 @@
+"""
+Data gaya dalam (data_gaya.csv) per stage dan part.
+"""
+import numpy as np
+import pandas as pd
+
+from .config import LOAD_CASE_COLUMNS
+from .storage import get_columnar_cache_path, get_file_signature, read_columnar_cache_metadata, write_columnar_cache
+
+class LoadCaseStore:
+    """
+    Indeks data gaya per (stage, part) dalam bentuk array NumPy padat.
+
+    values[i_stage, i_part, i_kolom] berisi gaya sesuai LOAD_CASE_COLUMNS
+    (NaN jika kombinasi tidak ada). Urutan stage mengikuti urutan kemunculan di CSV.
+    """
+
+    def __init__(self, stages, parts, columns, values):
+        self.stages = list(stages)
+        self.parts = list(parts)
+        self.columns = list(columns)
+        self.values = values
+        self.stage_index = {s: i for i, s in enumerate(self.stages)}
+        self.part_index = {p: i for i, p in enumerate(self.parts)}
+        self.column_index = {c: i for i, c in enumerate(self.columns)}
+
+    @classmethod
+    def from_dataframe(cls, df, columns=LOAD_CASE_COLUMNS):
+        """
+        Pivot DataFrame gaya menjadi array (stage, part, kolom) memakai kode kategori.
+        Jika ada duplikat (stage, part), baris pertama yang dipakai.
+        """
+        df = df.drop_duplicates(subset=['Stage', 'Part'])
+        # Kategori mengikuti urutan kemunculan (bukan urutan alfabet dari dtype kategori)
+        stage_cat = pd.Categorical(df['Stage'], categories=df['Stage'].drop_duplicates().tolist())
+        part_cat = pd.Categorical(df['Part'], categories=df['Part'].drop_duplicates().tolist())
+
+        values = np.full((len(stage_cat.categories), len(part_cat.categories), len(columns)), np.nan)
+        values[stage_cat.codes, part_cat.codes] = df[columns].to_numpy(dtype=float)
+        return cls(stage_cat.categories, part_cat.categories, columns, values)
+
+    def get(self, stage, part):
+        """
+        Lookup O(1) gaya untuk satu (stage, part). Mengembalikan dict atau None.
+        """
+        i_stage = self.stage_index.get(stage)
+        i_part = self.part_index.get(part)
+        if i_stage is None or i_part is None:
+            return None
+
+        row = self.values[i_stage, i_part]
+        if np.isnan(row).all():
+            return None
+        return {"Stage": stage, "Part": part, **dict(zip(self.columns, row))}
+
+    def column(self, part, column):
+        """
+        Irisan satu kolom gaya untuk seluruh stage (array sepanjang jumlah stage).
+        """
+        return self.values[:, self.part_index[part], self.column_index[column]]
+
+    def load_matrix(self, part):
+        """
+        Matriks beban (stage, [n, mxx, myy]) dalam satuan N dan Nmm untuk satu part.
+        """
+        return build_load_matrix(
+            self.column(part, "Axial (kN)"),
+            self.column(part, "Moment-y (kN·m)"),
+            self.column(part, "Moment-z (kN·m)")
+        )
+
+def build_load_matrix(N, My, Mz):
+    """
+    Mengubah gaya (kN, kN·m) menjadi matriks beban (N, Nmm) dengan kolom [n, mxx, myy].
+    """
+    # Konversi satuan ke N dan Nmm (Mz -> mxx, My -> myy)
+    return np.column_stack([
+        np.asarray(N, dtype=float) * 1000,
+        np.asarray(Mz, dtype=float) * 1e6,
+        np.asarray(My, dtype=float) * 1e6
+    ])
+
+def read_load_case_csv(csv_path):
+    """
+    Mem-parsing data_gaya.csv dengan skema eksplisit (kolom teks sebagai kategori).
+    """
+    dtype = {c: 'category' for c in ["Load", "Stage", "Step", "Part"]}
+    dtype.update({c: 'float64' for c in LOAD_CASE_COLUMNS})
+    return pd.read_csv(csv_path, dtype=dtype, encoding='utf-8-sig')
+
+def load_load_case_frame(csv_path):
+    """
+    Memuat data gaya dari cache Parquet; dibangun ulang otomatis jika CSV berubah.
+    """
+    cache_path = get_columnar_cache_path(csv_path)
+    signature = list(get_file_signature(csv_path))
+
+    meta = read_columnar_cache_metadata(cache_path)
+    if meta is not None and meta.get("source_signature") == signature:
+        return pd.read_parquet(cache_path)
+
+    df = read_load_case_csv(csv_path)
+    write_columnar_cache(df, cache_path, {"source_signature": signature})
+    return df
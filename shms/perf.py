@@ -0,0 +1,200 @@
+"""
+Instrumentasi ringan hot path: waktu, jumlah panggilan, cache hit/miss, dan log JSON-lines per rerun.
+Tidak bergantung pada Streamlit; statistik kumulatif dibagi antar thread dalam satu proses.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from .config import PERF_HISTORY_SIZE, PERF_LOG_ENV, PERF_LOG_MAX_BYTES, PERF_LOG_PATH
+
+class PerfRecorder:
+    """
+    Statistik kumulatif per nama operasi (dibagi antar sesi dan thread).
+    Menyimpan durasi terakhir (terbatas) untuk perhitungan persentil.
+    """
+
+    def __init__(self, history_size=PERF_HISTORY_SIZE):
+        self.history_size = history_size
+        self.stats = {}
+        # State per thread: stack penanda cache miss dan daftar event rerun yang sedang aktif
+        self.local = threading.local()
+        self._lock = threading.Lock()
+
+    def record(self, name, elapsed, cache_hit=None, payload_bytes=None):
+        with self._lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = {
+                    "calls": 0, "hits": 0, "misses": 0, "total": 0.0, "max": 0.0,
+                    "payload_bytes": 0, "recent": deque(maxlen=self.history_size)
+                }
+            stat["calls"] += 1
+            stat["total"] += elapsed
+            stat["max"] = max(stat["max"], elapsed)
+            stat["recent"].append(elapsed)
+            if cache_hit is True:
+                stat["hits"] += 1
+            elif cache_hit is False:
+                stat["misses"] += 1
+            if payload_bytes is not None:
+                stat["payload_bytes"] = payload_bytes
+
+    def summary(self):
+        """
+        DataFrame ringkasan kumulatif: panggilan, hit rate cache, rata-rata, p95, maks (ms).
+        """
+        with self._lock:
+            rows = []
+            for name, stat in self.stats.items():
+                cache_calls = stat["hits"] + stat["misses"]
+                rows.append({
+                    "Operasi": name,
+                    "Panggilan": stat["calls"],
+                    "Hit Rate Cache": stat["hits"] / cache_calls if cache_calls else None,
+                    "Rata-rata (ms)": stat["total"] / stat["calls"] * 1e3,
+                    "p95 (ms)": float(np.percentile(stat["recent"], 95)) * 1e3,
+                    "Maks (ms)": stat["max"] * 1e3,
+                    "Payload (KB)": stat["payload_bytes"] / 1024 if stat["payload_bytes"] else None
+                })
+        return pd.DataFrame(rows)
+
+_recorder = PerfRecorder()
+
+def get_perf_recorder():
+    """
+    Satu perekam statistik per proses (server Streamlit, skrip batch, atau worker).
+    """
+    return _recorder
+
+def _perf_cache_stack():
+    local = get_perf_recorder().local
+    stack = getattr(local, "cache_stack", None)
+    if stack is None:
+        stack = local.cache_stack = []
+    return stack
+
+def record_perf_event(name, elapsed, cache_hit=None, payload_bytes=None):
+    """
+    Mencatat satu event ke statistik kumulatif dan ke daftar event rerun yang sedang berjalan (jika ada).
+    """
+    recorder = get_perf_recorder()
+    recorder.record(name, elapsed, cache_hit, payload_bytes)
+    events = getattr(recorder.local, "run_events", None)
+    if events is not None:
+        events.append((name, elapsed, cache_hit, payload_bytes))
+
+def perf_timer(name, cached=False):
+    """
+    Decorator pencatat waktu. Untuk fungsi st.cache_*, pasang di luar decorator cache dengan
+    cached=True dan pasang perf_cache_miss di dalamnya agar hit/miss tercatat.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = _perf_cache_stack()
+            stack.append(False)
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - t0
+                missed = stack.pop()
+                record_perf_event(name, elapsed, cache_hit=(not missed) if cached else None)
+        if hasattr(func, "clear"):
+            # Pertahankan API st.cache_* (mis. .clear()) pada fungsi yang dibungkus
+            wrapper.clear = func.clear
+        return wrapper
+    return decorator
+
+def perf_cache_miss(func):
+    """
+    Penanda cache miss: hanya dieksekusi saat fungsi di-cache benar-benar dihitung ulang.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stack = _perf_cache_stack()
+        if stack:
+            stack[-1] = True
+        return func(*args, **kwargs)
+    return wrapper
+
+@contextmanager
+def perf_span(name):
+    """
+    Context manager pencatat waktu untuk blok kode di luar fungsi.
+    """
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_perf_event(name, time.perf_counter() - t0)
+
+def perf_log_enabled():
+    """
+    True jika log JSON-lines diaktifkan untuk semua rerun lewat environment (SHMS_PERF_LOG=1).
+    """
+    return os.environ.get(PERF_LOG_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+@contextmanager
+def perf_run(page, log=False):
+    """
+    Mengumpulkan event selama satu rerun halaman. Ringkasannya ditulis ke log JSON-lines hanya jika
+    log=True (mis. panel debug aktif) atau perf_log_enabled(); tanpa itu tidak ada I/O di produksi.
+    Menghasilkan dict run berisi 'events' dan 'total' (detik) untuk panel debug.
+    """
+    run = {"page": page, "events": [], "total": None}
+    local = get_perf_recorder().local
+    local.run_events = run["events"]
+    t0 = time.perf_counter()
+    try:
+        yield run
+    finally:
+        run["total"] = time.perf_counter() - t0
+        local.run_events = None
+        if log or perf_log_enabled():
+            write_perf_log(run)
+
+def summarize_perf_events(events):
+    """
+    Mengelompokkan event satu rerun per nama: jumlah, total waktu, hit/miss, payload.
+    """
+    summary = {}
+    for name, elapsed, cache_hit, payload_bytes in events:
+        item = summary.setdefault(name, {"name": name, "calls": 0, "ms": 0.0, "hits": 0, "misses": 0, "bytes": 0})
+        item["calls"] += 1
+        item["ms"] += elapsed * 1e3
+        if cache_hit is True:
+            item["hits"] += 1
+        elif cache_hit is False:
+            item["misses"] += 1
+        if payload_bytes:
+            item["bytes"] += payload_bytes
+    return list(summary.values())
+
+def write_perf_log(run):
+    """
+    Menambahkan satu baris JSON per rerun ke PERF_LOG_PATH. Saat melebihi batas ukuran file dirotasi
+    ke PERF_LOG_PATH.1 (cadangan lama ditimpa), sehingga total log dibatasi ±2 × PERF_LOG_MAX_BYTES.
+    """
+    record = {
+        "time": pd.Timestamp.now().isoformat(timespec="milliseconds"),
+        "page": run["page"],
+        "total_ms": round(run["total"] * 1e3, 3),
+        "events": [{**e, "ms": round(e["ms"], 3)} for e in summarize_perf_events(run["events"])]
+    }
+    try:
+        os.makedirs(os.path.dirname(PERF_LOG_PATH), exist_ok=True)
+        if os.path.exists(PERF_LOG_PATH) and os.path.getsize(PERF_LOG_PATH) > PERF_LOG_MAX_BYTES:
+            os.replace(PERF_LOG_PATH, f"{PERF_LOG_PATH}.1")
+        with open(PERF_LOG_PATH, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
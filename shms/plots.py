@@ -0,0 +1,168 @@
+"""
+Figure Plotly yang dipakai bersama halaman pier dan box girder (tanpa Streamlit).
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+def create_mesh_plot(mesh_interp, grid_z, symbol, unit, title, strain_gauges=None, strain_gauge_values=None):
+    """
+    Membuat plot interaktif Kontur (Isolines) menggunakan Plotly.
+    grid_z adalah hasil MeshGridInterpolator.interpolate.
+    """
+    fig = go.Figure()
+    
+    # Plot Kontur
+    fig.add_trace(go.Contour(
+        x=mesh_interp.grid_x,
+        y=mesh_interp.grid_y,
+        z=grid_z,
+        colorscale='RdYlBu_r',
+        colorbar=dict(title=dict(text=f"{symbol} ({unit})", side="right"), tickformat=".2f"),
+        contours=dict(
+            coloring='heatmap', # Warna fill + garis
+            showlabels=True,    # Tampilkan label nilai pada garis
+            labelfont=dict(size=10, color='black')
+        ),
+        ncontours=15, # Jumlah garis kontur
+        line=dict(smoothing=0), # Smoothing 0 agar akurat secara linear
+        hovertemplate=f"x: %{{x:.1f}}<br>y: %{{y:.1f}}<br>{symbol}: %{{z:.2f}} {unit}<extra></extra>",
+        name="Kontur"
+    ))
+    
+    # Anotasi Sensor
+    if strain_gauges:
+        for name, (sg_x, sg_y) in strain_gauges.items():
+            text_content = name
+            if strain_gauge_values and name in strain_gauge_values:
+                val = strain_gauge_values[name]
+                text_content += f"<br>{val:.2f} {unit}"
+                
+            fig.add_annotation(
+                x=sg_x, y=sg_y, text=text_content,
+                font=dict(color="black", size=10),
+                showarrow=True, arrowhead=2, arrowsize=1, arrowwidth=2, arrowcolor="yellow",
+                ax=0, ay=-30, bgcolor="yellow", bordercolor="black", borderwidth=1, opacity=0.8
+            )
+            # Marker Posisi Sensor
+            fig.add_trace(go.Scatter(
+                x=[sg_x], y=[sg_y], mode='markers',
+                marker=dict(symbol='circle', size=6, color='black'),
+                name=name, hoverinfo='name+x+y'
+            ))
+
+    # Garis Mesh (Wireframe) - Opsional, bisa di-comment jika mengganggu visual kontur
+    fig.add_trace(go.Scatter(
+        x=mesh_interp.wire_x, y=mesh_interp.wire_y, mode='lines',
+        line=dict(color='rgba(100,100,100,0.1)', width=0.5), # Opacity dikurangi agar kontur jelas
+        hoverinfo='skip', showlegend=False
+    ))
+
+    fig.update_layout(
+        xaxis_title="x (mm)", yaxis_title="y (mm)",
+        xaxis=dict(scaleanchor="y", scaleratio=1),
+        height=600, hovermode='closest', showlegend=False
+    )
+    return fig
+
+def quantize_stage_grids(grids, levels):
+    """
+    Kuantisasi grid (stage, ny, nx) ke kode uint8 0..levels-1 dengan satu rentang untuk semua stage,
+    sehingga skala warna konsisten selama animasi. NaN (di luar penampang) menjadi kode levels.
+    Hasil: (kode, nilai minimum, nilai maksimum).
+    """
+    finite = np.isfinite(grids)
+    lo = float(grids[finite].min()) if finite.any() else 0.0
+    hi = float(grids[finite].max()) if finite.any() else 0.0
+    step = (hi - lo) / (levels - 1) if hi > lo else 1.0
+    codes = np.full(grids.shape, levels, dtype=np.uint8)
+    codes[finite] = np.rint((grids[finite] - lo) / step).astype(np.uint8)
+    return codes, lo, hi
+
+def create_stage_playback_plot(mesh_interp, stages, grids, strain_gauges, sg_values, symbol, unit, title,
+                               active=0, stride=1, levels=255, frame_ms=150):
+    """
+    Animasi kontur seluruh stage (Plotly frames + slider) yang diputar sepenuhnya di klien.
+
+    grids (stage, ny, nx) hasil UnitLoadStressField.grid_stress_stages (sudah dalam satuan tampilan);
+    sg_values (stage, jumlah sensor) nilai teoritis di titik sensor. Grid dikuantisasi ke uint8
+    (Plotly mengirim array NumPy sebagai biner base64), sedangkan nilai sensor tetap presisi penuh.
+    Stage tanpa beban untuk part ini (nilai sensor NaN) dilewati; jika stage aktif termasuk di
+    dalamnya, animasi dimulai dari stage ber-beban berikutnya. Mengembalikan None jika tidak ada frame.
+    """
+    sg_values = np.asarray(sg_values, dtype=float)
+    loaded = np.flatnonzero(np.isfinite(sg_values).all(axis=1))
+    if not loaded.size:
+        return None
+    stages = [stages[i] for i in loaded]
+    grids = np.asarray(grids)[loaded]
+    sg_values = sg_values[loaded]
+    active = min(int(np.searchsorted(loaded, active)), len(loaded) - 1)
+
+    codes, lo, hi = quantize_stage_grids(grids, levels)
+    names = list(strain_gauges.keys())
+    sg_x = [x for x, _ in strain_gauges.values()]
+    sg_y = [y for _, y in strain_gauges.values()]
+    sg_text = [[f"{name}<br>{val:.2f}" for name, val in zip(names, row)] for row in sg_values.tolist()]
+
+    # Kode terakhir (di luar penampang) transparan; tick colorbar dalam satuan asli
+    colors = ["#313695", "#4575b4", "#74add1", "#abd9e9", "#e0f3f8", "#ffffbf",
+              "#fee090", "#fdae61", "#f46d43", "#d73027", "#a50026"]
+    top = (levels - 1) / levels
+    colorscale = [[top * i / (len(colors) - 1), c] for i, c in enumerate(colors)]
+    colorscale.append([1.0, "rgba(0,0,0,0)"])
+    tick_values = np.linspace(lo, hi, 6)
+    step = (hi - lo) / (levels - 1) if hi > lo else 1.0
+    colorbar = dict(
+        title=dict(text=f"{symbol} ({unit})", side="right"),
+        tickvals=((tick_values - lo) / step).tolist(), ticktext=[f"{v:.2f}" for v in tick_values]
+    )
+
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        x=mesh_interp.grid_x[::stride], y=mesh_interp.grid_y[::stride], z=codes[active],
+        zmin=0, zmax=levels, colorscale=colorscale, colorbar=colorbar, hoverinfo='skip', name="Kontur"
+    ))
+    fig.add_trace(go.Scatter(
+        x=sg_x, y=sg_y, mode='markers+text', text=sg_text[active], textposition='top center',
+        marker=dict(symbol='circle', size=7, color='black'),
+        textfont=dict(size=10, color='black'), hoverinfo='text', name="Sensor"
+    ))
+    fig.add_trace(go.Scatter(
+        x=mesh_interp.wire_x, y=mesh_interp.wire_y, mode='lines',
+        line=dict(color='rgba(100,100,100,0.1)', width=0.5),
+        hoverinfo='skip', showlegend=False
+    ))
+    # Frame sebagai dict biasa: divalidasi sekali oleh Figure, bukan dua kali per trace
+    fig.frames = [
+        dict(name=str(i), traces=[0, 1],
+             data=[dict(type="heatmap", z=codes[i]), dict(type="scatter", text=sg_text[i])])
+        for i in range(len(stages))
+    ]
+
+    play_args = dict(frame=dict(duration=frame_ms, redraw=True), transition=dict(duration=0), fromcurrent=True)
+    fig.update_layout(
+        title=title,
+        xaxis_title="x (mm)", yaxis_title="y (mm)",
+        xaxis=dict(scaleanchor="y", scaleratio=1),
+        height=600, hovermode='closest', showlegend=False,
+        updatemenus=[dict(
+            type="buttons", direction="left", x=0.0, y=-0.12, xanchor="left", yanchor="top",
+            buttons=[
+                dict(label="▶ Play", method="animate", args=[None, play_args]),
+                dict(label="⏸ Pause", method="animate",
+                     args=[[None], dict(frame=dict(duration=0, redraw=False), mode="immediate")])
+            ]
+        )],
+        sliders=[dict(
+            active=active, x=0.15, len=0.85, y=-0.12, yanchor="top",
+            currentvalue=dict(prefix="Stage: ", font=dict(size=12)),
+            font=dict(color="rgba(0,0,0,0)"), ticklen=0,
+            steps=[
+                dict(label=str(stage), method="animate",
+                     args=[[str(i)], dict(frame=dict(duration=0, redraw=True), mode="immediate",
+                                          transition=dict(duration=0))])
+                for i, stage in enumerate(stages)
+            ]
+        )]
+    )
+    return fig
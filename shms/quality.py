@@ -0,0 +1,546 @@
+"""
+Pipeline kualitas data aktual: deduplikasi, deteksi lonjakan dan kanal macet, regularisasi ke grid
+interval normal tiap pier, serta ringkasan gap/cakupan per sensor.
+
+Seluruh langkah tervektorisasi per pier atas matriks (baris × kanal) ActualStrainIndex. Hasilnya
+ActualStrainIndex baru di grid interval pier (median selisih pembacaan) dengan tambahan 'flags'
+(bitmask per slot dan sensor) dan flag per pembacaan asli. Residual dan ekspor memakai slot terukur
+grid ini (slot interpolasi hanya bila diminta); kolom aktual memakai nilai & flag slot tempat pembacaan
+terpilih di-snap. IncrementalCleanIndex memperbarui indeks bersih untuk baris baru saja: ekor tiap pier
+beserta jendela lookback lonjakan/kanal macet dibersihkan ulang, riwayat sebelumnya dipakai apa adanya.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .actual import ActualStrainIndex
+from .config import (
+    ACTUAL_ASOF_TOLERANCE, QUALITY_GRID_UNIT, QUALITY_MAX_INTERP_GAP, QUALITY_SPIKE_MIN_DEV,
+    QUALITY_SPIKE_SIGMA, QUALITY_SPIKE_WINDOW, QUALITY_STUCK_DURATION
+)
+from .perf import perf_timer
+
+FLAG_INTERPOLATED = 1   # Nilai hasil interpolasi linier (tidak ada pembacaan valid di slot ini)
+FLAG_SPIKE = 2          # Pembacaan lonjakan (Hampel): dibuang, diinterpolasi bila celahnya pendek
+FLAG_STUCK = 4          # Kanal macet (nilai identik >= QUALITY_STUCK_DURATION): dibuang
+FLAG_GAP = 8            # Tidak ada nilai setelah pembersihan (NaN)
+FLAG_DUPLICATE = 16     # Timestamp tercatat lebih dari sekali; dipakai pembacaan terakhir di file
+
+QUALITY_FLAG_LABELS = {
+    FLAG_DUPLICATE: "duplikat",
+    FLAG_SPIKE: "lonjakan",
+    FLAG_STUCK: "macet",
+    FLAG_INTERPOLATED: "interpolasi",
+    FLAG_GAP: "gap"
+}
+
+# Label untuk setiap kombinasi bitmask (lookup tervektorisasi)
+_FLAG_LABEL_TABLE = np.array([
+    ", ".join(label for bit, label in QUALITY_FLAG_LABELS.items() if code & bit)
+    for code in range(2 * max(QUALITY_FLAG_LABELS))
+], dtype=object)
+
+QUALITY_SUMMARY_COLUMNS = [
+    "Pier", "SG", "Interval (menit)", "Pembacaan", "Duplikat", "Lonjakan", "Macet", "Slot Grid", "Terukur",
+    "Interpolasi", "Gap (slot)", "Cakupan (%)", "Gap Terpanjang (jam)"
+]
+QUALITY_GAP_COLUMNS = ["Pier", "SG", "Mulai", "Selesai", "Durasi (jam)", "Penyebab"]
+
+def flag_labels(flags):
+    """
+    Label flag kualitas (dipisah koma, '' jika bersih) untuk array bitmask.
+    """
+    return _FLAG_LABEL_TABLE[np.asarray(flags)]
+
+def window_median(windows):
+    """
+    Median setiap jendela (baris × lebar jendela) yang mengabaikan NaN; NaN jika jendela kosong.
+    """
+    windows = np.sort(windows, axis=-1)
+    count = windows.shape[-1] - np.isnan(windows).sum(axis=-1)
+    lo = np.take_along_axis(windows, np.maximum((count - 1) // 2, 0)[:, None], axis=-1)[:, 0]
+    hi = np.take_along_axis(windows, (count // 2)[:, None], axis=-1)[:, 0]
+    return (lo + hi) / 2
+
+def shifted_reduce(ufunc, padded, window):
+    """
+    Reduksi ufunc (mis. fmax) atas jendela bergulir sepanjang sumbu 0 dari array yang sudah di-pad
+    window - 1 baris; window - 1 operasi elemen-per-elemen, jauh lebih cepat dari reduksi sliding view.
+    """
+    n = len(padded) - window + 1
+    out = padded[:n].copy()
+    for shift in range(1, window):
+        ufunc(out, padded[shift:shift + n], out=out)
+    return out
+
+def detect_spikes(values, window=QUALITY_SPIKE_WINDOW, sigma=QUALITY_SPIKE_SIGMA, min_dev=QUALITY_SPIKE_MIN_DEV):
+    """
+    Mask lonjakan (filter Hampel) untuk matriks pembacaan terurut waktu (baris × kanal):
+    |x - median bergulir| > max(sigma × 1.4826 × MAD bergulir, min_dev), dengan jendela terpusat
+    (setara rolling(window, center=True, min_periods=1), NaN diabaikan). Lonjakan sampai window // 2
+    pembacaan berturut-turut tetap terdeteksi, perubahan bertahap (step) tidak.
+
+    Median selalu berada di antara min & max jendela, sehingga hanya baris dengan rentang jendela > min_dev
+    yang bisa menjadi lonjakan; median/MAD hanya dihitung untuk baris tersebut dan tetangganya.
+    """
+    half = window // 2
+    pad = ((half, window - 1 - half), (0, 0))
+    padded = np.pad(values, pad, constant_values=np.nan)
+    windows = sliding_window_view(padded, window, axis=0)
+    with np.errstate(invalid='ignore'):
+        candidate = shifted_reduce(np.fmax, padded, window) - shifted_reduce(np.fmin, padded, window) > min_dev
+    spike = np.zeros(values.shape, dtype=bool)
+    if not candidate.any():
+        return spike
+
+    # MAD baris kandidat memakai deviasi seluruh tetangganya dalam jendela
+    needed = shifted_reduce(np.logical_or, np.pad(candidate, pad), window)
+    deviation = np.full(values.shape, np.nan)
+    row, col = np.nonzero(needed)
+    deviation[row, col] = np.abs(values[row, col] - window_median(windows[row, col]))
+
+    row, col = np.nonzero(candidate)
+    dev_windows = sliding_window_view(np.pad(deviation, pad, constant_values=np.nan), window, axis=0)
+    mad = window_median(dev_windows[row, col])
+    with np.errstate(invalid='ignore'):
+        spike[row, col] = deviation[row, col] > np.maximum(sigma * 1.4826 * mad, min_dev)
+    return spike
+
+def detect_stuck(ts, values, segment_start, min_duration=QUALITY_STUCK_DURATION):
+    """
+    Mask kanal macet: run nilai identik per kanal yang tidak terputus gap (segment_start menandai
+    baris pertama setiap segmen kontinu) dan berdurasi >= min_duration.
+    """
+    n = len(ts)
+    starts = np.ones(values.shape, dtype=bool)
+    starts[1:] = (values[1:] != values[:-1]) | segment_start[1:, None]
+    ends = np.ones(values.shape, dtype=bool)
+    ends[:-1] = starts[1:]
+
+    # Baris awal & akhir run untuk setiap baris (akumulasi maks/min sepanjang waktu, per kanal)
+    rows = np.arange(n)[:, None]
+    first = np.maximum.accumulate(np.where(starts, rows, 0), axis=0)
+    last = np.minimum.accumulate(np.where(ends, rows, n - 1)[::-1], axis=0)[::-1]
+    return ts[last] - ts[first] >= pd.Timedelta(min_duration).value
+
+def estimate_interval(ts, unit=QUALITY_GRID_UNIT):
+    """
+    Interval pembacaan normal satu pier (ns): median selisih timestamp berurutan, dibulatkan ke kelipatan
+    unit (minimal satu unit). Selisih nol (timestamp ganda) diabaikan.
+    """
+    step = pd.Timedelta(unit).value
+    spacing = np.diff(ts)
+    spacing = spacing[spacing > 0]
+    if len(spacing) == 0:
+        return step
+    return max(int(np.rint(np.median(spacing) / step)), 1) * step
+
+def clean_pier_readings(ts, raw, interval=None, max_gap=QUALITY_MAX_INTERP_GAP,
+                        stuck_duration=QUALITY_STUCK_DURATION):
+    """
+    Membersihkan pembacaan satu pier (timestamp ns terurut, matriks raw baris × kanal).
+
+    Pembacaan dengan timestamp sama dideduplikasi (dipakai yang terakhir di file), lalu lonjakan dan kanal
+    macet dideteksi pada pembacaan asli. Pembacaan valid di-snap ke slot terdekat grid interval pier
+    (default estimate_interval; slot yang menerima beberapa pembacaan memakai yang terakhir). Slot tanpa
+    pembacaan valid diinterpolasi linier bila kedua tetangga validnya berjarak <= max_gap; sisanya NaN
+    (FLAG_GAP). Flag slot juga memuat bit lonjakan/macet/duplikat pembacaan yang masuk ke slot tersebut.
+
+    Mengembalikan dict: timestamps, raw, flags (per slot grid, dari pembacaan pertama sampai terakhir),
+    interval (ns), reading_timestamps & reading_flags (per pembacaan setelah deduplikasi), dan
+    reading_counts (jumlah pembacaan bernilai per kanal).
+    """
+    max_gap_ns = pd.Timedelta(max_gap).value
+    k = raw.shape[1]
+    if len(ts) == 0:
+        return {
+            "timestamps": np.array([], dtype=np.int64), "raw": np.empty((0, k)),
+            "flags": np.empty((0, k), dtype=np.uint8), "interval": pd.Timedelta(QUALITY_GRID_UNIT).value,
+            "reading_timestamps": np.array([], dtype=np.int64), "reading_flags": np.empty((0, k), dtype=np.uint8),
+            "reading_counts": np.zeros(k, dtype=np.int64)
+        }
+
+    last = np.r_[ts[1:] != ts[:-1], True]
+    duplicated = np.r_[False, ts[1:] == ts[:-1]][last]
+    ts, values = ts[last], raw[last]
+
+    segment_start = np.r_[True, np.diff(ts) > max_gap_ns]
+    spike = detect_spikes(values)
+    stuck = detect_stuck(ts, values, segment_start, stuck_duration)
+    valid = ~np.isnan(values) & ~spike & ~stuck
+    reading_flags = (np.where(spike, FLAG_SPIKE, 0) | np.where(stuck, FLAG_STUCK, 0)).astype(np.uint8)
+    reading_flags[duplicated] |= FLAG_DUPLICATE
+
+    step = estimate_interval(ts) if interval is None else int(interval)
+    origin = ts[0] // step * step
+    slot = (ts - origin + step // 2) // step
+    n_grid = int(slot[-1]) + 1
+
+    # Array kanal × slot (akses per kanal kontigu); dikembalikan sebagai view slot × kanal
+    grid_values = np.full((k, n_grid), np.nan)
+    flags = np.zeros((k, n_grid), dtype=np.uint8)
+    slot_start = np.flatnonzero(np.r_[True, slot[1:] != slot[:-1]])
+    flags[:, slot[slot_start]] = np.bitwise_or.reduceat(reading_flags, slot_start, axis=0).T
+
+    # Per kanal: pembacaan valid terakhir per slot, interpolasi linier antar slot valid pada celah <= max_gap
+    grid_slots = np.arange(n_grid, dtype=float)
+    for j in range(k):
+        valid_slots, valid_values = slot[valid[:, j]], values[valid[:, j], j]
+        if len(valid_slots) == 0:
+            continue
+        keep = np.r_[valid_slots[1:] != valid_slots[:-1], True]
+        valid_slots, valid_values = valid_slots[keep], valid_values[keep]
+        gaps = np.diff(valid_slots)
+        span = grid_values[j, valid_slots[0]:valid_slots[-1] + 1]
+        span[:] = np.interp(grid_slots[valid_slots[0]:valid_slots[-1] + 1], valid_slots, valid_values)
+        span[:-1][np.repeat(gaps * step > max_gap_ns, gaps)] = np.nan
+        grid_values[j, valid_slots] = valid_values
+
+        interpolated = ~np.isnan(grid_values[j])
+        interpolated[valid_slots] = False
+        flags[j, interpolated] |= FLAG_INTERPOLATED
+    flags[np.isnan(grid_values)] |= FLAG_GAP
+
+    return {
+        "timestamps": origin + np.arange(n_grid, dtype=np.int64) * step,
+        "raw": grid_values.T,
+        "flags": flags.T,
+        "interval": step,
+        "reading_timestamps": ts,
+        "reading_flags": reading_flags,
+        "reading_counts": (~np.isnan(values)).sum(axis=0)
+    }
+
+def _lookback_bounds(reading_ts, step, max_gap_ns, stuck_ns):
+    """
+    (t_split, t_window) pembaruan inkremental satu pier dengan pembacaan (terdeduplikasi) reading_ts.
+
+    Pembacaan baru hanya dapat mengubah flag 2 × (QUALITY_SPIKE_WINDOW // 2) pembacaan terakhir (jendela
+    Hampel) dan run nilai identik yang belum mencapai durasi macet; perubahan itu merambat paling jauh
+    max_gap (interpolasi) + satu slot (snap) ke belakang. Slot & pembacaan sejak t_split dihitung ulang.
+    Agar hasilnya sama dengan pembersihan penuh, jendela dimulai dari pembacaan t_window: cukup jauh untuk
+    jendela Hampel dan run macet pembacaan yang memengaruhi slot sejak t_split.
+    """
+    half = QUALITY_SPIKE_WINDOW // 2
+    n = len(reading_ts)
+    t_change = min(reading_ts[max(n - 2 * half, 0)], reading_ts[-1] - stuck_ns)
+    t_split = t_change - max_gap_ns - step
+    t_exact = t_split - max_gap_ns - step
+    i_exact = np.searchsorted(reading_ts, t_exact)
+    i_window = min(np.searchsorted(reading_ts, t_exact - max_gap_ns - stuck_ns), max(i_exact - 2 * half, 0))
+    return t_split, reading_ts[i_window]
+
+def append_pier_readings(previous, ts, raw, max_gap=QUALITY_MAX_INTERP_GAP, stuck_duration=QUALITY_STUCK_DURATION):
+    """
+    Memperbarui hasil clean_pier_readings satu pier (previous) setelah pembacaan baru ditambahkan; semua
+    pembacaan baru harus setelah pembacaan terakhir previous. ts/raw berisi pembacaan mentah terurut sejak
+    awal jendela lookback (_lookback_bounds, boleh lebih awal) sampai yang terbaru. Hanya jendela tersebut
+    yang dibersihkan ulang dengan interval grid previous; slot dan pembacaan sebelum t_split diambil dari
+    previous. Hasilnya sama dengan clean_pier_readings atas seluruh pembacaan dengan interval yang sama.
+    """
+    step = previous["interval"]
+    old_ts = previous["reading_timestamps"]
+    t_split, t_window = _lookback_bounds(old_ts, step, pd.Timedelta(max_gap).value,
+                                         pd.Timedelta(stuck_duration).value)
+    start = np.searchsorted(ts, t_window)
+    cleaned = clean_pier_readings(ts[start:], raw[start:], step, max_gap, stuck_duration)
+    if t_window <= old_ts[0]:
+        # Jendela mencakup seluruh riwayat pier
+        return cleaned
+
+    # Grid jendela sejajar grid lama (origin kelipatan step): slot 0 jendela = slot offset grid lama
+    origin = previous["timestamps"][0]
+    offset = (cleaned["timestamps"][0] - origin) // step
+    split = min(max(-((origin - t_split) // step), offset), len(previous["timestamps"]))
+    cut = split - offset
+    old_readings = np.searchsorted(old_ts, t_split)
+    new_readings = np.searchsorted(cleaned["reading_timestamps"], t_split)
+
+    # Jumlah pembacaan bernilai: hanya pembacaan baru (setelah pembacaan terakhir lama) yang ditambahkan
+    tail = np.searchsorted(ts, old_ts[-1], side='right')
+    tail_ts, tail_raw = ts[tail:], raw[tail:]
+    last = np.r_[tail_ts[1:] != tail_ts[:-1], True] if len(tail_ts) else np.zeros(0, dtype=bool)
+
+    return {
+        "timestamps": origin + np.arange(offset + len(cleaned["timestamps"]), dtype=np.int64) * step,
+        "raw": np.concatenate([previous["raw"][:split], cleaned["raw"][cut:]]),
+        "flags": np.concatenate([previous["flags"][:split], cleaned["flags"][cut:]]),
+        "interval": step,
+        "reading_timestamps": np.concatenate([old_ts[:old_readings], cleaned["reading_timestamps"][new_readings:]]),
+        "reading_flags": np.concatenate([previous["reading_flags"][:old_readings],
+                                         cleaned["reading_flags"][new_readings:]]),
+        "reading_counts": previous["reading_counts"] + (~np.isnan(tail_raw[last])).sum(axis=0)
+    }
+
+def _pier_entry(data, cleaned):
+    """
+    Entri pier indeks bersih: sensor & baseline indeks mentah, hasil pembersihan, dan strain grid.
+    """
+    return {
+        "sensors": data["sensors"],
+        "baseline": data["baseline"],
+        **cleaned,
+        "strain": cleaned["raw"] - data["baseline"]
+    }
+
+def _present_timestamps(piers):
+    """
+    Daftar waktu (terbaru lebih dulu): slot yang memiliki nilai di minimal satu sensor. Semua interval
+    kelipatan QUALITY_GRID_UNIT dan origin grid sejajar interval, sehingga slot ditandai pada resolusi unit.
+    """
+    unit = pd.Timedelta(QUALITY_GRID_UNIT).value
+    present = [d["timestamps"][~np.isnan(d["raw"]).all(axis=1)] // unit for d in piers.values()]
+    present = [p for p in present if len(p)]
+    if not present:
+        return pd.DatetimeIndex([])
+    lo = min(p[0] for p in present)
+    marked = np.zeros(max(p[-1] for p in present) - lo + 1, dtype=bool)
+    for p in present:
+        marked[p - lo] = True
+    timestamps_desc = (lo + np.flatnonzero(marked)[::-1]) * unit
+    return pd.DatetimeIndex(timestamps_desc.view('datetime64[ns]'))
+
+@perf_timer("Pipeline kualitas data aktual")
+def clean_strain_index(actual_index, interval=None, max_gap=QUALITY_MAX_INTERP_GAP,
+                       stuck_duration=QUALITY_STUCK_DURATION):
+    """
+    ActualStrainIndex bersih & teregularisasi dari indeks pembacaan mentah (ActualStrainIndex.from_frame).
+    Setiap pier memakai grid interval normalnya sendiri (estimate_interval, kecuali interval diberikan)
+    dan mendapat 'flags' (bitmask FLAG_* per slot dan sensor), 'interval' (ns), serta 'reading_timestamps'
+    & 'reading_flags' (flag per pembacaan asli, untuk lookup pembacaan terukur).
+    """
+    piers = {
+        short_name: _pier_entry(data, clean_pier_readings(data["timestamps"], data["raw"], interval, max_gap,
+                                                          stuck_duration))
+        for short_name, data in actual_index.piers.items()
+    }
+    return ActualStrainIndex(piers, _present_timestamps(piers))
+
+class IncrementalCleanIndex:
+    """
+    Indeks bersih (clean_strain_index) yang diperbarui dari IncrementalCsvReader, dibagi antar sesi.
+
+    Build pertama membersihkan seluruh riwayat. Setelahnya hanya baris baru yang diproses: per pier,
+    pembacaan mentah sejak jendela lookback (disimpan, ukurannya tetap) digabung dengan ekor baru lalu
+    dibersihkan ulang (append_pier_readings) dengan interval grid yang sama; interval pier diestimasi
+    ulang hanya saat build penuh. Build penuh diulang bila reader diganti, file ditulis ulang, atau ada
+    baris susulan/pengganti (waktu <= pembacaan terakhir pier).
+    """
+
+    def __init__(self, registry=None, max_gap=QUALITY_MAX_INTERP_GAP, stuck_duration=QUALITY_STUCK_DURATION):
+        self.registry = registry
+        self.max_gap = max_gap
+        self.stuck_duration = stuck_duration
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self, source=None):
+        self.index = ActualStrainIndex({}, pd.DatetimeIndex([]))
+        # Pembacaan mentah per pier sejak awal jendela lookback: (timestamps, raw)
+        self.lookback = {}
+        self.processed = 0
+        # Generasi sumber: (reader, jumlah reload penuh); berubah saat reader diganti atau file ditulis ulang
+        self._source = source
+
+    def update(self, reader):
+        """
+        Memperbarui indeks dengan baris baru reader sejak pemanggilan terakhir, lalu mengembalikan indeks.
+        """
+        with self._lock:
+            df = reader.frame()
+            reloaded = self._source is None or self._source[0] is not reader \
+                or self._source[1] != reader.full_reloads
+            if reloaded or len(df) < self.processed:
+                self._reset((reader, reader.full_reloads))
+            if len(df) == self.processed:
+                return self.index
+
+            if self.processed == 0 or not self._append(
+                    ActualStrainIndex.from_frame(df.iloc[self.processed:], self.registry)):
+                self._rebuild(ActualStrainIndex.from_frame(df, self.registry))
+            self.processed = len(df)
+            return self.index
+
+    def _lookback_readings(self, cleaned, ts, raw):
+        _, t_window = _lookback_bounds(cleaned["reading_timestamps"], cleaned["interval"],
+                                       pd.Timedelta(self.max_gap).value, pd.Timedelta(self.stuck_duration).value)
+        start = np.searchsorted(ts, t_window)
+        # Salinan agar array riwayat penuh tidak ikut tertahan
+        return ts[start:].copy(), raw[start:].copy()
+
+    def _rebuild(self, raw_index):
+        self.index = clean_strain_index(raw_index, None, self.max_gap, self.stuck_duration)
+        self.lookback = {
+            short_name: self._lookback_readings(self.index.piers[short_name], data["timestamps"], data["raw"])
+            for short_name, data in raw_index.piers.items()
+        }
+
+    @perf_timer("Pipeline kualitas data aktual (baris baru)")
+    def _append(self, tail_index):
+        """
+        Menggabungkan ekor baru per pier; False bila perlu build penuh (baris susulan atau kanal berubah).
+        """
+        piers = dict(self.index.piers)
+        lookback = dict(self.lookback)
+        for short_name, data in tail_index.piers.items():
+            previous = piers.get(short_name)
+            if previous is None:
+                ts, raw = data["timestamps"], data["raw"]
+                cleaned = clean_pier_readings(ts, raw, None, self.max_gap, self.stuck_duration)
+            else:
+                if data["sensors"] != previous["sensors"] \
+                        or data["timestamps"][0] <= previous["reading_timestamps"][-1]:
+                    return False
+                ts = np.concatenate([lookback[short_name][0], data["timestamps"]])
+                raw = np.concatenate([lookback[short_name][1], data["raw"]])
+                cleaned = append_pier_readings(previous, ts, raw, self.max_gap, self.stuck_duration)
+            piers[short_name] = _pier_entry(data, cleaned)
+            lookback[short_name] = self._lookback_readings(cleaned, ts, raw)
+
+        self.index = ActualStrainIndex(piers, _present_timestamps(piers))
+        self.lookback = lookback
+        return True
+
+def measured_strain_index(index):
+    """
+    Salinan indeks bersih dengan slot interpolasi dikosongkan (NaN), sehingga hanya slot terukur yang
+    dipakai (mis. residual dan ekspor default).
+    """
+    piers = {}
+    for short_name, data in index.piers.items():
+        interpolated = (data["flags"] & FLAG_INTERPOLATED) != 0
+        piers[short_name] = {
+            **data,
+            "raw": np.where(interpolated, np.nan, data["raw"]),
+            "strain": np.where(interpolated, np.nan, data["strain"])
+        }
+    return ActualStrainIndex(piers, index.timestamps_desc)
+
+def get_quality_config_key():
+    """
+    Kunci cache parameter pipeline kualitas (QUALITY_*); hasil pembersihan berubah bila salah satunya diubah.
+    """
+    return (str(QUALITY_GRID_UNIT), str(QUALITY_MAX_INTERP_GAP), QUALITY_SPIKE_WINDOW, QUALITY_SPIKE_SIGMA,
+            QUALITY_SPIKE_MIN_DEV, str(QUALITY_STUCK_DURATION))
+
+def get_clean_values_at(index, pier_short_name, timestamp, tolerance=ACTUAL_ASOF_TOLERANCE):
+    """
+    Nilai bersih untuk waktu terpilih dengan semantik as-of (pembacaan tepat pada waktu tersebut, atau
+    pembacaan terakhir sebelumnya selama selisihnya <= tolerance). Nilai & flag diambil dari slot grid
+    tempat pembacaan tersebut di-snap, sehingga sama dengan yang dipakai residual dan ekspor.
+    Mengembalikan (timestamp pembacaan, dict sensor -> strain bersih (NaN bila gap), dict sensor -> bitmask
+    FLAG_* slot (hanya sensor ber-flag)) atau None.
+    """
+    data = index.piers.get(pier_short_name)
+    if data is None or len(data.get("reading_timestamps", [])) == 0:
+        return None
+    ts = data["reading_timestamps"]
+    target = pd.Timestamp(timestamp).as_unit('ns').value
+    i = np.searchsorted(ts, target, side='right') - 1
+    if i < 0 or (tolerance is not None and target - ts[i] > pd.Timedelta(tolerance).value):
+        return None
+
+    step = data["interval"]
+    slot = (ts[i] - data["timestamps"][0] + step // 2) // step
+    values = dict(zip(data["sensors"], data["strain"][slot].tolist()))
+    flags = {sg: int(code) for sg, code in zip(data["sensors"], data["flags"][slot]) if code}
+    return pd.Timestamp(ts[i]), values, flags
+
+def mask_runs(mask):
+    """
+    (baris awal, baris akhir eksklusif, kolom) setiap run True per kolom pada mask 2D.
+    """
+    padded = np.zeros((mask.shape[0] + 2, mask.shape[1]), dtype=np.int8)
+    padded[1:-1] = mask
+    edges = np.diff(padded, axis=0).T
+    col, start = np.nonzero(edges == 1)
+    _, end = np.nonzero(edges == -1)
+    return start, end, col
+
+def quality_summary(index):
+    """
+    Ringkasan kualitas per sensor (kolom QUALITY_SUMMARY_COLUMNS) dari indeks hasil clean_strain_index.
+    Pembacaan, duplikat, lonjakan, dan macet dihitung per pembacaan asli; slot grid per interval pier.
+    Cakupan = persentase slot grid yang terukur (slot interpolasi dan gap tidak dihitung).
+    """
+    frames = []
+    for short_name, data in index.piers.items():
+        flags = data.get("flags")
+        if flags is None or len(flags) == 0:
+            continue
+        n = len(flags)
+        start, end, col = mask_runs((flags & FLAG_GAP) != 0)
+        longest = np.zeros(flags.shape[1], dtype=np.int64)
+        np.maximum.at(longest, col, end - start)
+
+        reading_flags = data["reading_flags"]
+        interpolated = ((flags & FLAG_INTERPOLATED) != 0).sum(axis=0)
+        gap = ((flags & FLAG_GAP) != 0).sum(axis=0)
+        measured = n - interpolated - gap
+        frames.append(pd.DataFrame({
+            "Pier": short_name,
+            "SG": data["sensors"],
+            "Interval (menit)": data["interval"] / 6e10,
+            "Pembacaan": data["reading_counts"],
+            **{name: ((reading_flags & bit) != 0).sum(axis=0)
+               for name, bit in [("Duplikat", FLAG_DUPLICATE), ("Lonjakan", FLAG_SPIKE), ("Macet", FLAG_STUCK)]},
+            "Slot Grid": n,
+            "Terukur": measured,
+            "Interpolasi": interpolated,
+            "Gap (slot)": gap,
+            "Cakupan (%)": 100.0 * measured / n,
+            "Gap Terpanjang (jam)": longest * data["interval"] / 3.6e12
+        }))
+    if not frames:
+        return pd.DataFrame(columns=QUALITY_SUMMARY_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[QUALITY_SUMMARY_COLUMNS]
+
+def quality_gaps(index, min_duration=QUALITY_MAX_INTERP_GAP):
+    """
+    Daftar gap (kolom QUALITY_GAP_COLUMNS) yang berdurasi >= min_duration, terbaru lebih dulu; sensor
+    dengan gap identik digabung dalam satu baris.
+    Penyebab: 'macet' / 'lonjakan' bila gap berisi pembacaan yang dibuang, selain itu 'tanpa pembacaan'.
+    """
+    min_ns = pd.Timedelta(min_duration).value
+    frames = []
+    for short_name, data in index.piers.items():
+        flags = data.get("flags")
+        if flags is None or len(flags) == 0:
+            continue
+        start, end, col = mask_runs((flags & FLAG_GAP) != 0)
+        duration = (end - start) * data["interval"]
+        keep = duration >= min_ns
+        start, end, col, duration = start[keep], end[keep], col[keep], duration[keep]
+
+        # Jumlah slot macet/lonjakan dalam tiap gap lewat cumsum per kanal
+        cause = np.full(len(start), "tanpa pembacaan", dtype=object)
+        for bit, label in [(FLAG_SPIKE, "lonjakan"), (FLAG_STUCK, "macet")]:
+            marked = (flags & bit) != 0
+            if not marked.any():
+                continue
+            cumulative = np.zeros((len(flags) + 1, flags.shape[1]), dtype=np.int64)
+            np.cumsum(marked, axis=0, out=cumulative[1:])
+            cause[cumulative[end, col] - cumulative[start, col] > 0] = label
+
+        # Gap yang sama di beberapa sensor (logger mati) digabung menjadi satu baris, urut kanal
+        order = np.lexsort((col, end, start))
+        start, end, col, duration, cause = start[order], end[order], col[order], duration[order], cause[order]
+        group = np.flatnonzero(np.r_[True, (start[1:] != start[:-1]) | (end[1:] != end[:-1]) | (cause[1:] != cause[:-1])])
+        names = np.asarray(data["sensors"], dtype=object)[col].tolist()
+        bounds = np.r_[group, len(start)]
+
+        ts = data["timestamps"]
+        frames.append(pd.DataFrame({
+            "Pier": short_name,
+            "SG": [", ".join(names[a:b]) for a, b in zip(bounds[:-1], bounds[1:])],
+            "Mulai": ts[start[group]].view('datetime64[ns]'),
+            "Selesai": ts[end[group] - 1].view('datetime64[ns]'),
+            "Durasi (jam)": duration[group] / 3.6e12,
+            "Penyebab": cause[group]
+        }))
+    if not frames:
+        return pd.DataFrame(columns=QUALITY_GAP_COLUMNS)
+    gaps = pd.concat(frames, ignore_index=True).sort_values("Mulai", ascending=False, kind="stable")
+    return gaps[QUALITY_GAP_COLUMNS].reset_index(drop=True)
@@ -0,0 +1,139 @@
+"""
+Registri sensor: satu file konfigurasi (JSON/YAML) yang memetakan kanal logger ke ID sensor,
+koordinat, baseline, dan elemen struktur. Dikompilasi sekali per versi file menjadi array NumPy
+yang dipakai langsung oleh loader data aktual, mesin alert, dan engine tegangan.
+
+Format file (lihat config/sensors.json):
+    elements: nama elemen -> {type, logger, part_id, ...geometri}
+        type   : "pier" (length, width) atau "box_girder" (geometry: parameter box_girder_geometry_spec)
+        logger : kode di kolom PIER data aktual untuk elemen ini (null jika belum terpasang)
+        example: true jika elemen hanya contoh (part_id, geometri, dan sensor belum dari desain/as-built);
+                 halaman menampilkannya dengan penanda contoh
+    sensors: daftar {id, element, channel, x, y, baseline}
+        channel: nama kolom kanal logger (mis. "SGA"); null jika sensor belum terhubung ke logger
+"""
+import json
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+
+from .config import SENSOR_REGISTRY_PATH
+from .storage import get_file_signature
+
+ELEMENT_TYPES = ("pier", "box_girder")
+
+class SensorRegistry:
+    """
+    Registri sensor terkompilasi.
+
+    Array per sensor (urutan file): ids, element_index, xy (mm), baseline (με), channel.
+    Per logger: indeks sensor terhubung dan nama kolom kanalnya (urutan kanal = urutan kolom raw).
+    """
+
+    def __init__(self, elements, sensors, key=None):
+        self.key = key
+        self.element_names = list(elements)
+        element_ids = {name: i for i, name in enumerate(self.element_names)}
+
+        ids = [s["id"] for s in sensors]
+        duplicates = sorted(sg for sg, count in Counter(ids).items() if count > 1)
+        if duplicates:
+            raise ValueError(f"ID sensor ganda di registri: {', '.join(duplicates)}")
+        unknown = sorted({s["element"] for s in sensors} - set(element_ids))
+        if unknown:
+            raise ValueError(f"Elemen tidak dikenal di registri sensor: {', '.join(unknown)}")
+        bad_types = sorted(name for name, e in elements.items() if e.get("type") not in ELEMENT_TYPES)
+        if bad_types:
+            raise ValueError(f"Tipe elemen tidak dikenal: {', '.join(bad_types)}")
+
+        self.ids = np.array(ids, dtype=object)
+        self.element_index = np.array([element_ids[s["element"]] for s in sensors], dtype=np.int32)
+        self.xy = np.array([(s["x"], s["y"]) for s in sensors], dtype=float).reshape(-1, 2)
+        self.baseline = np.array([s.get("baseline") or 0.0 for s in sensors], dtype=float)
+        self.channel = np.array([s.get("channel") or "" for s in sensors], dtype=object)
+
+        # Indeks sensor per elemen (urutan file)
+        order = np.argsort(self.element_index, kind="stable")
+        bounds = np.searchsorted(self.element_index[order], np.arange(len(self.element_names) + 1))
+        self.element_sensors = {
+            name: order[bounds[i]:bounds[i + 1]] for i, name in enumerate(self.element_names)
+        }
+
+        # Kanal logger -> sensor, hanya sensor yang terhubung
+        self.loggers = {}
+        for name, element in elements.items():
+            code = element.get("logger")
+            if not code:
+                continue
+            idx = self.element_sensors[name]
+            idx = idx[self.channel[idx] != ""]
+            channels = self.channel[idx].tolist()
+            if len(set(channels)) != len(channels):
+                raise ValueError(f"Kanal ganda pada logger {code}")
+            if code in self.loggers:
+                raise ValueError(f"Logger {code} dipakai lebih dari satu elemen")
+            self.loggers[code] = {"element": name, "sensor_index": idx, "channels": channels}
+        self.channels = sorted({ch for logger in self.loggers.values() for ch in logger["channels"]})
+
+        # Tampilan dict untuk halaman (dibangun sekali)
+        self.element_configs = {}
+        for name, element in elements.items():
+            idx = self.element_sensors[name]
+            cfg = {k: v for k, v in element.items() if k not in ("type", "logger")}
+            cfg["sgs"] = {sensors[i]["id"]: (sensors[i]["x"], sensors[i]["y"]) for i in idx}
+            self.element_configs.setdefault(element["type"], {})[name] = cfg
+        self.logger_codes = {name: e["logger"] for name, e in elements.items() if e.get("logger")}
+        self.baseline_config = {
+            code: dict(zip(self.ids[logger["sensor_index"]], self.baseline[logger["sensor_index"]].tolist()))
+            for code, logger in self.loggers.items()
+        }
+
+    @classmethod
+    def from_file(cls, path, key=None):
+        with open(path, encoding="utf-8") as f:
+            if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+                import yaml
+                spec = yaml.safe_load(f)
+            else:
+                spec = json.load(f)
+        return cls(spec.get("elements", {}), spec.get("sensors", []), key=key)
+
+    def elements_of_type(self, element_type):
+        """
+        Dict nama elemen -> konfigurasi (part_id, geometri, sgs) untuk satu tipe elemen.
+        """
+        return self.element_configs.get(element_type, {})
+
+    def logger_columns(self, code, columns):
+        """
+        (indeks sensor, nama kolom kanal) logger yang tersedia di kolom data; None jika logger tidak dikenal.
+        """
+        logger = self.loggers.get(code)
+        if logger is None:
+            return None
+        present = np.array([ch in columns for ch in logger["channels"]], dtype=bool)
+        return logger["sensor_index"][present], [ch for ch, ok in zip(logger["channels"], present) if ok]
+
+    def sensor_ids(self, code):
+        """
+        ID sensor yang terhubung ke logger, urut sesuai kanal.
+        """
+        logger = self.loggers.get(code)
+        return [] if logger is None else self.ids[logger["sensor_index"]].tolist()
+
+_registry_cache = {}
+_registry_lock = threading.Lock()
+
+def get_sensor_registry(path=SENSOR_REGISTRY_PATH):
+    """
+    Registri sensor terkompilasi; dikompilasi ulang hanya saat file berubah (mtime & ukuran).
+    """
+    signature = get_file_signature(path)
+    key = (os.path.abspath(path), signature)
+    with _registry_lock:
+        registry = _registry_cache.get(key[0])
+        if registry is None or registry.key != key:
+            registry = _registry_cache[key[0]] = SensorRegistry.from_file(path, key=key)
+    return registry
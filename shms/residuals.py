@@ -0,0 +1,97 @@
+"""
+Jadwal stage konstruksi dan residual aktual vs teoritis seluruh riwayat.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from .actual import ActualStrainIndex
+from .config import ACTUAL_DATE_FORMAT, STAGE_SCHEDULE_COLUMNS
+
+def load_stage_schedule(path, stages):
+    """
+    Memuat jadwal stage (Stage, Tanggal Mulai) dari CSV. Setiap stage di data gaya mendapat satu baris;
+    stage yang belum dijadwalkan (atau file belum ada) bernilai NaT.
+    """
+    schedule = pd.DataFrame({"Stage": list(stages)})
+    dates = pd.Series(pd.NaT, index=schedule.index, dtype='datetime64[ns]')
+    if os.path.exists(path):
+        df = pd.read_csv(path, encoding='utf-8-sig').drop_duplicates(subset=['Stage'], keep='last')
+        starts = pd.to_datetime(df[STAGE_SCHEDULE_COLUMNS[1]], format='mixed', dayfirst=False, errors='coerce')
+        dates = schedule['Stage'].map(dict(zip(df['Stage'], starts))).astype('datetime64[ns]')
+    schedule[STAGE_SCHEDULE_COLUMNS[1]] = dates
+    return schedule
+
+def save_stage_schedule(schedule, path):
+    """
+    Menyimpan baris jadwal yang sudah bertanggal ke CSV (format tanggal sama dengan data aktual).
+    """
+    df = schedule.dropna(subset=[STAGE_SCHEDULE_COLUMNS[1]])
+    out = pd.DataFrame({
+        "Stage": df["Stage"],
+        STAGE_SCHEDULE_COLUMNS[1]: pd.to_datetime(df[STAGE_SCHEDULE_COLUMNS[1]]).dt.strftime(ACTUAL_DATE_FORMAT)
+    })
+    out.to_csv(path, index=False)
+
+def get_schedule_key(schedule):
+    """
+    Kunci cache jadwal: tuple (stage, tanggal mulai ns) untuk baris yang bertanggal.
+    """
+    df = schedule.dropna(subset=[STAGE_SCHEDULE_COLUMNS[1]])
+    starts = pd.to_datetime(df[STAGE_SCHEDULE_COLUMNS[1]]).to_numpy(dtype='datetime64[ns]').view('int64')
+    return tuple(zip(df["Stage"].tolist(), starts.tolist()))
+
+def get_schedule_starts(schedule_key, stage_index_by_name):
+    """
+    Tanggal mulai (ns, urut naik) dan indeks stage dari kunci jadwal; stage yang tidak ada di data gaya dilewati.
+    """
+    entries = sorted((start, stage_index_by_name[stage]) for stage, start in schedule_key if stage in stage_index_by_name)
+    starts = np.array([e[0] for e in entries], dtype=np.int64)
+    stage_ids = np.array([e[1] for e in entries], dtype=np.int64)
+    return starts, stage_ids
+
+def map_scheduled_stage(starts, stage_ids, ts):
+    """
+    Indeks stage yang berlaku untuk tiap timestamp (tanggal mulai terakhir <= timestamp) via searchsorted;
+    -1 untuk timestamp sebelum jadwal pertama.
+    """
+    pos = np.searchsorted(starts, ts, side='right') - 1
+    stage_idx = np.full(len(ts), -1, dtype=np.int64)
+    stage_idx[pos >= 0] = stage_ids[pos[pos >= 0]]
+    return stage_idx
+
+def build_theory_columns(theory_table, sensors, n_stage):
+    """
+    Matriks (jumlah stage + 1, sensor) regangan teoritis; baris tambahan NaN di akhir untuk indeks stage -1
+    (sebelum jadwal pertama), sehingga hasil map_scheduled_stage dapat dipakai langsung sebagai indeks.
+    """
+    return np.column_stack([
+        np.r_[theory_table.get(sg, np.full(n_stage, np.nan)), np.nan] for sg in sensors
+    ])
+
+def compute_residual_index(actual_index, stage_index_by_name, schedule_key, theory_table):
+    """
+    Residual (aktual - teoritis) untuk seluruh riwayat dalam satu pass tervektorisasi per pier.
+
+    Setiap timestamp dipetakan ke stage yang berlaku (tanggal mulai terakhir <= timestamp)
+    dengan searchsorted, lalu regangan teoritis stage tersebut diambil dengan fancy indexing.
+    Hasil berupa ActualStrainIndex dengan 'strain' berisi residual, ditambah 'stage' (indeks
+    stage, -1 jika sebelum jadwal pertama) dan 'theory'.
+    """
+    starts, stage_ids = get_schedule_starts(schedule_key, stage_index_by_name)
+
+    piers = {}
+    for short_name, data in actual_index.piers.items():
+        ts = data["timestamps"]
+        stage_idx = map_scheduled_stage(starts, stage_ids, ts)
+        theory = build_theory_columns(theory_table, data["sensors"], len(stage_index_by_name))[stage_idx]
+
+        piers[short_name] = {
+            "timestamps": ts,
+            "sensors": data["sensors"],
+            "stage": stage_idx,
+            "theory": theory,
+            "strain": data["strain"] - theory
+        }
+    return ActualStrainIndex(piers, actual_index.timestamps_desc)
@@ -0,0 +1,250 @@
+"""
+Engine penampang: meshing (dengan cache disk berbasis isi), koefisien tegangan sensor,
+dan interpolasi mesh ke grid. sectionproperties dan scipy baru diimpor saat dibutuhkan.
+"""
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+import numpy as np
+
+from .config import SECTION_CACHE_DIR, SECTION_CACHE_VERSION, SECTIONPROPERTIES_VERSION
+from .perf import perf_timer
+
+def get_section_cache_key(geometry_spec, mesh_size, with_warping):
+    """
+    Kunci cache berbasis isi: hash dari (geometri, ukuran mesh, analisis warping, versi sectionproperties).
+    Geometri identik (mis. keempat pier 5000×2000) menghasilkan kunci yang sama.
+    """
+    payload = {
+        "geometry": geometry_spec,
+        "mesh_size": float(mesh_size),
+        "warping": bool(with_warping),
+        "sectionproperties": SECTIONPROPERTIES_VERSION,
+        "cache_version": SECTION_CACHE_VERSION
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+def rectangular_geometry_spec(length, width):
+    """
+    Spesifikasi geometri penampang persegi (d = panjang, b = lebar, mm).
+    """
+    return {"type": "rectangular", "d": float(length), "b": float(width)}
+
+def box_girder_geometry_spec(depth, top_width, bottom_width, top_flange, bottom_flange, web, cells):
+    """
+    Spesifikasi poligon box girder multi-sel (mm): pelat atas selebar top_width dengan kantilever,
+    kotak bawah selebar bottom_width di tengah, (cells + 1) web vertikal, dan satu void per sel.
+    Origin di sudut kiri bawah bounding box.
+    """
+    depth, top_width, bottom_width = float(depth), float(top_width), float(bottom_width)
+    top_flange, bottom_flange, web = float(top_flange), float(bottom_flange), float(web)
+    x0 = (top_width - bottom_width) / 2
+    y_soffit = depth - top_flange
+    cell_width = (bottom_width - (cells + 1) * web) / cells
+    if x0 < 0 or cell_width <= 0 or bottom_flange + top_flange >= depth:
+        raise ValueError("Dimensi box girder tidak valid")
+
+    outer = [
+        [x0, 0.0], [x0 + bottom_width, 0.0], [x0 + bottom_width, y_soffit], [top_width, y_soffit],
+        [top_width, depth], [0.0, depth], [0.0, y_soffit], [x0, y_soffit]
+    ]
+    voids = []
+    for i in range(cells):
+        left = x0 + web + i * (cell_width + web)
+        right = left + cell_width
+        voids.append([[left, bottom_flange], [right, bottom_flange], [right, y_soffit], [left, y_soffit]])
+    return {"type": "polygon", "outer": outer, "voids": voids}
+
+@perf_timer("Meshing & analisis geometrik")
+def build_section(geometry_spec, mesh_size, with_warping=False):
+    """
+    Membuat geometri dari spesifikasi, melakukan meshing dan analisis geometrik.
+    Analisis warping hanya diperlukan untuk tegangan geser/torsi, bukan σzz dari N/Mxx/Myy.
+    """
+    from sectionproperties.analysis import Section
+    from sectionproperties.pre.geometry import Geometry
+    from sectionproperties.pre.library import rectangular_section
+
+    if geometry_spec["type"] == "rectangular":
+        geom = rectangular_section(d=geometry_spec["d"], b=geometry_spec["b"])
+    elif geometry_spec["type"] == "polygon":
+        from shapely import Polygon
+        geom = Geometry(Polygon(geometry_spec["outer"], holes=geometry_spec.get("voids", [])))
+    else:
+        raise ValueError(f"Tipe geometri tidak dikenal: {geometry_spec['type']}")
+
+    geom.create_mesh(mesh_sizes=[float(mesh_size)])
+    sec = Section(geometry=geom)
+    sec.calculate_geometric_properties()
+    if with_warping:
+        sec.calculate_warping_properties()
+    return sec
+
+def load_or_build_section(geometry_spec, mesh_size, with_warping=False, cache_dir=None):
+    """
+    Memuat Section dari cache disk (kunci berbasis isi) atau membangunnya lalu menyimpannya secara atomik.
+    """
+    cache_dir = SECTION_CACHE_DIR if cache_dir is None else cache_dir
+    cache_key = get_section_cache_key(geometry_spec, mesh_size, with_warping)
+    cache_path = os.path.join(cache_dir, f"{cache_key}.pkl")
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # Cache belum ada atau tidak kompatibel: bangun ulang
+        pass
+
+    sec = build_section(geometry_spec, mesh_size, with_warping)
+    # Nama sementara unik per proses/thread (sama dengan cache kolumnar & ekspor); sisa file gagal tulis dihapus
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(sec, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        # Cache bersifat opsional (disk penuh/read-only, objek tak bisa di-pickle): Section tetap dikembalikan
+        pass
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return sec
+
+def get_section_geometry(length, width, mesh_scale, with_warping=False, cache_dir=None):
+    """
+    Section pier persegi dengan ukuran mesh = panjang × mesh_scale (tanpa cache memori).
+    """
+    return load_or_build_section(rectangular_geometry_spec(length, width), float(length) * mesh_scale,
+                                 with_warping, cache_dir)
+
+def build_sensor_stress_coefficients(section, pts):
+    """
+    Menyusun matriks koefisien tegangan σzz untuk titik-titik sensor.
+
+    Untuk penampang prismatik, σzz linear terhadap (N, Mxx, Myy), sehingga
+    σzz = C @ [n, mxx, myy]. Properti penampang (A, Ixx, Iyy, Ixy, centroid)
+    diambil sekali dari objek Section yang sudah dianalisis.
+    Hasil: array (jumlah_sensor, 3) dengan kolom [n, mxx, myy].
+    """
+    area = section.get_area()
+    cx, cy = section.get_c()
+    ixx, iyy, ixy = section.get_ic()
+    det = ixx * iyy - ixy ** 2
+
+    pts = np.asarray(pts, dtype=float).reshape(-1, 2)
+    x = pts[:, 0] - cx
+    y = pts[:, 1] - cy
+
+    coeffs = np.empty((len(pts), 3))
+    coeffs[:, 0] = 1.0 / area
+    coeffs[:, 1] = (-ixy * x + iyy * y) / det
+    coeffs[:, 2] = (-ixx * x + ixy * y) / det
+    return coeffs
+
+class MeshGridInterpolator:
+    """
+    Interpolasi linear nilai nodal mesh ke grid reguler (setara griddata method='linear').
+
+    Triangulasi Delaunay dan bobot barisentrik dihitung sekali per mesh dan disimpan
+    sebagai matriks sparse, sehingga interpolasi load case baru cukup satu perkalian
+    matriks-vektor. Garis wireframe mesh juga disiapkan sekali secara tervektorisasi.
+    """
+
+    def __init__(self, nodes, elements, resolution=100, domain=None):
+        from scipy import sparse
+        from scipy.spatial import Delaunay
+
+        x, y = nodes[:, 0], nodes[:, 1]
+        self.resolution = resolution
+        self.grid_x = np.linspace(x.min(), x.max(), resolution)
+        self.grid_y = np.linspace(y.min(), y.max(), resolution)
+
+        # Titik grid dengan urutan [ix, iy] (sama seperti np.mgrid)
+        gx, gy = np.meshgrid(self.grid_x, self.grid_y, indexing='ij')
+        pts = np.column_stack([gx.ravel(), gy.ravel()])
+
+        tri = Delaunay(nodes[:, :2])
+        simplex = tri.find_simplex(pts)
+        inside = simplex >= 0
+        if domain is not None:
+            # Triangulasi Delaunay menutup void dan sisi cekung; titik di luar penampang dibuang
+            import shapely
+            inside &= shapely.intersects_xy(domain, pts[:, 0], pts[:, 1])
+
+        # Koordinat barisentrik untuk titik grid di dalam triangulasi
+        transform = tri.transform[simplex[inside]]
+        b = np.einsum('ijk,ik->ij', transform[:, :2, :], pts[inside] - transform[:, 2, :])
+        bary = np.column_stack([b, 1.0 - b.sum(axis=1)])
+
+        rows = np.repeat(np.flatnonzero(inside), 3)
+        cols = tri.simplices[simplex[inside]].ravel()
+        self.weights = sparse.csr_matrix((bary.ravel(), (rows, cols)), shape=(len(pts), len(nodes)))
+        self.outside = ~inside
+
+        # Wireframe: tiap segitiga (3 titik sudut) -> 0,1,2,0,NaN sebagai pemisah
+        corners = nodes[elements[:, :3]]
+        loops = np.concatenate([corners, corners[:, :1], np.full((len(corners), 1, 2), np.nan)], axis=1)
+        self.wire_x = loops[:, :, 0].ravel()
+        self.wire_y = loops[:, :, 1].ravel()
+
+    @perf_timer("Interpolasi grid mesh")
+    def interpolate(self, values):
+        """
+        Interpolasi nilai nodal ke grid. Hasil berbentuk (ny, nx), siap dipakai sebagai z Plotly.
+        """
+        return self.as_grid(self.weights @ np.asarray(values, dtype=float))
+
+    def as_grid(self, grid_z):
+        """
+        Vektor nilai titik grid (urutan [ix, iy]) -> array (ny, nx) dengan NaN di luar penampang.
+        """
+        grid_z[self.outside] = np.nan
+        return grid_z.reshape(self.resolution, self.resolution).T
+
+    @classmethod
+    def from_section(cls, section, resolution=100):
+        return cls(section.mesh["vertices"], section.mesh["triangles"], resolution, domain=section.geometry.geom)
+
+class UnitLoadStressField:
+    """
+    Medan σzz nodal akibat beban satuan N, Mxx, dan Myy untuk seluruh mesh (nodes × 3).
+
+    Karena σzz linear terhadap beban, medan tegangan stage mana pun cukup satu perkalian
+    matriks-vektor dengan [n, mxx, myy], tanpa stress recovery FEA (calculate_stress).
+    Proyeksi ke grid kontur juga disimpan (titik grid × 3), sehingga grid tegangan per stage
+    tidak perlu diinterpolasi ulang.
+    """
+
+    def __init__(self, section, mesh_interp):
+        self.mesh_interp = mesh_interp
+        self.nodal = build_sensor_stress_coefficients(section, section.mesh["vertices"])
+        self.grid = np.asarray(mesh_interp.weights @ self.nodal)
+
+    def nodal_stress(self, load_vec):
+        """
+        σzz (MPa) di setiap node mesh untuk vektor beban [n, mxx, myy] (N, N·mm).
+        """
+        return self.nodal @ np.asarray(load_vec, dtype=float)
+
+    @perf_timer("Superposisi beban satuan")
+    def grid_stress(self, load_vec):
+        """
+        Grid σzz (ny, nx) untuk vektor beban [n, mxx, myy], siap dipakai sebagai z Plotly.
+        """
+        return self.mesh_interp.as_grid(self.grid @ np.asarray(load_vec, dtype=float))
+
+    @perf_timer("Superposisi beban satuan (semua stage)")
+    def grid_stress_stages(self, load_matrix, stride=1):
+        """
+        Grid σzz (stage, ny, nx) untuk matriks beban (stage, [n, mxx, myy]) dalam satu perkalian matriks.
+        stride > 1 menjarangkan grid (koordinat: grid_x[::stride], grid_y[::stride]).
+        """
+        res = self.mesh_interp.resolution
+        idx = np.arange(res * res).reshape(res, res)[::stride, ::stride].T.ravel()
+        grid_z = np.asarray(load_matrix, dtype=float).reshape(-1, 3) @ self.grid[idx].T
+        grid_z[:, self.mesh_interp.outside[idx]] = np.nan
+        ny, nx = len(self.mesh_interp.grid_y[::stride]), len(self.mesh_interp.grid_x[::stride])
+        return grid_z.reshape(-1, ny, nx)
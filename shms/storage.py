@@ -0,0 +1,79 @@
+"""
+Utilitas file: tanda tangan/hash file dan cache kolumnar Parquet untuk file CSV di data/.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .config import COLUMNAR_CACHE_DIRNAME, COLUMNAR_CACHE_META_KEY, COLUMNAR_CACHE_SCHEMA_VERSION
+
+def get_file_signature(path):
+    """
+    Tanda tangan file (mtime, ukuran) untuk kunci cache; berubah saat file diperbarui.
+    """
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def get_stat_signature(stat):
+    """
+    Tanda tangan perubahan dari hasil os.stat (mtime, ukuran, inode); dipakai pembaca inkremental
+    untuk melewati file yang tidak berubah tanpa membuka atau membaca isinya.
+    """
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+def hash_file(path):
+    """
+    Hash SHA-256 isi file (dibaca per blok 1 MB).
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def get_columnar_cache_path(csv_path):
+    """
+    Lokasi cache kolumnar (Parquet) untuk sebuah file CSV: <folder>/.cache/<nama>.parquet
+    """
+    name = os.path.splitext(os.path.basename(csv_path))[0] + ".parquet"
+    return os.path.join(os.path.dirname(csv_path), COLUMNAR_CACHE_DIRNAME, name)
+
+def read_columnar_cache_metadata(cache_path):
+    """
+    Membaca metadata cache tanpa memuat isi tabel. Mengembalikan None jika cache tidak valid.
+    """
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    meta = json.loads(metadata.get(COLUMNAR_CACHE_META_KEY, b"{}"))
+    if meta.get("schema_version") != COLUMNAR_CACHE_SCHEMA_VERSION:
+        return None
+    return meta
+
+def write_columnar_cache(df, cache_path, meta):
+    """
+    Menulis DataFrame ke Parquet beserta metadata sumber (ditulis atomik via file sementara).
+    Kegagalan tulis (mis. filesystem read-only) diabaikan karena cache bersifat opsional.
+    """
+    meta = {**meta, "schema_version": COLUMNAR_CACHE_SCHEMA_VERSION}
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        COLUMNAR_CACHE_META_KEY: json.dumps(meta).encode()
+    })
+    # Nama sementara unik per proses/thread agar sesi atau worker lain yang membangun cache yang sama tidak saling menimpa
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,559 @@
+"""
+Penyimpanan embedded (SQLite) untuk pembacaan sensor aktual.
+
+Tabel readings berformat panjang (pier, ts, channel, value) dengan primary key (pier, ts, channel),
+sehingga lookup per tanggal dan agregasi tren dikerjakan SQL lewat indeks tanpa memuat seluruh
+riwayat ke pandas. Timestamp unik (untuk pemilih tanggal) dan statistik per bucket jam/hari
+(sensor_stats) dipelihara saat ingest. Nilai disimpan raw (float64, termasuk pembacaan rata-rata
+pecahan dari logger); baseline dari registri sensor dikurangkan saat query. Ingest dari CSV bersifat
+inkremental (offset byte terakhir dicatat).
+"""
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .actual import IncrementalCsvReader, format_duration, parse_actual_strain_chunk
+from .config import ACTUAL_ASOF_TOLERANCE, ACTUAL_STORE_PAGE_SIZE, SENSOR_STAT_LEVELS
+from .registry import get_sensor_registry
+from .storage import get_stat_signature
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    pier TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (pier, ts, channel)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS timestamps (
+    ts INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS sensor_stats (
+    width INTEGER NOT NULL,
+    pier TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    m2 REAL NOT NULL,
+    vmin REAL NOT NULL,
+    vmax REAL NOT NULL,
+    PRIMARY KEY (width, pier, bucket, channel)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ingest_state (
+    source TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    header BLOB NOT NULL,
+    fingerprint BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Penggabungan statistik bucket (Chan et al.): rata-rata & M2 digabung tanpa membaca ulang data lama
+STATS_MERGE_SQL = """
+INSERT INTO sensor_stats (width, pier, bucket, channel, n, mean, m2, vmin, vmax)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (width, pier, bucket, channel) DO UPDATE SET
+    n = n + excluded.n,
+    mean = mean + (excluded.mean - mean) * excluded.n / (n + excluded.n),
+    m2 = m2 + excluded.m2 + (excluded.mean - mean) * (excluded.mean - mean) * n * excluded.n / (n + excluded.n),
+    vmin = MIN(vmin, excluded.vmin),
+    vmax = MAX(vmax, excluded.vmax)
+"""
+
+SENSOR_STATS_COLUMNS = ["Waktu", "Pier", "SG", "Jumlah", "Rata-rata (με)", "Std (με)", "Min (με)", "Max (με)"]
+
+class ActualReadingStore:
+    """
+    Satu koneksi SQLite per file database, dipakai bersama antar thread (dilindungi lock).
+    """
+
+    # Naikkan saat format isi berubah; store versi lain dikosongkan lalu diimpor ulang dari CSV
+    STORE_VERSION = 2
+    INGEST_CHUNK_BYTES = 16 * 1024 * 1024
+    FINGERPRINT_BYTES = IncrementalCsvReader.FINGERPRINT_BYTES
+    STATS_BACKFILL_SPAN = pd.Timedelta(days=30).value
+
+    def __init__(self, db_path, stat_levels=SENSOR_STAT_LEVELS):
+        self.db_path = db_path
+        self.stat_widths = [pd.Timedelta(w).value for w in stat_levels.values()]
+        self.stat_labels = {pd.Timedelta(w).value: label for label, w in stat_levels.items()}
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._source_signatures = {}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(STORE_SCHEMA)
+        with self._lock:
+            self._check_version()
+            self._backfill_stats()
+
+    def _check_version(self):
+        """
+        Mengosongkan store dengan format lama (mis. nilai float32 sebelum versi 2) agar diimpor ulang.
+        """
+        row = self._conn.execute("SELECT value FROM store_meta WHERE key = 'store_version'").fetchone()
+        if row is not None and row[0] == self.STORE_VERSION:
+            return
+        with self._conn:
+            for table in ("readings", "timestamps", "sensor_stats", "ingest_state"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.execute("DELETE FROM store_meta WHERE key = 'timestamp_count'")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('store_version', ?)", (self.STORE_VERSION,)
+            )
+            self._conn.execute(
+                "INSERT INTO store_meta (key, value) VALUES ('revision', 1) "
+                "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def revision(self):
+        """
+        Nomor revisi isi store; bertambah setiap ingest yang menambah data (untuk kunci cache).
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM store_meta WHERE key = 'revision'").fetchone()
+        return 0 if row is None else row[0]
+
+    # ------------------------------------------
+    # Ingest
+    # ------------------------------------------
+
+    def ingest_csv(self, csv_path, rebuild=False):
+        """
+        Mengimpor baris baru dari CSV aktual sejak offset terakhir (atau seluruh file jika file
+        ditulis ulang / rebuild=True). Mengembalikan jumlah baris CSV yang diimpor.
+        File yang tidak berubah sejak ingest terakhir di proses ini hanya dibayar satu os.stat.
+        """
+        source = os.path.basename(csv_path)
+        with self._lock:
+            signature = get_stat_signature(os.stat(csv_path))
+            if not rebuild and self._source_signatures.get(source) == signature:
+                return 0
+            total_rows = self._ingest_file(csv_path, source, rebuild)
+            self._source_signatures[source] = signature
+            return total_rows
+
+    def _ingest_file(self, csv_path, source, rebuild):
+        """
+        Impor per potongan; tiap potongan satu transaksi bersama offset & revisi (dipanggil dengan lock).
+        """
+        with open(csv_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            state = self._conn.execute(
+                "SELECT offset, header, fingerprint FROM ingest_state WHERE source = ?", (source,)
+            ).fetchone()
+            if state is not None and not rebuild:
+                offset, header, fingerprint = state[0], bytes(state[1]), bytes(state[2])
+                if size < offset or not IncrementalCsvReader._matches_prefix(f, header, offset, fingerprint):
+                    rebuild = True
+            if state is None or rebuild:
+                f.seek(0)
+                header = f.readline()
+                if not header.endswith(b"\n"):
+                    return 0
+                offset, fingerprint = len(header), header[-self.FINGERPRINT_BYTES:]
+                if rebuild:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM readings")
+                        self._conn.execute("DELETE FROM timestamps")
+                        self._conn.execute("DELETE FROM sensor_stats")
+                        self._conn.execute("DELETE FROM store_meta WHERE key = 'timestamp_count'")
+
+            columns = header.decode('utf-8-sig').strip().split(',')
+            total_rows = 0
+            f.seek(offset)
+            while offset < size:
+                data = f.read(self.INGEST_CHUNK_BYTES)
+                # Hanya baris lengkap; sisa baris parsial dibaca pada potongan/ingest berikutnya
+                end = data.rfind(b"\n") + 1
+                if end == 0:
+                    break
+                data = data[:end]
+                f.seek(offset + end)
+
+                # float64: pembacaan rata-rata pecahan logger (mis. 1809.666667) disimpan apa adanya
+                chunk = parse_actual_strain_chunk(data, columns, dtype='float64')
+                offset += end
+                fingerprint = (fingerprint + data)[-self.FINGERPRINT_BYTES:]
+                total_rows += len(chunk)
+                # Baris ganda (pier, waktu) dalam satu potongan: yang terakhir dipakai, sama seperti INSERT OR REPLACE
+                chunk = chunk.drop_duplicates(['PIER', 'DATE'], keep='last')
+                long = actual_chunk_to_long(chunk)
+                with self._conn:
+                    latest = self._latest_timestamps(np.unique(long[0]).tolist())
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO readings (pier, ts, channel, value) VALUES (?, ?, ?, ?)",
+                        long_to_rows(*long)
+                    )
+                    self._update_stats(*long, latest)
+                    new_ts = self._conn.executemany(
+                        "INSERT OR IGNORE INTO timestamps (ts) VALUES (?)",
+                        ((t,) for t in np.unique(chunk['DATE'].to_numpy(dtype='datetime64[ns]').view('int64')).tolist())
+                    ).rowcount
+                    self._conn.execute(
+                        "INSERT INTO store_meta (key, value) VALUES ('timestamp_count', ?) "
+                        "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value", (max(new_ts, 0),)
+                    )
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO ingest_state (source, offset, header, fingerprint) VALUES (?, ?, ?, ?)",
+                        (source, offset, header, fingerprint)
+                    )
+                    self._conn.execute(
+                        "INSERT INTO store_meta (key, value) VALUES ('revision', 1) "
+                        "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+                    )
+            return total_rows
+
+    # ------------------------------------------
+    # Statistik per bucket (dipanggil dengan lock)
+    # ------------------------------------------
+
+    def _latest_timestamps(self, piers):
+        """
+        Timestamp terakhir per pier sebelum potongan baru dimasukkan.
+        """
+        latest = {}
+        for pier in piers:
+            ts = self._conn.execute("SELECT MAX(ts) FROM readings WHERE pier = ?", (pier,)).fetchone()[0]
+            if ts is not None:
+                latest[pier] = ts
+        return latest
+
+    def _update_stats(self, piers, ts, channels, values, latest):
+        """
+        Memperbarui sensor_stats untuk baris baru. Baris setelah timestamp terakhir pier digabung
+        langsung (STATS_MERGE_SQL); baris susulan/pengganti (waktu <= timestamp terakhir) membuat
+        bucket yang tersentuh dihitung ulang dari readings agar nilai ganda tidak terhitung dua kali.
+        """
+        codes, uniques = pd.factorize(piers)
+        floor = np.array([latest.get(p, np.iinfo(np.int64).min) for p in uniques], dtype=np.int64)
+        late = ts <= floor[codes] if len(uniques) else np.zeros(len(ts), dtype=bool)
+        fresh = ~late
+        for width in self.stat_widths:
+            self._conn.executemany(
+                STATS_MERGE_SQL,
+                bucket_statistics(piers[fresh], ts[fresh], channels[fresh], values[fresh], width)
+            )
+            if late.any():
+                touched = pd.DataFrame({"pier": piers[late], "bucket": ts[late] // width * width}).drop_duplicates()
+                for pier, bucket in touched.itertuples(index=False):
+                    self._recompute_stats(width, pier, int(bucket), int(bucket) + width)
+
+    def _recompute_stats(self, width, pier, t0, t1):
+        """
+        Menghitung ulang statistik bucket [t0, t1) satu pier dari tabel readings.
+        """
+        self._conn.execute(
+            "DELETE FROM sensor_stats WHERE width = ? AND pier = ? AND bucket >= ? AND bucket < ?",
+            (width, pier, t0, t1)
+        )
+        rows = self._conn.execute(
+            "SELECT ts, channel, value FROM readings WHERE pier = ? AND ts >= ? AND ts < ? AND value IS NOT NULL",
+            (pier, t0, t1)
+        ).fetchall()
+        if not rows:
+            return
+        frame = pd.DataFrame(rows, columns=["ts", "channel", "value"])
+        self._conn.executemany(STATS_MERGE_SQL, bucket_statistics(
+            np.full(len(frame), pier, dtype=object), frame["ts"].to_numpy(dtype=np.int64),
+            frame["channel"].to_numpy(dtype=object), frame["value"].to_numpy(dtype=float), width
+        ))
+
+    def _backfill_stats(self):
+        """
+        Mengisi sensor_stats untuk level yang belum ada (store lama atau level baru di konfigurasi),
+        per jendela waktu agar memori tetap kecil.
+        """
+        for width in self.stat_widths:
+            if self._conn.execute("SELECT 1 FROM sensor_stats WHERE width = ? LIMIT 1", (width,)).fetchone():
+                continue
+            span = max(self.STATS_BACKFILL_SPAN // width, 1) * width
+            with self._conn:
+                for pier, t_min, t_max in self._conn.execute(
+                    "SELECT pier, MIN(ts), MAX(ts) FROM readings GROUP BY pier"
+                ).fetchall():
+                    for t0 in range(t_min // width * width, t_max + 1, span):
+                        self._recompute_stats(width, pier, t0, t0 + span)
+
+    # ------------------------------------------
+    # Query
+    # ------------------------------------------
+
+    def count_timestamps(self):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM store_meta WHERE key = 'timestamp_count'").fetchone()
+        return 0 if row is None else row[0]
+
+    def timestamps_page(self, page=0, page_size=ACTUAL_STORE_PAGE_SIZE):
+        """
+        Satu halaman timestamp unik (terbaru lebih dulu) sebagai DatetimeIndex.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts FROM timestamps ORDER BY ts DESC LIMIT ? OFFSET ?",
+                (page_size, page * page_size)
+            ).fetchall()
+        return pd.DatetimeIndex(np.array([r[0] for r in rows], dtype=np.int64).view('datetime64[ns]'))
+
+    def time_range(self, pier_short_name):
+        """
+        (timestamp pertama, timestamp terakhir) untuk satu pier, atau None jika kosong.
+        """
+        with self._lock:
+            t_min, t_max = self._conn.execute(
+                "SELECT MIN(ts), MAX(ts) FROM readings WHERE pier = ?", (pier_short_name,)
+            ).fetchone()
+        if t_min is None:
+            return None
+        return pd.Timestamp(t_min), pd.Timestamp(t_max)
+
+    def piers(self):
+        """
+        Daftar pier di store; tiap pier dicari lewat primary key (MIN pier > sebelumnya), tanpa scan tabel.
+        """
+        piers = []
+        with self._lock:
+            while True:
+                pier = self._conn.execute(
+                    "SELECT MIN(pier) FROM readings WHERE pier > ?", (piers[-1] if piers else "",)
+                ).fetchone()[0]
+                if pier is None:
+                    return piers
+                piers.append(pier)
+
+    def values_at(self, pier_short_name, selected_date, tolerance=ACTUAL_ASOF_TOLERANCE, registry=None):
+        """
+        Setara get_actual_values_by_date: pembacaan tepat pada waktu terpilih atau pembacaan terakhir
+        sebelumnya (selama selisih <= tolerance). Mengembalikan (timestamp, dict sensor -> strain) atau None.
+        """
+        registry = get_sensor_registry() if registry is None else registry
+        logger = registry.loggers.get(pier_short_name)
+        if logger is None:
+            return None
+
+        target = pd.Timestamp(selected_date).as_unit('ns').value
+        with self._lock:
+            ts = self._conn.execute(
+                "SELECT MAX(ts) FROM readings WHERE pier = ? AND ts <= ?", (pier_short_name, target)
+            ).fetchone()[0]
+            if ts is None:
+                return None
+            if tolerance is not None and target - ts > pd.Timedelta(tolerance).value:
+                return None
+            rows = dict(self._conn.execute(
+                "SELECT channel, value FROM readings WHERE pier = ? AND ts = ?", (pier_short_name, ts)
+            ).fetchall())
+
+        values = {}
+        for i, ch in zip(logger["sensor_index"], logger["channels"]):
+            if ch in rows:
+                raw = np.nan if rows[ch] is None else rows[ch]
+                values[registry.ids[i]] = raw - registry.baseline[i]
+        return pd.Timestamp(ts), values
+
+    def trend(self, pier_short_name, start, end, max_points=1000, registry=None):
+        """
+        Seri tren [start, end] dengan paling banyak max_points titik per sensor. Format hasil sama dengan
+        ActualTrendPyramid.query, begitu pula pemilihan resolusinya: data mentah jika muat; jika tidak,
+        level sensor_stats terkasar yang lebarnya <= lebar target, dibucket ulang (count, sum, min, max)
+        oleh SQL. Rentang pendek di bawah level terhalus dibucket langsung dari readings, sehingga biaya
+        query sebanding jumlah titik hasil, bukan panjang riwayat.
+        """
+        registry = get_sensor_registry() if registry is None else registry
+        logger = registry.loggers.get(pier_short_name)
+        if logger is None:
+            return None
+
+        t0 = pd.Timestamp(start).as_unit('ns').value
+        t1 = pd.Timestamp(end).as_unit('ns').value
+        max_points = max(int(max_points), 1)
+        # floor(rentang / max_points) + 1: (t - t0) // target_width < max_points untuk t <= t1
+        target_width = (t1 - t0) // max_points + 1
+        with self._lock:
+            # DISTINCT mengikuti urutan primary key, sehingga LIMIT menghentikan scan setelah max_points + 1
+            n_raw = self._conn.execute(
+                "SELECT COUNT(*) FROM (SELECT DISTINCT ts FROM readings WHERE pier = ? AND ts BETWEEN ? AND ? "
+                "LIMIT ?)", (pier_short_name, t0, t1, max_points + 1)
+            ).fetchone()[0]
+            aggregated = n_raw > max_points
+            level = max((w for w in self.stat_widths if w <= target_width), default=None) if aggregated else None
+            if level is not None:
+                label = f"Statistik {self.stat_labels[level]} → ±{format_duration(target_width)}"
+                width = target_width
+                rows = self._conn.execute(
+                    "SELECT (bucket - ?) / ? AS g, channel, SUM(n), TOTAL(n * mean), MIN(vmin), MAX(vmax) "
+                    "FROM sensor_stats WHERE width = ? AND pier = ? AND bucket BETWEEN ? AND ? "
+                    "GROUP BY g, channel ORDER BY g",
+                    (t0, width, level, pier_short_name, t0, t1)
+                ).fetchall()
+            else:
+                width = target_width if aggregated else 1
+                label = f"Bucket SQL ±{format_duration(width)}" if aggregated else "Data mentah"
+                rows = self._conn.execute(
+                    "SELECT (ts - ?) / ? AS bucket, channel, COUNT(value), TOTAL(value), MIN(value), MAX(value) "
+                    "FROM readings WHERE pier = ? AND ts BETWEEN ? AND ? GROUP BY bucket, channel ORDER BY bucket",
+                    (t0, width, pier_short_name, t0, t1)
+                ).fetchall()
+
+        sensors = registry.ids[logger["sensor_index"]].tolist()
+        if not rows:
+            buckets = np.array([], dtype=np.int64)
+            count = total = vmin = vmax = np.empty((0, len(sensors)))
+        else:
+            frame = pd.DataFrame(rows, columns=["bucket", "channel", "count", "total", "min", "max"])
+            buckets, bucket_pos = np.unique(frame["bucket"].to_numpy(dtype=np.int64), return_inverse=True)
+            channel_pos = {ch: j for j, ch in enumerate(logger["channels"])}
+            col = frame["channel"].map(channel_pos)
+            keep = col.notna().to_numpy()
+            bucket_pos, col = bucket_pos[keep], col[keep].to_numpy(dtype=np.int64)
+            shape = (len(buckets), len(sensors))
+            count, total = np.zeros(shape), np.zeros(shape)
+            vmin, vmax = np.full(shape, np.nan), np.full(shape, np.nan)
+            count[bucket_pos, col] = frame["count"].to_numpy()[keep]
+            total[bucket_pos, col] = frame["total"].to_numpy()[keep]
+            vmin[bucket_pos, col] = frame["min"].to_numpy(dtype=float)[keep]
+            vmax[bucket_pos, col] = frame["max"].to_numpy(dtype=float)[keep]
+
+        baseline = registry.baseline[logger["sensor_index"]]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count - baseline
+        return {
+            "level": label,
+            "sensors": sensors,
+            "time": (t0 + buckets * width).view('datetime64[ns]'),
+            "mean": mean,
+            "min": vmin - baseline,
+            "max": vmax - baseline,
+            "aggregated": aggregated
+        }
+
+    def sensor_stats(self, width, piers=None, start=None, end=None, registry=None):
+        """
+        Tabel statistik strain per bucket (kolom SENSOR_STATS_COLUMNS) dari sensor_stats, dengan baseline
+        registri dikurangkan (std tidak berubah). Biaya sebanding jumlah bucket yang dibaca, bukan jumlah
+        pembacaan mentah. Std adalah simpangan baku sampel (NaN untuk bucket dengan satu pembacaan).
+        """
+        registry = get_sensor_registry() if registry is None else registry
+        width = pd.Timedelta(width).value
+        t0 = np.iinfo(np.int64).min if start is None else pd.Timestamp(start).as_unit('ns').value
+        t1 = np.iinfo(np.int64).max if end is None else pd.Timestamp(end).as_unit('ns').value
+        codes = [code for code in registry.loggers if piers is None or code in piers]
+        if not codes:
+            return pd.DataFrame(columns=SENSOR_STATS_COLUMNS)
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT pier, bucket, channel, n, mean, m2, vmin, vmax FROM sensor_stats "
+                f"WHERE width = ? AND pier IN ({', '.join('?' * len(codes))}) AND bucket BETWEEN ? AND ?",
+                (width, *codes, t0, t1)
+            ).fetchall()
+        if not rows:
+            return pd.DataFrame(columns=SENSOR_STATS_COLUMNS)
+        pier, bucket, channel, n, mean, m2, vmin, vmax = (np.asarray(col) for col in zip(*rows))
+
+        # Kanal -> indeks sensor registri; urutan tampilan: pier (registri), waktu, urutan kanal
+        sensor_of = {
+            (code, ch): (i, j, int(registry.loggers[code]["sensor_index"][j]))
+            for i, code in enumerate(codes) for j, ch in enumerate(registry.loggers[code]["channels"])
+        }
+        mapped = [sensor_of.get(key) for key in zip(pier.tolist(), channel.tolist())]
+        keep = np.array([m is not None for m in mapped], dtype=bool)
+        if not keep.any():
+            return pd.DataFrame(columns=SENSOR_STATS_COLUMNS)
+        pier_order, channel_order, sensor_index = np.array([m for m in mapped if m is not None], dtype=np.int64).T
+        bucket = bucket[keep].astype(np.int64)
+        order = np.lexsort((channel_order, bucket, pier_order))
+
+        n = n[keep].astype(np.int64)[order]
+        sensor_index = sensor_index[order]
+        baseline = registry.baseline[sensor_index]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(np.clip(m2[keep].astype(float)[order], 0.0, None) / (n - 1))
+        std[n < 2] = np.nan
+        return pd.DataFrame({
+            "Waktu": bucket[order].view('datetime64[ns]'),
+            "Pier": pier[keep][order].astype(object),
+            "SG": registry.ids[sensor_index],
+            "Jumlah": n,
+            "Rata-rata (με)": mean[keep].astype(float)[order] - baseline,
+            "Std (με)": std,
+            "Min (με)": vmin[keep].astype(float)[order] - baseline,
+            "Max (με)": vmax[keep].astype(float)[order] - baseline,
+        }, columns=SENSOR_STATS_COLUMNS)
+
+class ActualStoreTrend:
+    """
+    Sumber tren dengan antarmuka sama seperti ActualTrendPyramid (piers, time_range, query),
+    tetapi agregasi dikerjakan SQL langsung dari store. trend: pengganti store.trend dengan signature
+    sama (mis. versi ber-cache per revisi store di halaman).
+    """
+
+    def __init__(self, store, registry=None, trend=None):
+        self.store = store
+        self.registry = get_sensor_registry() if registry is None else registry
+        self._trend = store.trend if trend is None else trend
+        self.piers = {
+            code: {"sensors": self.registry.sensor_ids(code)}
+            for code in store.piers() if code in self.registry.loggers
+        }
+
+    def time_range(self, pier_short_name):
+        return self.store.time_range(pier_short_name)
+
+    def query(self, pier_short_name, start, end, max_points=1000):
+        return self._trend(pier_short_name, start, end, max_points, self.registry)
+
+def actual_chunk_to_long(chunk):
+    """
+    Mengubah potongan DataFrame aktual (lebar: PIER, DATE, kanal...) menjadi array panjang
+    (pier, ts ns, channel, value) dengan satu elemen per pembacaan kanal.
+    """
+    channels = [c for c in chunk.columns if c not in ('PIER', 'DATE')]
+    k = len(channels)
+    return (
+        np.repeat(chunk['PIER'].astype(str).to_numpy(dtype=object), k),
+        np.repeat(chunk['DATE'].to_numpy(dtype='datetime64[ns]').view('int64'), k),
+        np.tile(np.asarray(channels, dtype=object), len(chunk)),
+        chunk[channels].to_numpy(dtype='float64').ravel()
+    )
+
+def long_to_rows(piers, ts, channels, values):
+    """
+    Baris (pier, ts, channel, value) untuk tabel readings; nilai NaN disimpan sebagai NULL.
+    """
+    values = np.where(np.isnan(values), None, values).astype(object)
+    return zip(piers.tolist(), ts.tolist(), channels.tolist(), values.tolist())
+
+def bucket_statistics(piers, ts, channels, values, width):
+    """
+    Statistik per (pier, bucket, kanal) dari array panjang: jumlah, rata-rata, M2 (jumlah kuadrat
+    simpangan terhadap rata-rata), min, dan max dalam float64; NaN diabaikan. Hasil berupa baris
+    (width, pier, bucket, channel, n, mean, m2, vmin, vmax) untuk STATS_MERGE_SQL.
+    """
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return []
+    frame = pd.DataFrame({
+        "pier": piers[valid], "bucket": ts[valid] // width * width,
+        "channel": channels[valid], "value": values[valid]
+    })
+    grouped = frame.groupby(["pier", "bucket", "channel"], sort=False)["value"]
+    stats = grouped.agg(["count", "mean", "min", "max"])
+    stats["m2"] = grouped.var(ddof=0) * stats["count"]
+    stats = stats.reset_index()
+    return zip(
+        [width] * len(stats), stats["pier"].tolist(), stats["bucket"].tolist(), stats["channel"].tolist(),
+        stats["count"].tolist(), stats["mean"].tolist(), stats["m2"].tolist(),
+        stats["min"].tolist(), stats["max"].tolist()
+    )
@@ -0,0 +1,26 @@
+"""
+Fixture bersama unit test: registri sensor kecil (satu pier, dua kanal) dan penulis CSV aktual.
+"""
+import pytest
+
+from shms.config import ACTUAL_DATE_FORMAT
+from shms.registry import SensorRegistry
+
+@pytest.fixture
+def registry():
+    elements = {"Pier Uji": {"type": "pier", "logger": "PX", "part_id": "I[1]", "length": 5000, "width": 2000}}
+    sensors = [
+        {"id": "SG-A", "element": "Pier Uji", "channel": "SGA", "x": 0, "y": 0, "baseline": 100.0},
+        {"id": "SG-B", "element": "Pier Uji", "channel": "SGB", "x": 1000, "y": 0, "baseline": 200.0},
+    ]
+    return SensorRegistry(elements, sensors, key=("uji", 1))
+
+@pytest.fixture
+def write_actual_csv():
+    """
+    Penulis DataFrame (PIER, DATE, kanal...) ke CSV dengan format tanggal data aktual; mode "a" tanpa header.
+    """
+    def write(path, frame, mode="w"):
+        out = frame.assign(DATE=frame["DATE"].dt.strftime(ACTUAL_DATE_FORMAT))
+        out.to_csv(path, index=False, mode=mode, header=(mode == "w"))
+    return write
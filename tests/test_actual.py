@@ -0,0 +1,171 @@
+"""
+Unit test data aktual: pembaca CSV inkremental (append, baris parsial, tulis ulang), lookup as-of
+ActualStrainIndex, dan agregat tren bertingkat.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shms.actual import ActualStrainIndex, ActualTrendPyramid, IncrementalCsvReader, get_actual_values_by_date
+
+def make_readings(start, periods, offset=0.0):
+    return pd.DataFrame({
+        "PIER": "PX",
+        "DATE": pd.date_range(start, periods=periods, freq="10min"),
+        "SGA": 100.0 + offset + np.arange(periods),
+        "SGB": 200.0 + offset + np.arange(periods),
+    })
+
+def touch(path):
+    """
+    Memajukan mtime agar tulis ulang dengan ukuran sama tetap terlihat sebagai perubahan.
+    """
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+@pytest.fixture
+def csv_path(tmp_path):
+    return str(tmp_path / "aktual.csv")
+
+def test_append_reads_only_new_complete_rows(csv_path, write_actual_csv):
+    first = make_readings("2026-01-01", 5)
+    write_actual_csv(csv_path, first)
+    reader = IncrementalCsvReader(csv_path)
+    assert reader.refresh()
+    assert len(reader.frame()) == 5 and reader.version == 1
+    assert not reader.refresh()
+
+    # Baris terakhir belum lengkap (tanpa newline): ditunda sampai baris selesai ditulis
+    with open(csv_path, "a") as f:
+        f.write("PX,01/01/2026 00:50,105,205\nPX,01/01/2026 01:00,1")
+    assert reader.refresh()
+    assert len(reader.frame()) == 6
+    with open(csv_path, "a") as f:
+        f.write("06,206\n")
+    assert reader.refresh()
+
+    df = reader.frame()
+    assert len(df) == 7 and reader.version == 3 and reader.full_reloads == 0
+    np.testing.assert_array_equal(df["SGA"], 100.0 + np.arange(7))
+    assert reader.last_timestamp == pd.Timestamp("2026-01-01 01:00")
+
+def test_rewrite_counts_every_full_reload(csv_path, write_actual_csv):
+    write_actual_csv(csv_path, make_readings("2026-01-01", 6))
+    reader = IncrementalCsvReader(csv_path)
+    reader.refresh()
+    versions = [reader.version]
+
+    # Tulis ulang pertama: lebih pendek (terpotong)
+    write_actual_csv(csv_path, make_readings("2026-02-01", 3, offset=50))
+    touch(csv_path)
+    assert reader.refresh()
+    assert reader.full_reloads == 1
+    versions.append(reader.version)
+    np.testing.assert_array_equal(reader.frame()["SGA"], [150.0, 151.0, 152.0])
+
+    # Tulis ulang kedua: ukuran sama, isi berbeda -> tetap reload penuh, penghitung terus bertambah
+    write_actual_csv(csv_path, make_readings("2026-03-01", 3, offset=70))
+    touch(csv_path)
+    assert reader.refresh()
+    assert reader.full_reloads == 2
+    versions.append(reader.version)
+    np.testing.assert_array_equal(reader.frame()["SGA"], [170.0, 171.0, 172.0])
+    assert reader.last_timestamp == pd.Timestamp("2026-03-01 00:20")
+
+    # Tulis ulang ketiga: lebih panjang dari isi sebelumnya
+    write_actual_csv(csv_path, make_readings("2026-04-01", 8, offset=90))
+    touch(csv_path)
+    assert reader.refresh()
+    assert reader.full_reloads == 3
+    versions.append(reader.version)
+    assert len(reader.frame()) == 8
+    assert versions == sorted(set(versions))
+
+@pytest.fixture
+def index(registry):
+    df = pd.DataFrame({
+        "PIER": ["PX", "PX", "PX", "PY"],
+        "DATE": pd.to_datetime(["2026-01-01 00:20", "2026-01-01 00:00", "2026-01-01 01:00", "2026-01-01 00:00"]),
+        "SGA": [110.0, 105.0, np.nan, 1.0],
+        "SGB": [220.0, 210.0, 230.0, 2.0],
+    })
+    return ActualStrainIndex.from_frame(df, registry)
+
+def test_from_frame_sorts_and_subtracts_baseline(index):
+    data = index.piers["PX"]
+    assert list(index.piers) == ["PX"]
+    assert data["sensors"] == ["SG-A", "SG-B"]
+    np.testing.assert_array_equal(data["timestamps"], pd.to_datetime(
+        ["2026-01-01 00:00", "2026-01-01 00:20", "2026-01-01 01:00"]).as_unit("ns").asi8)
+    np.testing.assert_array_equal(data["strain"], [[5.0, 10.0], [10.0, 20.0], [np.nan, 30.0]])
+    assert index.timestamps_desc[0] == pd.Timestamp("2026-01-01 01:00")
+
+@pytest.mark.parametrize("selected, tolerance, expected", [
+    ("2026-01-01 00:20", None, "2026-01-01 00:20"),
+    ("2026-01-01 00:20", pd.Timedelta(0), "2026-01-01 00:20"),
+    ("2026-01-01 00:50", pd.Timedelta(minutes=30), "2026-01-01 00:20"),
+    ("2026-01-01 00:51", pd.Timedelta(minutes=30), None),
+    ("2026-01-01 05:00", None, "2026-01-01 01:00"),
+    ("2025-12-31 23:59", None, None),
+])
+def test_lookup_as_of_tolerance(index, selected, tolerance, expected):
+    found = index.lookup("PX", pd.Timestamp(selected), tolerance)
+    if expected is None:
+        assert found is None
+    else:
+        ts, row = found
+        assert ts == pd.Timestamp(expected)
+        assert index.piers["PX"]["timestamps"][row] == ts.value
+
+def test_lookup_unknown_pier(index):
+    assert index.lookup("PY", pd.Timestamp("2026-01-01 00:00")) is None
+
+def test_values_by_date_skips_missing_sensors(index):
+    ts, values = get_actual_values_by_date(index, "PX", pd.Timestamp("2026-01-01 01:10"))
+    assert ts == pd.Timestamp("2026-01-01 01:00")
+    assert values == {"SG-B": 30.0}
+
+# ------------------------------------------
+# ActualTrendPyramid
+# ------------------------------------------
+
+@pytest.fixture
+def dense_index(registry):
+    rng = np.random.default_rng(5)
+    dates = pd.date_range("2026-01-01", periods=20_000, freq="5min")
+    df = pd.DataFrame({"PIER": "PX", "DATE": dates,
+                       "SGA": 100 + rng.normal(0, 10, len(dates)), "SGB": 200 + rng.normal(0, 10, len(dates))})
+    df.loc[100:110, "SGB"] = np.nan
+    return ActualStrainIndex.from_frame(df, registry)
+
+@pytest.mark.parametrize("max_points", [7, 100, 1000, 3000])
+@pytest.mark.parametrize("hours", [24, 24 * 10, 24 * 69])
+def test_pyramid_query_respects_max_points(dense_index, max_points, hours):
+    pyramid = ActualTrendPyramid.from_index(dense_index)
+    start = pd.Timestamp("2026-01-01")
+    series = pyramid.query("PX", start, start + pd.Timedelta(hours=hours), max_points=max_points)
+    assert 0 < len(series["time"]) <= max_points
+
+def test_pyramid_query_exact_multiple_span(dense_index):
+    # Rentang kelipatan tepat max_points × lebar level: titik di ujung t1 tidak menambah bucket ekstra
+    pyramid = ActualTrendPyramid.from_index(dense_index)
+    start = pd.Timestamp("2026-01-01")
+    series = pyramid.query("PX", start, start + pd.Timedelta(minutes=5 * 3000), max_points=1000)
+    assert len(series["time"]) <= 1000
+
+def test_pyramid_raw_when_it_fits_and_aggregates_match(dense_index):
+    pyramid = ActualTrendPyramid.from_index(dense_index)
+    data = dense_index.piers["PX"]
+    start, end = pd.Timestamp("2026-01-01"), pd.Timestamp("2026-01-01 23:55")
+    raw = pyramid.query("PX", start, end, max_points=1000)
+    assert not raw["aggregated"] and len(raw["time"]) == 288
+    np.testing.assert_array_equal(raw["mean"], data["strain"][:288])
+
+    daily = pyramid.query("PX", start, start + pd.Timedelta(days=60) - pd.Timedelta(minutes=1), max_points=60)
+    assert daily["aggregated"]
+    day = data["strain"][:288]
+    np.testing.assert_allclose(daily["mean"][0], np.nanmean(day, axis=0))
+    np.testing.assert_allclose(daily["min"][0], np.nanmin(day, axis=0))
+    np.testing.assert_allclose(daily["max"][0], np.nanmax(day, axis=0))
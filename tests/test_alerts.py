@@ -0,0 +1,140 @@
+"""
+Unit test SensorAlertEngine atas IncrementalCsvReader sungguhan: pemrosesan bertahap (per potongan
+baris baru) harus identik dengan satu pass, dan file yang ditulis ulang memulai statistik dari awal.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shms.actual import IncrementalCsvReader
+from shms.alerts import SensorAlertEngine
+
+def make_readings(n=300, seed=1, start="2026-01-01"):
+    """
+    Pembacaan logger PX tiap 20 menit dengan lonjakan, perubahan cepat, dan NaN.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=n, freq="20min")
+    sga = np.round(100 + np.cumsum(rng.normal(0, 1, n)), 2)
+    sgb = np.round(200 + 60 + rng.normal(0, 2, n), 2)
+    sga[[n // 6, n * 3 // 5]] += 150
+    sgb[n * 2 // 5:] += 250
+    sgb[[n // 30, n // 30 + 1, n * 2 // 3]] = np.nan
+    return pd.DataFrame({"PIER": "PX", "DATE": dates, "SGA": sga, "SGB": sgb})
+
+def rewrite(path, frame, write_actual_csv):
+    """
+    Menulis ulang file di tempat (inode sama) dan memajukan mtime agar ukuran sama tetap terdeteksi.
+    """
+    write_actual_csv(path, frame)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+@pytest.fixture
+def engine_factory(registry):
+    stage_index_by_name = {"S1": 0, "S2": 1}
+    theory_table = {"SG-A": np.array([0.0, 10.0]), "SG-B": np.array([60.0, 60.0])}
+    schedule_key = (
+        ("S1", pd.Timestamp("2026-01-01 12:00").value),
+        ("S2", pd.Timestamp("2026-01-03 00:00").value),
+    )
+    return lambda: SensorAlertEngine(theory_table, stage_index_by_name, schedule_key, registry=registry)
+
+@pytest.fixture
+def csv_path(tmp_path):
+    return str(tmp_path / "aktual.csv")
+
+def one_pass(engine_factory, csv_path):
+    """
+    Engine baru yang memproses seluruh isi file saat ini dalam satu update.
+    """
+    reader = IncrementalCsvReader(csv_path)
+    reader.refresh()
+    engine = engine_factory()
+    engine.update(reader)
+    return engine
+
+def assert_same_state(a, b):
+    assert a.count.tolist() == b.count.tolist()
+    for x, y in [(a.mean, b.mean), (a.var, b.var), (a.last_value, b.last_value)]:
+        np.testing.assert_allclose(x, y, rtol=1e-12)
+    assert a.deviating.tolist() == b.deviating.tolist()
+    assert a.alert_counts == b.alert_counts
+    pd.testing.assert_frame_equal(a.alert_table(), b.alert_table())
+
+@pytest.mark.parametrize("chunk", [1, 7, 64])
+def test_incremental_matches_single_pass(engine_factory, csv_path, write_actual_csv, chunk):
+    df = make_readings()
+    write_actual_csv(csv_path, df.iloc[:0])
+    reader = IncrementalCsvReader(csv_path)
+    incremental = engine_factory()
+    new_alerts = 0
+    for r0 in range(0, len(df), chunk):
+        write_actual_csv(csv_path, df.iloc[r0:r0 + chunk], mode="a")
+        reader.refresh()
+        new_alerts += incremental.update(reader)
+    assert incremental.update(reader) == 0
+
+    single = one_pass(engine_factory, csv_path)
+    assert set(single.alert_counts) == {
+        "Lonjakan (z-score)", "Laju perubahan (με/jam)", "Deviasi dari teoritis (με)"
+    }
+    assert new_alerts == sum(single.alert_counts.values())
+    assert_same_state(incremental, single)
+
+def test_every_rewrite_restarts_statistics(engine_factory, csv_path, write_actual_csv):
+    write_actual_csv(csv_path, make_readings(seed=1))
+    reader = IncrementalCsvReader(csv_path)
+    reader.refresh()
+    engine = engine_factory()
+    engine.update(reader)
+
+    # Tulis ulang pertama (lebih pendek), lalu kedua (lebih panjang dari isi sebelumnya): keduanya
+    # harus memulai statistik dari awal, bukan hanya memproses "ekor" baru
+    for frame in (make_readings(n=150, seed=2), make_readings(n=250, seed=3, start="2026-02-01")):
+        rewrite(csv_path, frame, write_actual_csv)
+        reader.refresh()
+        engine.update(reader)
+        assert engine.count.max() == len(frame)
+        assert_same_state(engine, one_pass(engine_factory, csv_path))
+
+def test_constant_rewrite_mean(engine_factory, csv_path, write_actual_csv):
+    frame = make_readings(n=6)
+    write_actual_csv(csv_path, frame)
+    reader = IncrementalCsvReader(csv_path)
+    reader.refresh()
+    engine = engine_factory()
+    engine.update(reader)
+
+    for value in (2.0, 3.0):
+        rewrite(csv_path, frame.assign(SGA=100.0 + value, SGB=200.0 + value), write_actual_csv)
+        reader.refresh()
+        engine.update(reader)
+        assert engine.count.tolist() == [6, 6]
+        np.testing.assert_allclose(engine.mean, [value, value])
+
+def test_new_reader_restarts_statistics(engine_factory, csv_path, write_actual_csv):
+    write_actual_csv(csv_path, make_readings(n=100, seed=1))
+    reader = IncrementalCsvReader(csv_path)
+    reader.refresh()
+    engine = engine_factory()
+    engine.update(reader)
+
+    # Reader pengganti (mis. cache resource dibersihkan) dengan isi lebih panjang
+    rewrite(csv_path, make_readings(n=200, seed=4), write_actual_csv)
+    other = IncrementalCsvReader(csv_path)
+    other.refresh()
+    engine.update(other)
+    assert_same_state(engine, one_pass(engine_factory, csv_path))
+
+def test_deviation_uses_scheduled_stage(engine_factory, csv_path, write_actual_csv):
+    write_actual_csv(csv_path, make_readings())
+    engine = one_pass(engine_factory, csv_path)
+
+    table = engine.alert_table()
+    deviation = table[table["Jenis"] == "Deviasi dari teoritis (με)"]
+    # Pembacaan sebelum jadwal pertama tidak diperiksa deviasinya
+    assert (deviation["Waktu"] >= pd.Timestamp("2026-01-01 12:00")).all()
+    assert "SG-B" in engine.active_deviations()
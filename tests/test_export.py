@@ -0,0 +1,133 @@
+"""
+Unit test ekspor: tabel panjang dari indeks aktual (filter, potongan, slot interpolasi), penulisan
+streaming CSV/gzip/Parquet, dan cache artefak di disk yang dikunci oleh input ekspor.
+"""
+import gzip
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shms.actual import ActualStrainIndex
+from shms.export import (
+    get_export_artifact, get_export_file_name, iter_frame_chunks, iter_strain_index_chunks, strain_index_rows,
+    write_export_file
+)
+from shms.quality import FLAG_INTERPOLATED, clean_strain_index
+
+@pytest.fixture
+def raw_index(registry):
+    dates = pd.date_range("2026-01-01", periods=10, freq="10min")
+    df = pd.DataFrame({"PIER": "PX", "DATE": dates, "SGA": 100.0 + np.arange(10), "SGB": 200.0 + np.arange(10)})
+    # Satu pembacaan hilang: slot 00:40 diisi interpolasi pada indeks bersih
+    return ActualStrainIndex.from_frame(df.drop(index=4), registry)
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    path = str(tmp_path / "exports")
+    monkeypatch.setattr("shms.export.EXPORT_CACHE_DIR", path)
+    return path
+
+def test_rows_long_format(raw_index):
+    df = strain_index_rows(raw_index, "PX", 0, 3, [0, 1])
+    assert df.columns.tolist() == ["Waktu", "Pier", "SG", "Raw", "Strain (με)"]
+    assert df["SG"].tolist() == ["SG-A", "SG-B"] * 3
+    assert df["Strain (με)"].tolist() == [0.0, 0.0, 1.0, 1.0, 2.0, 2.0]
+    assert df["Waktu"].iloc[2] == pd.Timestamp("2026-01-01 00:10")
+
+def test_clean_index_drops_interpolated_by_default(raw_index):
+    clean = clean_strain_index(raw_index)
+    interpolated = pd.Timestamp("2026-01-01 00:40")
+    assert (clean.piers["PX"]["flags"][4] & FLAG_INTERPOLATED).all()
+
+    measured = pd.concat(iter_strain_index_chunks(clean))
+    assert "Kualitas" in measured.columns
+    assert len(measured) == 18 and interpolated not in set(measured["Waktu"])
+
+    full = pd.concat(iter_strain_index_chunks(clean, include_interpolated=True))
+    row = full[(full["Waktu"] == interpolated) & (full["SG"] == "SG-A")].iloc[0]
+    assert len(full) == 20 and row["Strain (με)"] == 4.0 and row["Kualitas"] == "interpolasi"
+
+def test_chunks_filter_and_size(raw_index):
+    chunks = list(iter_strain_index_chunks(raw_index, sensors={"SG-B"}, start="2026-01-01 00:10",
+                                           end="2026-01-01 01:00", chunk_rows=3))
+    assert [len(c) for c in chunks] == [3, 2]
+    df = pd.concat(chunks)
+    assert set(df["SG"]) == {"SG-B"}
+    assert df["Waktu"].min() == pd.Timestamp("2026-01-01 00:10")
+    assert df["Waktu"].max() == pd.Timestamp("2026-01-01 01:00")
+    assert df["Waktu"].is_monotonic_increasing
+
+    # Potongan berisi paling banyak chunk_rows baris untuk semua sensor
+    assert max(len(c) for c in iter_strain_index_chunks(raw_index, chunk_rows=4)) <= 4
+    assert list(iter_strain_index_chunks(raw_index, piers={"PY"})) == []
+    assert list(iter_strain_index_chunks(raw_index, sensors={"SG-Z"})) == []
+
+def test_frame_chunks_are_views():
+    df = pd.DataFrame({"a": np.arange(10)})
+    chunks = list(iter_frame_chunks(df, chunk_rows=4))
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    pd.testing.assert_frame_equal(pd.concat(chunks), df)
+
+@pytest.mark.parametrize("fmt, compress", [("csv", False), ("csv", True), ("parquet", False), ("parquet", True)])
+def test_write_export_file_roundtrip(tmp_path, fmt, compress):
+    df = pd.DataFrame({"Waktu": pd.date_range("2026-01-01", periods=7, freq="h"), "Nilai": np.arange(7.0)})
+    path = str(tmp_path / get_export_file_name("uji", fmt, compress))
+    assert write_export_file(iter_frame_chunks(df, chunk_rows=3), path, fmt, compress)
+
+    if fmt == "parquet":
+        loaded = pd.read_parquet(path)
+    else:
+        with (gzip.open if compress else open)(path, "rt") as f:
+            loaded = pd.read_csv(f, parse_dates=["Waktu"])
+    pd.testing.assert_frame_equal(loaded, df, check_dtype=False)
+
+def test_write_export_file_empty(tmp_path):
+    assert not write_export_file(iter([]), str(tmp_path / "kosong.parquet"), "parquet", False)
+    assert not write_export_file(iter([]), str(tmp_path / "kosong.csv"), "csv", False)
+
+def test_artifact_cached_by_key(export_dir):
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    calls = []
+
+    def make_chunks():
+        calls.append(1)
+        return iter_frame_chunks(df)
+
+    path = get_export_artifact(["aktual", ["PX"], 1], make_chunks, "csv", False)
+    assert path.startswith(export_dir) and os.path.exists(path)
+    assert get_export_artifact(["aktual", ["PX"], 1], make_chunks, "csv", False) == path
+    assert len(calls) == 1
+
+    # Kunci, format, atau kompresi berbeda: artefak baru
+    other_paths = {
+        get_export_artifact(["aktual", ["PX"], 2], make_chunks, "csv", False),
+        get_export_artifact(["aktual", ["PX"], 1], make_chunks, "csv", True),
+        get_export_artifact(["aktual", ["PX"], 1], make_chunks, "parquet", False),
+    }
+    assert len(other_paths) == 3 and path not in other_paths
+    assert len(calls) == 4
+    assert not any(name.endswith(".tmp") for name in os.listdir(export_dir))
+
+def test_artifact_key_includes_schema_version(export_dir, monkeypatch):
+    def make_chunks():
+        return iter_frame_chunks(pd.DataFrame({"a": [1]}))
+    path = get_export_artifact(["aktual"], make_chunks, "csv", False)
+    monkeypatch.setattr("shms.export.EXPORT_SCHEMA_VERSION", -1)
+    assert get_export_artifact(["aktual"], make_chunks, "csv", False) != path
+
+def test_empty_artifact_returns_none(export_dir):
+    assert get_export_artifact(["kosong"], lambda: iter([]), "csv", False) is None
+    assert os.listdir(export_dir) == []
+
+def test_artifact_cache_keeps_latest_files(export_dir, monkeypatch):
+    monkeypatch.setattr("shms.export.EXPORT_CACHE_MAX_FILES", 2)
+    for i in range(4):
+        path = get_export_artifact(["aktual", i], lambda: iter_frame_chunks(pd.DataFrame({"a": [i]})),
+                                   "csv", False)
+        # mtime lama yang berurutan: artefak yang baru ditulis selalu paling baru
+        os.utime(path, (10 ** 9 + i, 10 ** 9 + i))
+        kept = path
+    assert len(os.listdir(export_dir)) == 2
+    assert os.path.exists(kept)
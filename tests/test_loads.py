@@ -0,0 +1,51 @@
+"""
+Unit test LoadCaseStore: indeks padat (stage, part, kolom) atas data_gaya.csv.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from shms.config import LOAD_CASE_COLUMNS
+from shms.loads import LoadCaseStore, build_load_matrix
+
+def load_frame(rows):
+    """
+    DataFrame gaya dari baris (stage, part, axial, my, mz); kolom gaya lain diisi nol.
+    """
+    df = pd.DataFrame(rows, columns=["Stage", "Part", "Axial (kN)", "Moment-y (kN·m)", "Moment-z (kN·m)"])
+    for column in LOAD_CASE_COLUMNS:
+        if column not in df:
+            df[column] = 0.0
+    return df
+
+@pytest.fixture
+def store():
+    return LoadCaseStore.from_dataframe(load_frame([
+        ("S2", "I[2]", -10.0, 1.0, 2.0),
+        ("S1", "I[1]", -20.0, 3.0, 4.0),
+        ("S1", "I[2]", -30.0, 5.0, 6.0),
+        ("S2", "I[2]", -99.0, 9.0, 9.0),
+    ]))
+
+def test_order_follows_first_appearance(store):
+    assert store.stages == ["S2", "S1"]
+    assert store.parts == ["I[2]", "I[1]"]
+    assert store.values.shape == (2, 2, len(LOAD_CASE_COLUMNS))
+
+def test_get_keeps_first_duplicate_and_missing_is_none(store):
+    row = store.get("S2", "I[2]")
+    assert row["Stage"] == "S2" and row["Part"] == "I[2]"
+    assert row["Axial (kN)"] == -10.0
+    assert store.get("S2", "I[1]") is None
+    assert store.get("S9", "I[1]") is None
+    assert store.get("S1", "I[9]") is None
+
+def test_column_spans_all_stages(store):
+    np.testing.assert_array_equal(store.column("I[2]", "Axial (kN)"), [-10.0, -30.0])
+    axial = store.column("I[1]", "Axial (kN)")
+    assert np.isnan(axial[0]) and axial[1] == -20.0
+
+def test_load_matrix_units(store):
+    # Kolom [n (N), mxx = Mz (Nmm), myy = My (Nmm)]
+    np.testing.assert_array_equal(store.load_matrix("I[2]"), [[-10e3, 2e6, 1e6], [-30e3, 6e6, 5e6]])
+    np.testing.assert_array_equal(build_load_matrix([1.0], [2.0], [3.0]), [[1e3, 3e6, 2e6]])
@@ -0,0 +1,77 @@
+"""
+Unit test playback stage: kuantisasi grid ke kode uint8 dan frame animasi yang dibangun sekali.
+"""
+import numpy as np
+import pytest
+
+from shms.plots import create_stage_playback_plot, quantize_stage_grids
+from shms.section import MeshGridInterpolator
+
+LEVELS = 255
+
+def test_quantize_shared_range_and_error_bound():
+    rng = np.random.default_rng(3)
+    grids = rng.normal(0, 5, (4, 6, 7))
+    grids[1] += 20
+    grids[:, 0, 0] = np.nan
+
+    codes, lo, hi = quantize_stage_grids(grids, LEVELS)
+    assert codes.dtype == np.uint8 and codes.shape == grids.shape
+    # Satu rentang untuk semua stage: kode 0 dan levels-1 tepat di minimum/maksimum global
+    assert lo == np.nanmin(grids) and hi == np.nanmax(grids)
+    finite = np.isfinite(grids)
+    assert codes[finite].min() == 0 and codes[finite].max() == LEVELS - 1
+    assert (codes[~finite] == LEVELS).all()
+
+    step = (hi - lo) / (LEVELS - 1)
+    decoded = lo + codes[finite] * step
+    assert np.abs(decoded - grids[finite]).max() <= step / 2 + 1e-12
+
+@pytest.mark.parametrize("value", [3.5, np.nan])
+def test_quantize_constant_or_empty(value):
+    grids = np.full((2, 3, 3), value)
+    codes, lo, hi = quantize_stage_grids(grids, LEVELS)
+    expected = 0 if np.isfinite(value) else LEVELS
+    assert (codes == expected).all()
+    assert lo == hi == (value if np.isfinite(value) else 0.0)
+
+@pytest.fixture
+def mesh_interp():
+    rng = np.random.default_rng(7)
+    corners = np.array([[0, 0], [10, 0], [10, 4], [0, 4]], dtype=float)
+    nodes = np.vstack([corners, rng.uniform([0, 0], [10, 4], (30, 2))])
+    from scipy.spatial import Delaunay
+    return MeshGridInterpolator(nodes, Delaunay(nodes).simplices, resolution=12)
+
+def test_playback_skips_unloaded_stages(mesh_interp):
+    stages = ["S1", "S2", "S3", "S4"]
+    grids = np.stack([np.full((12, 12), float(i)) for i in range(4)])
+    strain_gauges = {"SG-1": (1.0, 1.0), "SG-2": (9.0, 3.0)}
+    sg_values = np.array([[1.0, 2.0], [np.nan, np.nan], [3.0, 4.0], [5.0, 6.0]])
+
+    # Stage aktif tanpa beban: mulai dari stage ber-beban berikutnya
+    fig = create_stage_playback_plot(mesh_interp, stages, grids, strain_gauges, sg_values, "σzz", "MPa", "Uji",
+                                     active=1, levels=LEVELS)
+    steps = fig.layout.sliders[0].steps
+    assert [step.label for step in steps] == ["S1", "S3", "S4"]
+    assert fig.layout.sliders[0].active == 1
+    assert len(fig.frames) == 3
+
+    # Kode frame dari rentang bersama stage ber-beban (0..3): S3 = 2 -> kode 2/3 × (levels - 1)
+    z = np.asarray(fig.frames[1].data[0].z)
+    assert z.dtype == np.uint8 and (z == round(2 / 3 * (LEVELS - 1))).all()
+    np.testing.assert_array_equal(np.asarray(fig.data[0].z), z)
+    assert fig.frames[2].data[1].text[1] == "SG-2<br>6.00"
+
+    # Tick colorbar menunjuk kode yang sesuai nilai asli
+    colorbar = fig.data[0].colorbar
+    assert colorbar.ticktext[0] == "0.00" and colorbar.ticktext[-1] == "3.00"
+    assert colorbar.tickvals[-1] == pytest.approx(LEVELS - 1)
+
+def test_playback_stride_and_no_loaded_stage(mesh_interp):
+    grids = np.zeros((2, 6, 6))
+    fig = create_stage_playback_plot(mesh_interp, ["S1", "S2"], grids, {"SG-1": (1.0, 1.0)}, [[1.0], [2.0]],
+                                     "σzz", "MPa", "Uji", stride=2, levels=LEVELS)
+    assert len(fig.data[0].x) == len(mesh_interp.grid_x[::2])
+    assert create_stage_playback_plot(mesh_interp, ["S1"], grids[:1], {"SG-1": (1.0, 1.0)}, [[np.nan]],
+                                      "σzz", "MPa", "Uji") is None
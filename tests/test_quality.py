@@ -0,0 +1,276 @@
+"""
+Unit test pipeline kualitas data aktual: deteksi lonjakan, kanal macet, estimasi interval, grid per pier,
+pembaruan inkremental (harus identik dengan pembersihan penuh), dan lookup nilai bersih kolom aktual.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from shms.actual import ActualStrainIndex, IncrementalCsvReader
+from shms.quality import (
+    FLAG_DUPLICATE, FLAG_GAP, FLAG_INTERPOLATED, FLAG_SPIKE, FLAG_STUCK, IncrementalCleanIndex,
+    append_pier_readings, clean_pier_readings, clean_strain_index, detect_spikes, detect_stuck, estimate_interval,
+    get_clean_values_at
+)
+
+MINUTE = pd.Timedelta(minutes=1).value
+
+def noisy_series(n=60, seed=0):
+    """
+    Satu kanal dengan derau kecil (±5 με) di sekitar 1000 με.
+    """
+    rng = np.random.default_rng(seed)
+    return (1000 + rng.integers(-5, 6, n)).astype(float)[:, None]
+
+# ------------------------------------------
+# detect_spikes
+# ------------------------------------------
+
+def test_spike_single_reading():
+    values = noisy_series()
+    values[30, 0] += 300
+    spike = detect_spikes(values)
+    assert np.flatnonzero(spike[:, 0]).tolist() == [30]
+
+def test_spike_consecutive_up_to_half_window():
+    values = noisy_series()
+    values[20:24, 0] += 300
+    spike = detect_spikes(values, window=9)
+    assert np.flatnonzero(spike[:, 0]).tolist() == [20, 21, 22, 23]
+
+def test_step_change_is_not_spike():
+    values = noisy_series()
+    values[30:, 0] += 300
+    assert not detect_spikes(values).any()
+
+def test_spike_below_min_dev_ignored():
+    # Kanal tenang (MAD 0): deviasi di bawah min_dev bukan lonjakan meskipun z-score tak hingga
+    values = np.full((40, 1), 1000.0)
+    values[10, 0] += 40
+    values[25, 0] += 60
+    spike = detect_spikes(values, min_dev=50)
+    assert np.flatnonzero(spike[:, 0]).tolist() == [25]
+
+def test_spike_ignores_nan_neighbours():
+    values = noisy_series()
+    values[[27, 28, 32], 0] = np.nan
+    values[30, 0] += 300
+    spike = detect_spikes(values)
+    assert np.flatnonzero(spike[:, 0]).tolist() == [30]
+
+def test_spike_at_series_edges():
+    values = noisy_series()
+    values[0, 0] += 300
+    values[-1, 0] -= 300
+    spike = detect_spikes(values)
+    assert np.flatnonzero(spike[:, 0]).tolist() == [0, len(values) - 1]
+
+def test_spike_all_nan_and_channels_independent():
+    values = np.hstack([np.full((20, 1), np.nan), noisy_series(20)])
+    values[5, 1] += 300
+    spike = detect_spikes(values)
+    assert not spike[:, 0].any()
+    assert np.flatnonzero(spike[:, 1]).tolist() == [5]
+
+# ------------------------------------------
+# detect_stuck
+# ------------------------------------------
+
+def stuck_inputs(values, step_minutes=60):
+    values = np.asarray(values, dtype=float).reshape(len(values), -1)
+    ts = np.arange(len(values), dtype=np.int64) * step_minutes * MINUTE
+    return ts, values, np.r_[True, np.zeros(len(values) - 1, dtype=bool)]
+
+def test_stuck_run_reaching_min_duration():
+    ts, values, segment_start = stuck_inputs([1, 2] + [5] * 25 + [6, 7])
+    stuck = detect_stuck(ts, values, segment_start, pd.Timedelta(hours=24))
+    assert np.flatnonzero(stuck[:, 0]).tolist() == list(range(2, 27))
+
+def test_stuck_run_shorter_than_min_duration():
+    ts, values, segment_start = stuck_inputs([1] + [5] * 24 + [6])
+    assert not detect_stuck(ts, values, segment_start, pd.Timedelta(hours=24)).any()
+
+def test_stuck_run_broken_by_gap():
+    ts, values, segment_start = stuck_inputs([5] * 30)
+    segment_start[15] = True
+    assert not detect_stuck(ts, values, segment_start, pd.Timedelta(hours=24)).any()
+
+def test_stuck_ignores_nan_runs():
+    ts, values, segment_start = stuck_inputs([np.nan] * 30)
+    assert not detect_stuck(ts, values, segment_start, pd.Timedelta(hours=24)).any()
+
+def test_stuck_per_channel():
+    ts, values, segment_start = stuck_inputs(np.column_stack([np.full(30, 5.0), np.arange(30.0)]))
+    stuck = detect_stuck(ts, values, segment_start, pd.Timedelta(hours=24))
+    assert stuck[:, 0].all()
+    assert not stuck[:, 1].any()
+
+# ------------------------------------------
+# estimate_interval & clean_pier_readings
+# ------------------------------------------
+
+@pytest.mark.parametrize("spacing, expected", [
+    ([20] * 10 + [10, 60], 20),
+    ([19, 21, 22, 18, 20], 20),
+    ([2, 2, 3], 5),
+])
+def test_estimate_interval(spacing, expected):
+    ts = np.r_[0, np.cumsum(spacing)].astype(np.int64) * MINUTE
+    assert estimate_interval(ts, pd.Timedelta(minutes=5)) == expected * MINUTE
+
+def test_estimate_interval_ignores_duplicates():
+    ts = np.array([0, 0, 0, 10, 10, 20, 30], dtype=np.int64) * MINUTE
+    assert estimate_interval(ts, pd.Timedelta(minutes=5)) == 10 * MINUTE
+    assert estimate_interval(np.array([0, 0], dtype=np.int64), pd.Timedelta(minutes=5)) == 5 * MINUTE
+
+def test_clean_keeps_last_duplicate_and_interpolates_short_gaps():
+    minutes = np.array([0, 10, 10, 20, 50, 60, 200, 210])
+    raw = np.array([1.0, 2.0, 3.0, 4.0, 7.0, 8.0, 20.0, 21.0])[:, None]
+    data = clean_pier_readings(minutes.astype(np.int64) * MINUTE, raw, max_gap=pd.Timedelta(hours=1),
+                               stuck_duration=pd.Timedelta(days=365))
+
+    assert data["interval"] == 10 * MINUTE
+    assert len(data["timestamps"]) == 22
+    values, flags = data["raw"][:, 0], data["flags"][:, 0]
+    np.testing.assert_allclose(values[:7], [1, 3, 4, 5, 6, 7, 8])
+    assert flags[1] & FLAG_DUPLICATE
+    assert (flags[3:5] == FLAG_INTERPOLATED).all()
+    assert (flags[7:20] == FLAG_GAP).all() and np.isnan(values[7:20]).all()
+    np.testing.assert_allclose(values[20:], [20, 21])
+    assert data["reading_counts"].tolist() == [7]
+
+def test_clean_snaps_to_nearest_slot_and_drops_spikes():
+    minutes = np.arange(0, 400, 20) + np.tile([0, 2, -3, 1], 5)
+    raw = noisy_series(len(minutes))
+    raw[7, 0] += 300
+    data = clean_pier_readings(minutes.astype(np.int64) * MINUTE, raw)
+
+    assert data["interval"] == 20 * MINUTE
+    assert len(data["timestamps"]) == len(minutes)
+    assert data["reading_flags"][7, 0] == FLAG_SPIKE
+    assert data["flags"][7, 0] == FLAG_SPIKE | FLAG_INTERPOLATED
+    keep = np.arange(len(minutes)) != 7
+    np.testing.assert_array_equal(data["raw"][keep, 0], raw[keep, 0])
+
+# ------------------------------------------
+# Pembaruan inkremental
+# ------------------------------------------
+
+def messy_readings(n=1500, seed=0):
+    """
+    Pembacaan 10 menit (dua kanal) dengan jitter, timestamp ganda, celah pendek & panjang, NaN,
+    lonjakan, dan run nilai identik di atas maupun di bawah durasi macet.
+    """
+    rng = np.random.default_rng(seed)
+    spacing = rng.choice([10, 0, 7, 13, 40, 240], n, p=[0.8, 0.03, 0.06, 0.06, 0.03, 0.02])
+    ts = np.cumsum(spacing).astype(np.int64) * MINUTE
+    raw = np.round(1000 + rng.normal(0, 3, (n, 2)))
+    raw[rng.choice(n, 25, replace=False), rng.integers(0, 2, 25)] += 300
+    for start, length, col in [(200, 200, 0), (700, 60, 1), (1100, 300, 1)]:
+        raw[start:start + length, col] = 1234.0
+    raw[rng.random((n, 2)) < 0.02] = np.nan
+    return ts, raw
+
+def assert_same_cleaning(a, b):
+    assert a.keys() == b.keys()
+    for key in a:
+        np.testing.assert_array_equal(np.asarray(a[key]), np.asarray(b[key]), err_msg=key)
+
+@pytest.mark.parametrize("seed, chunks", [(0, 3), (1, 40), (2, 400)])
+def test_append_matches_full_clean(seed, chunks):
+    ts, raw = messy_readings(seed=seed)
+    step = 10 * MINUTE
+    # Batas potongan tidak memisahkan timestamp ganda (pembacaan baru selalu setelah yang lama)
+    cuts = [c for c in np.linspace(0, len(ts), chunks + 1, dtype=int)[1:-1] if ts[c] > ts[c - 1]]
+
+    data = clean_pier_readings(ts[:cuts[0]], raw[:cuts[0]], step)
+    for end in cuts[1:] + [len(ts)]:
+        data = append_pier_readings(data, ts[:end], raw[:end])
+    assert_same_cleaning(data, clean_pier_readings(ts, raw, step))
+
+def write_chunks(csv_path, df, bounds, write_actual_csv):
+    """
+    Generator: menulis df per potongan (batas baris bounds) ke CSV, lalu yield setelah setiap potongan.
+    """
+    for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+        write_actual_csv(csv_path, df.iloc[lo:hi], mode="a" if i else "w")
+        yield
+
+def readings_frame(n=1200, seed=3):
+    ts, raw = messy_readings(n, seed)
+    return pd.DataFrame({"PIER": "PX", "DATE": pd.Timestamp("2026-01-01") + pd.to_timedelta(ts),
+                         "SGA": raw[:, 0], "SGB": raw[:, 1]})
+
+def assert_same_index(a, b):
+    assert a.piers.keys() == b.piers.keys()
+    for short_name in a.piers:
+        assert_same_cleaning(a.piers[short_name], b.piers[short_name])
+    np.testing.assert_array_equal(a.timestamps_desc, b.timestamps_desc)
+
+@pytest.fixture
+def full_builds(monkeypatch):
+    """
+    Jumlah build penuh (clean_strain_index) yang dijalankan IncrementalCleanIndex.
+    """
+    calls = []
+    monkeypatch.setattr("shms.quality.clean_strain_index", lambda *args: calls.append(1) or clean_strain_index(*args))
+    return calls
+
+def test_incremental_index_matches_full_build(tmp_path, registry, write_actual_csv, full_builds):
+    csv_path = str(tmp_path / "aktual.csv")
+    df = readings_frame()
+    reader = IncrementalCsvReader(csv_path)
+    builder = IncrementalCleanIndex(registry)
+
+    for _ in write_chunks(csv_path, df, [0, 400, 401, 800, len(df)], write_actual_csv):
+        reader.refresh()
+        index = builder.update(reader)
+        expected = clean_strain_index(ActualStrainIndex.from_frame(reader.frame(), registry), 10 * MINUTE)
+        assert_same_index(index, expected)
+    assert builder.update(reader) is index
+    assert len(full_builds) == 1
+
+def test_incremental_index_rebuilds_on_late_rows(tmp_path, registry, write_actual_csv, full_builds):
+    csv_path = str(tmp_path / "aktual.csv")
+    df = readings_frame(600)
+    write_actual_csv(csv_path, df)
+    reader = IncrementalCsvReader(csv_path)
+    reader.refresh()
+    builder = IncrementalCleanIndex(registry)
+    builder.update(reader)
+
+    # Baris pengganti untuk pembacaan lama: seluruh riwayat dibersihkan ulang
+    late = df.iloc[[100]].assign(SGA=5000.0)
+    write_actual_csv(csv_path, late, mode="a")
+    reader.refresh()
+    index = builder.update(reader)
+    assert_same_index(index, clean_strain_index(ActualStrainIndex.from_frame(reader.frame(), registry)))
+    slot = (late["DATE"].iloc[0].value - index.piers["PX"]["timestamps"][0]) // (10 * MINUTE)
+    assert index.piers["PX"]["flags"][slot, 0] & FLAG_DUPLICATE
+    assert len(full_builds) == 2
+
+# ------------------------------------------
+# get_clean_values_at
+# ------------------------------------------
+
+def test_clean_values_from_snapped_slot(registry):
+    dates = pd.date_range("2026-01-01", periods=30, freq="10min")
+    sga = 100.0 + np.arange(30)
+    sga[10] += 500
+    df = pd.DataFrame({"PIER": "PX", "DATE": dates, "SGA": sga, "SGB": np.full(30, 250.0)})
+    index = clean_strain_index(ActualStrainIndex.from_frame(df.drop(index=20), registry),
+                               stuck_duration=pd.Timedelta(hours=2))
+
+    # Lonjakan: nilai interpolasi dari slot yang sama, berikut flag-nya; kanal datar ditandai macet (NaN)
+    ts, values, flags = get_clean_values_at(index, "PX", dates[10])
+    assert ts == dates[10] and values["SG-A"] == 10.0
+    assert flags == {"SG-A": FLAG_SPIKE | FLAG_INTERPOLATED, "SG-B": FLAG_STUCK | FLAG_GAP}
+    assert np.isnan(values["SG-B"])
+
+    # As-of: pembacaan 00:20 yang hilang diganti pembacaan terakhir sebelumnya
+    ts, values, flags = get_clean_values_at(index, "PX", dates[20] + pd.Timedelta(minutes=5))
+    assert ts == dates[19] and values["SG-A"] == 19.0
+
+    assert get_clean_values_at(index, "PX", dates[-1] + pd.Timedelta(hours=2)) is None
+    assert get_clean_values_at(index, "PX", dates[0] - pd.Timedelta(minutes=1)) is None
+    assert get_clean_values_at(index, "PY", dates[0]) is None
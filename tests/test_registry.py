@@ -0,0 +1,90 @@
+"""
+Unit test registri sensor: validasi file, pemetaan kanal logger ke sensor, dan kompilasi ulang saat file berubah.
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from shms.config import SENSOR_REGISTRY_PATH
+from shms.registry import SensorRegistry, get_sensor_registry
+
+ELEMENTS = {
+    "Pier A": {"type": "pier", "logger": "PA", "part_id": "I[1]", "length": 5000, "width": 2000},
+    "Pier B": {"type": "pier", "logger": None, "part_id": "I[2]", "length": 4000, "width": 2000},
+    "Girder": {"type": "box_girder", "logger": "GX", "part_id": "I[3]", "example": True, "geometry": {"depth": 2500}},
+}
+
+def sensor(sg, element, channel, x=0, y=0, baseline=None):
+    return {"id": sg, "element": element, "channel": channel, "x": x, "y": y, "baseline": baseline}
+
+SENSORS = [
+    sensor("A-1", "Pier A", "SGB", 100, 0, 10.0),
+    sensor("G-1", "Girder", "SGA", 0, 2500),
+    sensor("A-2", "Pier A", "SGA", -100, 0, 20.0),
+    sensor("A-3", "Pier A", None, 0, 500),
+    sensor("B-1", "Pier B", "SGA"),
+]
+
+def test_compiled_arrays_and_element_configs():
+    registry = SensorRegistry(ELEMENTS, SENSORS)
+    assert registry.ids.tolist() == ["A-1", "G-1", "A-2", "A-3", "B-1"]
+    np.testing.assert_array_equal(registry.baseline, [10.0, 0.0, 20.0, 0.0, 0.0])
+    assert registry.element_sensors["Pier A"].tolist() == [0, 2, 3]
+
+    piers = registry.elements_of_type("pier")
+    assert list(piers) == ["Pier A", "Pier B"]
+    assert piers["Pier A"]["sgs"] == {"A-1": (100, 0), "A-2": (-100, 0), "A-3": (0, 500)}
+    assert "type" not in piers["Pier A"] and "logger" not in piers["Pier A"]
+    assert registry.elements_of_type("box_girder")["Girder"]["example"] is True
+    assert registry.elements_of_type("lainnya") == {}
+
+def test_logger_mapping_skips_unconnected_sensors():
+    registry = SensorRegistry(ELEMENTS, SENSORS)
+    assert registry.logger_codes == {"Pier A": "PA", "Girder": "GX"}
+    assert registry.channels == ["SGA", "SGB"]
+    assert registry.sensor_ids("PA") == ["A-1", "A-2"]
+    assert registry.sensor_ids("PB") == []
+    assert registry.baseline_config == {"PA": {"A-1": 10.0, "A-2": 20.0}, "GX": {"G-1": 0.0}}
+
+def test_logger_columns_follow_available_data_columns():
+    registry = SensorRegistry(ELEMENTS, SENSORS)
+    sensor_index, cols = registry.logger_columns("PA", ["PIER", "DATE", "SGA", "SGB"])
+    assert cols == ["SGB", "SGA"] and registry.ids[sensor_index].tolist() == ["A-1", "A-2"]
+
+    sensor_index, cols = registry.logger_columns("PA", ["PIER", "DATE", "SGA"])
+    assert cols == ["SGA"] and registry.ids[sensor_index].tolist() == ["A-2"]
+    assert registry.logger_columns("ZZ", ["SGA"]) is None
+
+@pytest.mark.parametrize("elements, sensors, message", [
+    (ELEMENTS, SENSORS + [sensor("A-1", "Pier B", None)], "ID sensor ganda"),
+    (ELEMENTS, SENSORS + [sensor("X-1", "Pier Z", None)], "Elemen tidak dikenal"),
+    ({**ELEMENTS, "Kabel": {"type": "kabel"}}, SENSORS, "Tipe elemen tidak dikenal"),
+    (ELEMENTS, SENSORS + [sensor("A-4", "Pier A", "SGA")], "Kanal ganda pada logger PA"),
+    ({**ELEMENTS, "Pier B": {**ELEMENTS["Pier B"], "logger": "PA"}}, SENSORS, "Logger PA dipakai lebih dari satu"),
+])
+def test_invalid_registry_raises(elements, sensors, message):
+    with pytest.raises(ValueError, match=message):
+        SensorRegistry(elements, sensors)
+
+def test_recompiled_only_when_file_changes(tmp_path):
+    path = str(tmp_path / "sensors.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"elements": ELEMENTS, "sensors": SENSORS}, f)
+    registry = get_sensor_registry(path)
+    assert get_sensor_registry(path) is registry
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"elements": ELEMENTS, "sensors": SENSORS[:3]}, f)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    updated = get_sensor_registry(path)
+    assert updated is not registry and updated.key != registry.key
+    assert updated.ids.tolist() == ["A-1", "G-1", "A-2"]
+
+def test_repository_registry_is_valid():
+    registry = get_sensor_registry(SENSOR_REGISTRY_PATH)
+    assert registry.elements_of_type("pier") and registry.elements_of_type("box_girder")
+    for code in registry.loggers:
+        assert registry.sensor_ids(code)
@@ -0,0 +1,77 @@
+"""
+Unit test residual aktual vs teoritis: jadwal stage, pemetaan stage terjadwal, dan residual seluruh riwayat.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from shms.actual import ActualStrainIndex
+from shms.config import STAGE_SCHEDULE_COLUMNS
+from shms.residuals import (
+    compute_residual_index, get_schedule_key, get_schedule_starts, load_stage_schedule, map_scheduled_stage,
+    save_stage_schedule
+)
+
+STAGES = ["S1", "S2", "S3"]
+STAGE_INDEX = {stage: i for i, stage in enumerate(STAGES)}
+
+def schedule_frame(starts):
+    return pd.DataFrame({
+        "Stage": STAGES,
+        STAGE_SCHEDULE_COLUMNS[1]: pd.to_datetime(starts)
+    })
+
+def test_schedule_roundtrip_and_unscheduled_stages(tmp_path):
+    path = str(tmp_path / "jadwal.csv")
+    assert load_stage_schedule(path, STAGES)[STAGE_SCHEDULE_COLUMNS[1]].isna().all()
+
+    save_stage_schedule(schedule_frame(["2026-01-01 08:00", None, "2026-01-05 00:00"]), path)
+    loaded = load_stage_schedule(path, STAGES + ["S4"])
+    assert loaded["Stage"].tolist() == STAGES + ["S4"]
+    starts = loaded[STAGE_SCHEDULE_COLUMNS[1]]
+    assert starts[0] == pd.Timestamp("2026-01-01 08:00")
+    assert pd.isna(starts[1]) and pd.isna(starts[3])
+
+def test_schedule_key_skips_unknown_and_sorts_by_start():
+    key = get_schedule_key(schedule_frame(["2026-01-05", None, "2026-01-01"]))
+    assert [stage for stage, _ in key] == ["S1", "S3"]
+    starts, stage_ids = get_schedule_starts(key + (("S9", 0),), STAGE_INDEX)
+    assert stage_ids.tolist() == [2, 0]
+    assert starts.tolist() == sorted(starts.tolist())
+
+def test_map_scheduled_stage_boundaries():
+    starts = pd.to_datetime(["2026-01-01", "2026-01-03"]).as_unit("ns").asi8
+    ts = pd.to_datetime([
+        "2025-12-31 23:59", "2026-01-01 00:00", "2026-01-02 23:59", "2026-01-03 00:00", "2027-01-01 00:00"
+    ]).as_unit("ns").asi8
+    assert map_scheduled_stage(starts, np.array([1, 2]), ts).tolist() == [-1, 1, 1, 2, 2]
+    assert map_scheduled_stage(starts[:0], np.array([], dtype=np.int64), ts).tolist() == [-1] * 5
+
+@pytest.fixture
+def actual_index(registry):
+    df = pd.DataFrame({
+        "PIER": "PX",
+        "DATE": pd.to_datetime(["2025-12-31 12:00", "2026-01-01 00:00", "2026-01-02 00:00", "2026-01-04 00:00"]),
+        "SGA": [110.0, 120.0, 130.0, np.nan],
+        "SGB": [210.0, 220.0, 230.0, 240.0],
+    })
+    return ActualStrainIndex.from_frame(df, registry)
+
+def test_residual_matches_per_row_lookup(actual_index):
+    theory_table = {"SG-A": np.array([1.0, 2.0, 3.0]), "SG-B": np.array([10.0, 20.0, np.nan])}
+    key = get_schedule_key(schedule_frame(["2026-01-01", "2026-01-03", None]))
+    residual = compute_residual_index(actual_index, STAGE_INDEX, key, theory_table).piers["PX"]
+
+    assert residual["stage"].tolist() == [-1, 0, 0, 1]
+    strain = actual_index.piers["PX"]["strain"]
+    expected_theory = np.array([[np.nan, np.nan], [1.0, 10.0], [1.0, 10.0], [2.0, 20.0]])
+    np.testing.assert_array_equal(residual["theory"], expected_theory)
+    np.testing.assert_array_equal(residual["strain"], strain - expected_theory)
+    # Sebelum jadwal pertama atau tanpa nilai aktual: residual NaN
+    assert np.isnan(residual["strain"][0]).all() and np.isnan(residual["strain"][3, 0])
+
+def test_residual_sensor_without_theory_is_nan(actual_index):
+    key = get_schedule_key(schedule_frame(["2026-01-01", None, None]))
+    residual = compute_residual_index(actual_index, STAGE_INDEX, key, {"SG-A": np.zeros(3)}).piers["PX"]
+    assert np.isnan(residual["strain"][:, 1]).all()
+    np.testing.assert_array_equal(residual["strain"][1:3, 0], [20.0, 30.0])
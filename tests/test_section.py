@@ -0,0 +1,156 @@
+"""
+Unit test engine penampang: cache disk Section (kunci berbasis isi), interpolasi mesh ke grid, dan
+superposisi medan tegangan beban satuan terhadap stress recovery FEA.
+"""
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from shms.section import (
+    MeshGridInterpolator, UnitLoadStressField, build_section, build_sensor_stress_coefficients,
+    get_section_cache_key, load_or_build_section, rectangular_geometry_spec
+)
+
+pytest.importorskip("sectionproperties")
+
+SPEC = rectangular_geometry_spec(500, 200)
+MESH_SIZE = 2000
+
+# ------------------------------------------
+# Cache disk Section
+# ------------------------------------------
+
+def test_failed_cache_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise pickle.PicklingError("tidak bisa di-pickle")
+    monkeypatch.setattr("shms.section.pickle.dump", fail)
+
+    sec = load_or_build_section(SPEC, MESH_SIZE, cache_dir=str(tmp_path))
+    assert sec.get_area() == pytest.approx(500 * 200)
+    assert os.listdir(tmp_path) == []
+
+def test_section_cached_on_disk(tmp_path):
+    sec = load_or_build_section(SPEC, MESH_SIZE, cache_dir=str(tmp_path))
+    key = get_section_cache_key(SPEC, MESH_SIZE, False)
+    assert os.listdir(tmp_path) == [f"{key}.pkl"]
+
+    cached = load_or_build_section(SPEC, MESH_SIZE, cache_dir=str(tmp_path))
+    assert cached.get_area() == pytest.approx(sec.get_area())
+    assert len(cached.mesh["vertices"]) == len(sec.mesh["vertices"])
+
+# ------------------------------------------
+# MeshGridInterpolator
+# ------------------------------------------
+
+@pytest.fixture
+def mesh():
+    rng = np.random.default_rng(7)
+    corners = np.array([[0, 0], [10, 0], [10, 4], [0, 4]], dtype=float)
+    nodes = np.vstack([corners, rng.uniform([0, 0], [10, 4], (40, 2))])
+    from scipy.spatial import Delaunay
+    return nodes, Delaunay(nodes).simplices
+
+def test_interpolation_matches_griddata(mesh):
+    from scipy.interpolate import griddata
+
+    nodes, elements = mesh
+    interp = MeshGridInterpolator(nodes, elements, resolution=25)
+    values = np.sin(nodes[:, 0]) + nodes[:, 1] ** 2
+    gx, gy = np.meshgrid(interp.grid_x, interp.grid_y, indexing='ij')
+    expected = griddata(nodes, values, (gx, gy), method='linear').T
+    np.testing.assert_allclose(interp.interpolate(values), expected, rtol=1e-10, atol=1e-10)
+
+def test_linear_field_is_exact(mesh):
+    nodes, elements = mesh
+    interp = MeshGridInterpolator(nodes, elements, resolution=20)
+    grid = interp.interpolate(3 * nodes[:, 0] - 2 * nodes[:, 1] + 1)
+    assert grid.shape == (20, 20)
+    gx, gy = np.meshgrid(interp.grid_x, interp.grid_y, indexing='xy')
+    np.testing.assert_allclose(grid, 3 * gx - 2 * gy + 1, atol=1e-9)
+
+def test_wireframe_has_one_loop_per_triangle(mesh):
+    nodes, elements = mesh
+    interp = MeshGridInterpolator(nodes, elements, resolution=10)
+    assert len(interp.wire_x) == 5 * len(elements)
+    loops = interp.wire_x.reshape(-1, 5)
+    assert np.isnan(loops[:, 4]).all()
+    np.testing.assert_array_equal(loops[:, 0], loops[:, 3])
+
+# ------------------------------------------
+# Kunci cache Section
+# ------------------------------------------
+
+def test_cache_key_depends_on_content_only():
+    key = get_section_cache_key(SPEC, MESH_SIZE, False)
+    assert key == get_section_cache_key(rectangular_geometry_spec(500.0, 200.0), float(MESH_SIZE), False)
+    assert key == get_section_cache_key(dict(reversed(list(SPEC.items()))), MESH_SIZE, False)
+
+@pytest.mark.parametrize("spec, mesh_size, warping", [
+    (rectangular_geometry_spec(500, 201), MESH_SIZE, False),
+    (rectangular_geometry_spec(200, 500), MESH_SIZE, False),
+    (SPEC, MESH_SIZE + 1, False),
+    (SPEC, MESH_SIZE, True),
+])
+def test_cache_key_changes_with_inputs(spec, mesh_size, warping):
+    assert get_section_cache_key(spec, mesh_size, warping) != get_section_cache_key(SPEC, MESH_SIZE, False)
+
+def test_cache_key_changes_with_versions(monkeypatch):
+    key = get_section_cache_key(SPEC, MESH_SIZE, False)
+    monkeypatch.setattr("shms.section.SECTION_CACHE_VERSION", -1)
+    assert get_section_cache_key(SPEC, MESH_SIZE, False) != key
+    monkeypatch.undo()
+    monkeypatch.setattr("shms.section.SECTIONPROPERTIES_VERSION", "0.0.0")
+    assert get_section_cache_key(SPEC, MESH_SIZE, False) != key
+
+def test_corrupt_cache_file_is_rebuilt(tmp_path):
+    key = get_section_cache_key(SPEC, MESH_SIZE, False)
+    (tmp_path / f"{key}.pkl").write_bytes(b"bukan pickle")
+    sec = load_or_build_section(SPEC, MESH_SIZE, cache_dir=str(tmp_path))
+    assert sec.get_area() == pytest.approx(500 * 200)
+    with open(tmp_path / f"{key}.pkl", "rb") as f:
+        assert pickle.load(f).get_area() == pytest.approx(500 * 200)
+
+# ------------------------------------------
+# Superposisi beban satuan
+# ------------------------------------------
+
+# Penampang L (Ixy != 0) agar suku momen silang ikut teruji
+L_SPEC = {"type": "polygon", "outer": [[0, 0], [600, 0], [600, 150], [150, 150], [150, 400], [0, 400]]}
+LOADS = np.array([[-2.0e6, 0.0, 0.0], [0.0, 3.0e8, 0.0], [0.0, 0.0, -1.5e8], [-1.2e6, 2.5e8, 4.0e7]])
+
+@pytest.fixture(scope="module")
+def l_section():
+    sec = build_section(L_SPEC, 800)
+    interp = MeshGridInterpolator.from_section(sec, resolution=40)
+    return sec, interp, UnitLoadStressField(sec, interp)
+
+def fea_sig_zz(sec, load_vec):
+    n, mxx, myy = load_vec
+    return sec.calculate_stress(n=n, mxx=mxx, myy=myy).material_groups[0].stress_result.sig_zz
+
+@pytest.mark.parametrize("load_vec", LOADS)
+def test_unit_field_matches_fea(l_section, load_vec):
+    sec, interp, field = l_section
+    sig_zz = fea_sig_zz(sec, load_vec)
+    scale = np.abs(sig_zz).max()
+    np.testing.assert_allclose(field.nodal_stress(load_vec), sig_zz, rtol=1e-9, atol=1e-12 * scale)
+    np.testing.assert_allclose(field.grid_stress(load_vec), interp.interpolate(sig_zz), rtol=1e-9,
+                               atol=1e-12 * scale)
+
+def test_sensor_coefficients_match_stress_at_points(l_section):
+    sec, _, _ = l_section
+    pts = [(50, 50), (550, 100), (100, 380), (300, 75)]
+    coeffs = build_sensor_stress_coefficients(sec, pts)
+    for n, mxx, myy in LOADS:
+        expected = [r[0] for r in sec.get_stress_at_points(pts=pts, n=n, mxx=mxx, myy=myy)]
+        np.testing.assert_allclose(coeffs @ [n, mxx, myy], expected, rtol=1e-9)
+
+@pytest.mark.parametrize("stride", [1, 3])
+def test_grid_stress_stages_matches_single_stage(l_section, stride):
+    _, interp, field = l_section
+    grids = field.grid_stress_stages(LOADS, stride)
+    assert grids.shape == (len(LOADS), len(interp.grid_y[::stride]), len(interp.grid_x[::stride]))
+    for grid, load_vec in zip(grids, LOADS):
+        np.testing.assert_allclose(grid, field.grid_stress(load_vec)[::stride, ::stride], rtol=1e-12)
@@ -0,0 +1,59 @@
+"""
+Unit test cache kolumnar Parquet: data gaya dimuat dari cache selama CSV sumber tidak berubah.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import shms.loads as loads
+from shms.config import LOAD_CASE_COLUMNS
+from shms.storage import get_columnar_cache_path, read_columnar_cache_metadata, write_columnar_cache
+
+@pytest.fixture
+def load_csv(tmp_path):
+    path = tmp_path / "data_gaya.csv"
+    write_load_csv(path, axial=-100.0)
+    return str(path)
+
+def write_load_csv(path, axial):
+    df = pd.DataFrame({"Elem": [1], "Load": ["Summation"], "Stage": ["S1"], "Step": ["001(last)"], "Part": ["I[1]"]})
+    for column in LOAD_CASE_COLUMNS:
+        df[column] = axial if column == "Axial (kN)" else 0.0
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+
+def test_cache_reused_until_source_changes(load_csv, monkeypatch):
+    first = loads.load_load_case_frame(load_csv)
+    cache_path = get_columnar_cache_path(load_csv)
+    assert os.path.exists(cache_path)
+    assert str(first["Stage"].dtype) == "category" and first["Axial (kN)"].dtype == "float64"
+
+    # Cache valid: CSV tidak di-parsing ulang
+    def fail(_):
+        raise AssertionError("CSV di-parsing ulang padahal cache masih valid")
+    with monkeypatch.context() as m:
+        m.setattr(loads, "read_load_case_csv", fail)
+        cached = loads.load_load_case_frame(load_csv)
+    pd.testing.assert_frame_equal(cached, first)
+
+    write_load_csv(load_csv, axial=-250.5)
+    stat = os.stat(load_csv)
+    os.utime(load_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert loads.load_load_case_frame(load_csv)["Axial (kN)"].tolist() == [-250.5]
+
+def test_metadata_rejects_other_schema_version(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / ".cache" / "x.parquet")
+    write_columnar_cache(pd.DataFrame({"a": [1]}), cache_path, {"source": "x"})
+    assert read_columnar_cache_metadata(cache_path)["source"] == "x"
+    monkeypatch.setattr("shms.storage.COLUMNAR_CACHE_SCHEMA_VERSION", 999)
+    assert read_columnar_cache_metadata(cache_path) is None
+    assert read_columnar_cache_metadata(str(tmp_path / "tidak_ada.parquet")) is None
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / ".cache" / "x.parquet")
+
+    def fail(*args, **kwargs):
+        raise OSError("disk penuh")
+    monkeypatch.setattr("shms.storage.os.replace", fail)
+    write_columnar_cache(pd.DataFrame({"a": [1]}), cache_path, {})
+    assert os.listdir(tmp_path / ".cache") == []
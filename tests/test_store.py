@@ -0,0 +1,197 @@
+"""
+Unit test ActualReadingStore: lookup as-of, daftar pier, tren SQL (data mentah atau bucket ulang
+statistik tersimpan), dan statistik bucket yang digabung bertahap (Chan et al.).
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from shms.actual import ActualStrainIndex, ActualTrendPyramid
+from shms.store import ActualReadingStore
+
+STAT_LEVELS = {"Per Jam": pd.Timedelta(hours=1), "Harian": pd.Timedelta(days=1)}
+
+def make_readings(start, periods, seed, pier="PX"):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "PIER": pier,
+        "DATE": pd.date_range(start, periods=periods, freq="10min"),
+        "SGA": np.round(1000 + rng.normal(0, 25, periods), 3),
+        "SGB": np.round(2000 + rng.normal(0, 40, periods), 3),
+    })
+
+@pytest.fixture
+def store(tmp_path):
+    store = ActualReadingStore(str(tmp_path / "aktual.sqlite"), stat_levels=STAT_LEVELS)
+    yield store
+    store.close()
+
+def test_values_at_tolerance(store, tmp_path, registry, write_actual_csv):
+    csv_path = str(tmp_path / "aktual.csv")
+    df = make_readings("2026-01-01 00:00", 6, seed=4)
+    write_actual_csv(csv_path, df)
+    store.ingest_csv(csv_path)
+    last = df["DATE"].iloc[-1]
+
+    ts, values = store.values_at("PX", last + pd.Timedelta(minutes=30), registry=registry)
+    assert ts == last
+    assert values["SG-A"] == pytest.approx(df["SGA"].iloc[-1] - 100.0)
+    assert store.values_at("PX", last + pd.Timedelta(hours=2), registry=registry) is None
+    assert store.values_at("PX", last + pd.Timedelta(hours=2), tolerance=None, registry=registry)[0] == last
+    assert store.values_at("PX", df["DATE"].iloc[0] - pd.Timedelta(minutes=1), registry=registry) is None
+    assert store.values_at("PY", last, registry=registry) is None
+
+def test_piers(store, tmp_path, write_actual_csv):
+    assert store.piers() == []
+    csv_path = str(tmp_path / "aktual.csv")
+    write_actual_csv(csv_path, pd.concat([
+        make_readings("2026-01-01", 3, seed=1, pier="PY"), make_readings("2026-01-01", 3, seed=2),
+        make_readings("2026-01-02", 3, seed=3, pier="PA")
+    ]))
+    store.ingest_csv(csv_path)
+    assert store.piers() == ["PA", "PX", "PY"]
+
+# ------------------------------------------
+# Tren
+# ------------------------------------------
+
+@pytest.fixture
+def history(store, tmp_path, write_actual_csv):
+    """
+    60 hari pembacaan 10 menit (dua kali ingest) beserta NaN di satu kanal.
+    """
+    csv_path = str(tmp_path / "aktual.csv")
+    df = make_readings("2026-01-01 00:00", 60 * 144, seed=5)
+    df.loc[1000:1100, "SGB"] = np.nan
+    write_actual_csv(csv_path, df.iloc[:5000])
+    store.ingest_csv(csv_path)
+    write_actual_csv(csv_path, df.iloc[5000:], mode="a")
+    store.ingest_csv(csv_path)
+    return df
+
+def test_trend_raw_when_it_fits(store, history, registry):
+    start = history["DATE"].iloc[100]
+    series = store.trend("PX", start, start + pd.Timedelta(hours=10), max_points=61, registry=registry)
+    assert not series["aggregated"] and series["level"] == "Data mentah"
+    rows = history.iloc[100:161]
+    np.testing.assert_array_equal(series["time"], rows["DATE"].to_numpy())
+    np.testing.assert_allclose(series["mean"], rows[["SGA", "SGB"]].to_numpy() - [100.0, 200.0])
+    np.testing.assert_allclose(series["min"], series["mean"])
+
+@pytest.mark.parametrize("days, max_points", [(60, 100), (60, 20), (60, 1000), (20, 7), (5, 30)])
+def test_trend_from_stored_stats_matches_pyramid(store, history, registry, days, max_points):
+    # Lebar target >= level terhalus: store dan pyramid memilih level yang sama dan membucket ulang sama
+    pyramid = ActualTrendPyramid.from_index(ActualStrainIndex.from_frame(history, registry))
+    start = pd.Timestamp("2026-01-03 07:00")
+    end = start + pd.Timedelta(days=days)
+    series = store.trend("PX", start, end, max_points=max_points, registry=registry)
+    expected = pyramid.query("PX", start, end, max_points=max_points)
+
+    assert series["aggregated"] and series["level"].startswith("Statistik")
+    assert 0 < len(series["time"]) <= max_points
+    np.testing.assert_array_equal(series["time"], expected["time"])
+    for column in ("mean", "min", "max"):
+        np.testing.assert_allclose(series[column], expected[column], rtol=1e-9)
+
+def test_trend_coarse_range_skips_raw_readings(store, history, registry):
+    statements = []
+    store._conn.set_trace_callback(statements.append)
+    series = store.trend("PX", history["DATE"].iloc[0], history["DATE"].iloc[-1], max_points=100, registry=registry)
+    store._conn.set_trace_callback(None)
+
+    assert len(series["time"]) <= 100
+    from_readings = [sql for sql in statements if "FROM readings" in sql]
+    # Hanya pengecekan jumlah titik mentah (dibatasi LIMIT max_points + 1)
+    assert len(from_readings) == 1 and "LIMIT 101" in from_readings[0]
+
+def test_trend_short_range_buckets_raw_readings(store, history, registry):
+    # Lebar target di bawah level statistik terhalus: bucket dari readings langsung
+    start, end = history["DATE"].iloc[0], history["DATE"].iloc[287]
+    series = store.trend("PX", start, end, max_points=50, registry=registry)
+    assert series["aggregated"] and series["level"].startswith("Bucket SQL")
+    assert len(series["time"]) <= 50
+    values = history.iloc[:288][["SGA", "SGB"]].to_numpy() - [100.0, 200.0]
+    np.testing.assert_allclose(series["min"].min(axis=0), values.min(axis=0))
+    np.testing.assert_allclose(series["max"].max(axis=0), values.max(axis=0))
+
+def test_trend_unknown_pier_and_empty_range(store, history, registry):
+    assert store.trend("PY", "2026-01-01", "2026-01-02", registry=registry) is None
+    series = store.trend("PX", "2027-01-01", "2027-01-02", registry=registry)
+    assert len(series["time"]) == 0 and series["mean"].shape == (0, 2)
+
+# ------------------------------------------
+# Statistik bucket
+# ------------------------------------------
+
+def expected_stats(df, width, registry):
+    """
+    Statistik per bucket langsung dari pembacaan akhir (baris ganda: yang terakhir di file).
+    """
+    df = df.drop_duplicates(["PIER", "DATE"], keep="last")
+    long = df.melt(id_vars=["PIER", "DATE"], var_name="channel", value_name="value").dropna()
+    long["Waktu"] = long["DATE"].dt.floor(width)
+    baseline = dict(zip(["SGA", "SGB"], registry.baseline))
+    long["value"] -= long["channel"].map(baseline)
+    stats = long.groupby(["Waktu", "channel"])["value"].agg(["count", "mean", "std", "min", "max"])
+    return stats.reset_index().sort_values(["Waktu", "channel"], kind="stable")
+
+def assert_stats_match(store, df, registry):
+    for width in STAT_LEVELS.values():
+        got = store.sensor_stats(width, registry=registry)
+        want = expected_stats(df, width, registry)
+        assert len(got) == len(want)
+        np.testing.assert_array_equal(got["Waktu"].to_numpy(), want["Waktu"].to_numpy())
+        np.testing.assert_array_equal(got["Jumlah"].to_numpy(), want["count"].to_numpy())
+        for column, stat in [("Rata-rata (με)", "mean"), ("Std (με)", "std"), ("Min (με)", "min"),
+                             ("Max (με)", "max")]:
+            np.testing.assert_allclose(got[column].to_numpy(dtype=float), want[stat].to_numpy(), rtol=1e-9,
+                                       atol=1e-9)
+
+def test_incremental_merge_matches_direct_stats(store, tmp_path, registry, write_actual_csv):
+    csv_path = str(tmp_path / "aktual.csv")
+    # Potongan kedua dimulai di tengah jam & hari yang sama: bucket digabung, bukan ditimpa
+    first = make_readings("2026-01-01 00:00", 100, seed=1)
+    second = make_readings(first["DATE"].iloc[-1] + pd.Timedelta(minutes=10), 200, seed=2)
+    second.loc[5:7, "SGB"] = np.nan
+
+    write_actual_csv(csv_path, first)
+    assert store.ingest_csv(csv_path) == len(first)
+    write_actual_csv(csv_path, second, mode="a")
+    assert store.ingest_csv(csv_path) == len(second)
+    assert store.ingest_csv(csv_path) == 0
+
+    assert_stats_match(store, pd.concat([first, second]), registry)
+
+def test_late_and_replaced_rows_recompute_buckets(store, tmp_path, registry, write_actual_csv):
+    csv_path = str(tmp_path / "aktual.csv")
+    first = make_readings("2026-01-01 00:00", 150, seed=3)
+    write_actual_csv(csv_path, first)
+    store.ingest_csv(csv_path)
+
+    # Baris susulan (waktu di antara pembacaan lama) dan pengganti (waktu sama, nilai baru)
+    late = pd.DataFrame({
+        "PIER": "PX",
+        "DATE": [first["DATE"].iloc[20] + pd.Timedelta(minutes=5), first["DATE"].iloc[40]],
+        "SGA": [1500.0, 900.0],
+        "SGB": [2100.0, np.nan],
+    })
+    write_actual_csv(csv_path, late, mode="a")
+    store.ingest_csv(csv_path)
+
+    assert_stats_match(store, pd.concat([first, late]), registry)
+
+def test_stats_backfilled_for_new_level(tmp_path, registry, write_actual_csv):
+    csv_path = str(tmp_path / "aktual.csv")
+    df = make_readings("2026-01-01 00:00", 500, seed=6)
+    write_actual_csv(csv_path, df)
+    db_path = str(tmp_path / "aktual.sqlite")
+    store = ActualReadingStore(db_path, stat_levels={"Per Jam": STAT_LEVELS["Per Jam"]})
+    store.ingest_csv(csv_path)
+    store.close()
+
+    # Level harian ditambahkan ke konfigurasi: diisi dari readings saat store dibuka
+    store = ActualReadingStore(db_path, stat_levels=STAT_LEVELS)
+    try:
+        assert_stats_match(store, df, registry)
+    finally:
+        store.close()